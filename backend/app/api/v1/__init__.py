@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import auth, users, verification, properties, bookings, hosts, payments
+from app.api.v1 import auth, users, verification, properties, bookings, hosts, payments, platforms, finance, exports, events, notifications, analytics
 
 api_router = APIRouter()
 
@@ -10,4 +10,10 @@ api_router.include_router(properties.router)
 api_router.include_router(bookings.router)
 api_router.include_router(hosts.router)
 api_router.include_router(payments.router)
+api_router.include_router(platforms.router)
+api_router.include_router(finance.router)
+api_router.include_router(exports.router)
+api_router.include_router(events.router)
+api_router.include_router(notifications.router)
+api_router.include_router(analytics.router)
 
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import Optional
+from uuid import UUID
+from datetime import date, timedelta
+from app.dependencies import get_current_admin, conditional
+from app.core.http_cache import touch
+from app.services.analytics_service import analytics_service
+from app.services.audit_logger import audit_logger
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+@router.get("/timeseries", dependencies=[Depends(conditional("analytics"))])
+async def get_timeseries(
+    period: str = Query("day", pattern="^(day|week|month)$"),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    group_by: Optional[str] = Query(None, pattern="^(platform|city|platform_city)$"),
+    platform: Optional[UUID] = Query(None),
+    city: Optional[str] = Query(None),
+    admin: dict = Depends(get_current_admin)
+):
+    """Bookings, GMV, occupancy and new users across platforms per day, week or month, precomputed after each sync"""
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=29)
+    
+    try:
+        data = analytics_service.timeseries(
+            period, date_from, date_to, group_by, str(platform) if platform else None, city
+        )
+        
+        return {
+            "success": True,
+            "period": period,
+            "date_from": date_from,
+            "date_to": date_to,
+            "data": data
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(
+            "Failed to get analytics time series: %s", e,
+            extra={"period": period, "date_from": date_from, "date_to": date_to, "group_by": group_by}
+        )
+        raise HTTPException(status_code=500, detail="Failed to retrieve analytics")
+
+@router.post("/rebuild")
+async def rebuild_rollups(
+    http_request: Request,
+    admin: dict = Depends(get_current_admin)
+):
+    """Recompute the analytics rollups from the earliest booking, signup or listing; for one-off backfills"""
+    try:
+        refreshed = analytics_service.refresh_rollups(full=True)
+        
+        audit_logger.log(
+            admin["id"],
+            "analytics_rebuild",
+            action_details={"rows": refreshed},
+            request=http_request
+        )
+        await touch("analytics")
+        
+        return {"success": True, "refreshed": refreshed}
+    except Exception as e:
+        logger.error("Failed to rebuild analytics rollups: %s", e, extra={"admin_id": admin["id"]})
+        raise HTTPException(status_code=500, detail="Failed to rebuild analytics")
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from app.models.schemas import LoginRequest, LoginResponse, SuccessResponse
 from app.core.supabase import get_supabase
 from app.core.security import verify_password, create_access_token
-from app.utils.logger import logger
+from app.dependencies import get_current_admin
+from app.utils.logger import get_logger
 from datetime import datetime
 
+logger = get_logger(__name__)
+
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/login", response_model=LoginResponse)
@@ -55,11 +58,11 @@ async def login(request: LoginRequest):
                 "role": admin["role"]
             }
         )
-        
+    
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Login failed: {e}")
+        logger.error("Login failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Login failed"
@@ -72,8 +75,3 @@ async def get_current_user_info(admin: dict = Depends(get_current_admin)):
         message="User info retrieved",
         data=admin
     )
-
-# Import after defining router to avoid circular imports
-from app.dependencies import get_current_admin
-from fastapi import Depends
-
@@ -1,93 +1,175 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from typing import Optional
-from app.dependencies import get_current_admin
+from uuid import UUID
+from datetime import date
+from app.models.schemas import BookingPage
+from app.dependencies import get_current_admin, conditional
+from app.core.supabase import get_supabase
+from app.core.http_cache import touch
 from app.services.host_platform import HostPlatformClient
 from app.config import settings
-from app.core.supabase import get_supabase
-from app.utils.logger import logger
+from app.services.audit_logger import audit_logger
+from app.services.analytics_service import analytics_service
+from app.services.event_bus import event_bus
+from app.utils.logger import get_logger
+from app.utils.pagination import apply_cursor, cursor_page
+from app.utils.responses import trusted
+from app.utils.projection import BOOKING_LIST_COLUMNS, attach_payload
+from app.utils.unified_ids import is_uuid, platform_id_by_name, resolve_platform_ids
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
-@router.get("")
+@router.get("", response_model=BookingPage, dependencies=[Depends(conditional("bookings"))])
 async def list_bookings(
+    http_response: Response,
     status: Optional[str] = Query(None),
-    page: int = Query(1, ge=1),
+    payment_status: Optional[str] = Query(None),
+    platform: Optional[UUID] = Query(None),
+    property_id: Optional[str] = Query(None),
+    check_in_from: Optional[date] = Query(None),
+    check_in_to: Optional[date] = Query(None),
+    include_removed: bool = Query(False),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=100),
     admin: dict = Depends(get_current_admin)
 ):
-    """List all bookings from Host Dashboard"""
+    """List bookings across platforms from the synced unified table"""
+    supabase = get_supabase()
+    
     try:
-        client = HostPlatformClient(
-            settings.HOST_DASHBOARD_URL,
-            settings.HOST_DASHBOARD_API_KEY
-        )
+        query = supabase.table("unified_bookings").select(BOOKING_LIST_COLUMNS)
         
-        response = await client.get_all_bookings(status=status, page=page, limit=limit)
+        # Apply filters
+        if status:
+            query = query.eq("status", status)
+        if payment_status:
+            query = query.eq("payment_status", payment_status)
+        if platform:
+            query = query.eq("platform_id", str(platform))
+        if property_id:
+            query = query.eq("property_id", property_id)
+        if check_in_from:
+            query = query.gte("check_in", check_in_from.isoformat())
+        if check_in_to:
+            query = query.lte("check_in", check_in_to.isoformat())
+        if not include_removed:
+            query = query.is_("removed_at", "null")
         
-        return {
-            "success": True,
-            "data": response.get("data", []),
-            "total": response.get("total", 0),
-            "page": page,
-            "limit": limit
-        }
+        # Keyset pagination, fetching one extra row to know whether there is a next page
+        response = apply_cursor(query, cursor).limit(limit + 1).execute()
+        data, next_cursor = cursor_page(response.data, limit)
+        
+        return trusted({"success": True, "data": data, "limit": limit, "next_cursor": next_cursor}, http_response, BookingPage)
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Failed to list bookings: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error("Failed to list bookings: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to retrieve bookings")
 
 @router.get("/{booking_id}")
 async def get_booking(
     booking_id: str,
     admin: dict = Depends(get_current_admin)
 ):
-    """Get booking details"""
+    """Get booking details, fresh from the source platform where it supports it"""
+    supabase = get_supabase()
+    
+    client = HostPlatformClient(
+        settings.HOST_DASHBOARD_URL,
+        settings.HOST_DASHBOARD_API_KEY
+    )
+    
     try:
-        client = HostPlatformClient(
-            settings.HOST_DASHBOARD_URL,
-            settings.HOST_DASHBOARD_API_KEY
-        )
+        response = supabase.table("unified_bookings").select("*").eq("id", booking_id).execute() if is_uuid(booking_id) else None
+        
+        if not response or not response.data:
+            # Not a unified id: treat it as a Host Dashboard booking id
+            return {
+                "success": True,
+                "data": await client.get_booking(booking_id)
+            }
+        
+        booking = attach_payload(supabase, "unified_bookings", response.data[0])
+        platform = supabase.table("platforms").select("name").eq("id", booking["platform_id"]).execute()
         
-        response = await client.get_booking(booking_id)
+        if platform.data and platform.data[0]["name"] == "host_dashboard":
+            try:
+                booking["live"] = await client.get_booking(booking["platform_booking_id"])
+            except Exception as e:
+                # Serve the synced copy rather than failing the detail view
+                logger.warning("Live booking fetch failed, serving synced copy: %s", e)
         
         return {
             "success": True,
-            "data": response
+            "data": booking
         }
     except Exception as e:
-        logger.error(f"Failed to get booking: {e}")
+        logger.error("Failed to get booking: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await client.close()
 
 @router.post("/{booking_id}/cancel")
 async def cancel_booking(
     booking_id: str,
     reason: str,
+    http_request: Request,
     admin: dict = Depends(get_current_admin)
 ):
-    """Cancel a booking"""
+    """Cancel a booking; takes a unified or Host Dashboard booking id"""
+    supabase = get_supabase()
+    
+    client = HostPlatformClient(
+        settings.HOST_DASHBOARD_URL,
+        settings.HOST_DASHBOARD_API_KEY
+    )
+    
     try:
-        client = HostPlatformClient(
-            settings.HOST_DASHBOARD_URL,
-            settings.HOST_DASHBOARD_API_KEY
-        )
+        target = resolve_platform_ids(
+            supabase, "unified_bookings", "platform_booking_id",
+            platform_id_by_name(supabase, "host_dashboard"), [booking_id]
+        ).get(booking_id)
+        if not target:
+            raise ValueError("Only Host Dashboard bookings can be cancelled")
         
-        response = await client.cancel_booking(booking_id, reason)
+        response = await client.cancel_booking(target["platform_booking_id"], reason)
+        
+        # Mirror the change on the unified copy, which the list endpoint serves
+        if target["id"]:
+            try:
+                cancelled = supabase.table("unified_bookings").update({"status": "cancelled"}).eq(
+                    "id", target["id"]
+                ).execute().data
+                analytics_service.mark_dirty(row.get("check_in") for row in cancelled)
+            except Exception as e:
+                # The upstream change stands and the next sync brings the unified row in line
+                logger.error("Failed to mirror booking cancellation: %s", e)
         
         # Log admin action
-        supabase = get_supabase()
-        supabase.table("admin_audit_log").insert({
-            "admin_user_id": admin["id"],
-            "action_type": "booking_cancelled",
-            "target_entity_type": "booking",
-            "target_entity_id": booking_id,
-            "action_details": {"reason": reason}
-        }).execute()
+        audit_logger.log(
+            admin["id"],
+            "booking_cancelled",
+            target_entity_type="booking",
+            target_entity_id=target["id"] or booking_id,
+            action_details={"reason": reason},
+            request=http_request
+        )
+        await touch("bookings")
+        await event_bus.publish("booking.status", ids=[target["id"] or booking_id], status="cancelled")
         
         return {
             "success": True,
             "message": "Booking cancelled",
             "data": response
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Failed to cancel booking: {e}")
+        logger.error("Failed to cancel booking: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await client.close()
 
@@ -0,0 +1,52 @@
+import asyncio
+from datetime import timedelta
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from app.dependencies import EVENTS_SCOPE, get_current_admin, get_stream_admin
+from app.core.security import create_access_token
+from app.config import settings
+from app.services.event_bus import event_bus
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# Events written per flush when a session has a backlog
+MAX_EVENTS_PER_WRITE = 50
+
+@router.post("/token")
+async def create_stream_token(admin: dict = Depends(get_current_admin)):
+    """Short-lived token for opening the event stream as /events/stream?token=..."""
+    expires_in = settings.EVENTS_TOKEN_EXPIRE_SECONDS
+    token = create_access_token(
+        {"sub": admin["id"], "email": admin["email"], "scope": EVENTS_SCOPE},
+        timedelta(seconds=expires_in)
+    )
+    return {"success": True, "data": {"token": token, "expires_in": expires_in}}
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    admin: dict = Depends(get_stream_admin)
+):
+    """Server-sent events of queue, status and metric changes; replaces polling the list endpoints"""
+    async def stream():
+        async with event_bus.subscribe() as queue:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    events = [await asyncio.wait_for(queue.get(), timeout=settings.EVENTS_HEARTBEAT_INTERVAL)]
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    # Keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                
+                while len(events) < MAX_EVENTS_PER_WRITE and not queue.empty():
+                    events.append(queue.get_nowait())
+                yield "".join(f"data: {event}\n\n" for event in events)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,153 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional, List
+from uuid import UUID
+from datetime import date, datetime, timedelta
+from app.dependencies import get_current_admin
+from app.core.supabase import get_supabase
+from app.config import settings
+from app.services.audit_logger import audit_logger
+from app.utils.logger import get_logger
+from app.utils.export import EXPORT_FORMATS, ENCODERS, iter_chunks, encode_parquet, gzip_stream
+from app.utils.projection import (
+    USER_LIST_COLUMNS,
+    PROPERTY_LIST_COLUMNS,
+    BOOKING_LIST_COLUMNS,
+    TRANSACTION_LIST_COLUMNS
+)
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+AUDIT_LOG_COLUMNS = (
+    "id, admin_user_id, action_type, target_platform, target_entity_type, target_entity_id, "
+    "action_details, ip_address, user_agent, created_at"
+)
+
+# Dataset -> (table, exportable columns, platform column, has removed_at)
+EXPORT_DATASETS = {
+    "users": ("unified_users", USER_LIST_COLUMNS, "platform_id", True),
+    "properties": ("unified_properties", PROPERTY_LIST_COLUMNS, "platform_id", True),
+    "bookings": ("unified_bookings", BOOKING_LIST_COLUMNS, "platform_id", True),
+    "transactions": ("unified_transactions", TRANSACTION_LIST_COLUMNS, "platform_id", False),
+    "audit_log": ("admin_audit_log", AUDIT_LOG_COLUMNS, "target_platform", False)
+}
+
+# Dataset -> SQL type of its non-text columns; Parquet exports are typed from these, not inferred
+EXPORT_COLUMN_TYPES = {
+    "users": {
+        "last_synced_at": "timestamptz", "removed_at": "timestamptz", "created_at": "timestamptz",
+        "updated_at": "timestamptz"
+    },
+    "properties": {
+        "price": "numeric", "is_featured": "boolean", "last_synced_at": "timestamptz",
+        "removed_at": "timestamptz", "created_at": "timestamptz"
+    },
+    "bookings": {
+        "check_in": "date", "check_out": "date", "total_price": "numeric", "last_synced_at": "timestamptz",
+        "removed_at": "timestamptz", "created_at": "timestamptz"
+    },
+    "transactions": {
+        "amount_total": "numeric", "amount_platform_fee": "numeric", "amount_host_payout": "numeric",
+        "processed_at": "timestamptz", "created_at": "timestamptz"
+    },
+    "audit_log": {
+        "created_at": "timestamptz"
+    }
+}
+
+def _columns(available: str, requested: Optional[str]) -> List[str]:
+    """Requested columns in the order given, or all exportable ones; raises ValueError on unknown names"""
+    columns = [column.strip() for column in available.split(",")]
+    if not requested:
+        return columns
+    selected = [column.strip() for column in requested.split(",") if column.strip()]
+    unknown = [column for column in selected if column not in columns]
+    if unknown or not selected:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}" if unknown else "No columns selected")
+    return selected
+
+@router.get("/{dataset}")
+async def export_dataset(
+    dataset: str,
+    http_request: Request,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson|parquet)$"),
+    columns: Optional[str] = Query(None, description="Comma-separated subset of the dataset's columns"),
+    gzip: bool = Query(False),
+    platform: Optional[UUID] = Query(None),
+    created_from: Optional[date] = Query(None),
+    created_to: Optional[date] = Query(None),
+    include_removed: bool = Query(False),
+    admin: dict = Depends(get_current_admin)
+):
+    """Stream a full table export, read in id-ordered chunks and written as it is read"""
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset: {dataset}")
+    table, available, platform_column, has_removed = EXPORT_DATASETS[dataset]
+    
+    try:
+        selected = _columns(available, columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    supabase = get_supabase()
+    # id drives the keyset even when it is not exported
+    select = ", ".join(selected if "id" in selected else ["id", *selected])
+    
+    def build_query():
+        query = supabase.table(table).select(select)
+        
+        # Apply filters
+        if platform:
+            query = query.eq(platform_column, str(platform))
+        if created_from:
+            query = query.gte("created_at", created_from.isoformat())
+        if created_to:
+            query = query.lt("created_at", (created_to + timedelta(days=1)).isoformat())
+        if has_removed and not include_removed:
+            query = query.is_("removed_at", "null")
+        return query
+    
+    def stream():
+        try:
+            chunks = iter_chunks(build_query, settings.EXPORT_CHUNK_SIZE)
+            if export_format == "parquet":
+                parts = encode_parquet(chunks, selected, EXPORT_COLUMN_TYPES[dataset])
+            else:
+                parts = ENCODERS[export_format](chunks, selected)
+            # Parquet compresses its own pages
+            yield from gzip_stream(parts) if gzip and export_format != "parquet" else parts
+        except Exception as e:
+            # Headers are already sent; the client sees a truncated body
+            logger.error("Failed to export %s: %s", dataset, e)
+            raise
+    
+    audit_logger.log(
+        admin["id"],
+        "data_exported",
+        target_entity_type=dataset,
+        action_details={
+            "format": export_format,
+            "columns": selected,
+            "platform": str(platform) if platform else None,
+            "created_from": created_from.isoformat() if created_from else None,
+            "created_to": created_to.isoformat() if created_to else None
+        },
+        target_platform=str(platform) if platform else None,
+        request=http_request
+    )
+    
+    # A .gz download rather than Content-Encoding, which clients would transparently undo
+    filename = f"{dataset}-{datetime.utcnow():%Y%m%d-%H%M%S}.{export_format}"
+    media_type = EXPORT_FORMATS[export_format]
+    if gzip and export_format != "parquet":
+        filename += ".gz"
+        media_type = "application/gzip"
+    
+    # A sync generator is iterated in the threadpool, so the blocking reads stay off the event loop
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import Optional
+from uuid import UUID
+from datetime import date
+from app.models.schemas import TransactionPage
+from app.dependencies import get_current_admin, conditional
+from app.core.supabase import get_supabase
+from app.utils.logger import get_logger
+from app.utils.pagination import apply_cursor, cursor_page
+from app.utils.responses import trusted
+from app.utils.projection import TRANSACTION_LIST_COLUMNS
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/finance", tags=["finance"])
+
+# Rollup source and its date column per period
+ROLLUP_VIEWS = {
+    "day": ("finance_daily_rollups", "day"),
+    "month": ("finance_monthly_rollups", "month")
+}
+
+@router.get("/rollups", dependencies=[Depends(conditional("transactions"))])
+async def get_rollups(
+    period: str = Query("day", pattern="^(day|month)$"),
+    platform: Optional[UUID] = Query(None),
+    currency: Optional[str] = Query(None),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    admin: dict = Depends(get_current_admin)
+):
+    """Revenue, fee, refund and payout totals per platform and currency, precomputed after each sync"""
+    supabase = get_supabase()
+    table, column = ROLLUP_VIEWS[period]
+    
+    try:
+        query = supabase.table(table).select("*")
+        
+        # Apply filters
+        if platform:
+            query = query.eq("platform_id", str(platform))
+        if currency:
+            query = query.eq("currency", currency.upper())
+        if date_from:
+            query = query.gte(column, date_from.isoformat())
+        if date_to:
+            query = query.lte(column, date_to.isoformat())
+        
+        response = query.order(column, desc=True).execute()
+        
+        return {
+            "success": True,
+            "data": response.data
+        }
+    except Exception as e:
+        logger.error("Failed to get finance rollups: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to retrieve finance rollups")
+
+@router.get("/transactions", response_model=TransactionPage, dependencies=[Depends(conditional("transactions"))])
+async def list_transactions(
+    http_response: Response,
+    transaction_type: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    platform: Optional[UUID] = Query(None),
+    booking_id: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    admin: dict = Depends(get_current_admin)
+):
+    """List ledger transactions across platforms, newest first"""
+    supabase = get_supabase()
+    
+    try:
+        query = supabase.table("unified_transactions").select(TRANSACTION_LIST_COLUMNS)
+        
+        # Apply filters
+        if transaction_type:
+            query = query.eq("transaction_type", transaction_type)
+        if status:
+            query = query.eq("status", status)
+        if platform:
+            query = query.eq("platform_id", str(platform))
+        if booking_id:
+            query = query.eq("booking_id", booking_id)
+        
+        # Keyset pagination, fetching one extra row to know whether there is a next page
+        response = apply_cursor(query, cursor).limit(limit + 1).execute()
+        data, next_cursor = cursor_page(response.data, limit)
+        
+        return trusted({"success": True, "data": data, "limit": limit, "next_cursor": next_cursor}, http_response, TransactionPage)
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Failed to list transactions: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to retrieve transactions")
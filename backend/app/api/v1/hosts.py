@@ -1,34 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from typing import Optional
+from app.models.schemas import CursorPaginatedResponse
 from app.dependencies import get_current_admin
 from app.config import settings
-from app.utils.logger import logger
+from app.services.audit_logger import audit_logger
+from app.services.event_bus import event_bus
+from app.services.host_supabase import host_supabase
+from app.utils.logger import get_logger
+from app.utils.responses import trusted
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/hosts", tags=["hosts"])
 
-@router.get("")
+@router.get("", response_model=CursorPaginatedResponse)
 async def list_hosts(
+    http_response: Response,
+    is_active: Optional[bool] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
     admin: dict = Depends(get_current_admin)
 ):
-    """List all hosts from Host Dashboard Supabase"""
-    try:
-        from app.services.host_supabase import HostSupabaseClient
-        
-        client = HostSupabaseClient()
-        hosts = await client.get_all_users()
-        
-        return {
-            "success": True,
-            "data": hosts,
-            "total": len(hosts)
-        }
-    except ValueError as e:
-        return {
+    """List hosts from Host Dashboard Supabase"""
+    if not host_supabase.configured:
+        return JSONResponse({
             "success": False,
             "error": "Host Dashboard Supabase credentials not configured",
             "message": "Set HOST_DASHBOARD_SUPABASE_URL and HOST_DASHBOARD_SUPABASE_KEY in Render env vars"
-        }
+        })
+    
+    try:
+        hosts, next_cursor = await host_supabase.list_users(is_active, cursor, limit)
+        return trusted({"success": True, "data": hosts, "limit": limit, "next_cursor": next_cursor}, http_response, CursorPaginatedResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Failed to list hosts: {e}")
+        logger.error("Failed to list hosts: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{host_id}")
@@ -37,11 +45,14 @@ async def get_host(
     admin: dict = Depends(get_current_admin)
 ):
     """Get host details"""
+    if not host_supabase.configured:
+        return {
+            "success": False,
+            "error": "Host Dashboard Supabase credentials not configured"
+        }
+    
     try:
-        from app.services.host_supabase import HostSupabaseClient
-        
-        client = HostSupabaseClient()
-        host = await client.get_user(host_id)
+        host = await host_supabase.get_user(host_id)
         
         if not host:
             raise HTTPException(status_code=404, detail="Host not found")
@@ -50,38 +61,33 @@ async def get_host(
             "success": True,
             "data": host
         }
-    except ValueError as e:
-        return {
-            "success": False,
-            "error": "Host Dashboard Supabase credentials not configured"
-        }
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Failed to get host: {e}")
+        logger.error("Failed to get host: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.patch("/{host_id}/status")
 async def update_host_status(
     host_id: str,
     is_active: bool,
+    http_request: Request,
     admin: dict = Depends(get_current_admin)
 ):
     """Update host active status"""
     try:
-        from app.services.host_supabase import HostSupabaseClient
-        from app.core.supabase import get_supabase
-        
-        client = HostSupabaseClient()
-        host = await client.update_user_status(host_id, is_active)
+        host = await host_supabase.update_user_status(host_id, is_active)
         
         # Log admin action
-        supabase = get_supabase()
-        supabase.table("admin_audit_log").insert({
-            "admin_user_id": admin["id"],
-            "action_type": "host_status_update",
-            "target_entity_type": "host",
-            "target_entity_id": host_id,
-            "action_details": {"is_active": is_active}
-        }).execute()
+        audit_logger.log(
+            admin["id"],
+            "host_status_update",
+            target_entity_type="host",
+            target_entity_id=host_id,
+            action_details={"is_active": is_active},
+            request=http_request
+        )
+        await event_bus.publish("host.status", ids=[host_id], is_active=is_active)
         
         return {
             "success": True,
@@ -89,7 +95,7 @@ async def update_host_status(
             "data": host
         }
     except Exception as e:
-        logger.error(f"Failed to update host status: {e}")
+        logger.error("Failed to update host status: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{host_id}/payouts")
@@ -98,14 +104,14 @@ async def get_host_payouts(
     admin: dict = Depends(get_current_admin)
 ):
     """Get host payouts"""
+    from app.services.host_platform import HostPlatformClient
+    
+    client = HostPlatformClient(
+        settings.HOST_DASHBOARD_URL,
+        settings.HOST_DASHBOARD_API_KEY
+    )
+    
     try:
-        from app.services.host_platform import HostPlatformClient
-        
-        client = HostPlatformClient(
-            settings.HOST_DASHBOARD_URL,
-            settings.HOST_DASHBOARD_API_KEY
-        )
-        
         response = await client.get_host_payouts(host_id)
         
         return {
@@ -113,6 +119,8 @@ async def get_host_payouts(
             "data": response
         }
     except Exception as e:
-        logger.error(f"Failed to get host payouts: {e}")
+        logger.error("Failed to get host payouts: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await client.close()
 
@@ -0,0 +1,91 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import Optional
+from app.models.schemas import NotificationPage, MarkNotificationsReadRequest, UnreadCountResponse
+from app.dependencies import get_current_admin
+from app.core.supabase import get_supabase
+from app.services.notification_engine import notification_engine, PRIORITIES
+from app.utils.logger import get_logger
+from app.utils.pagination import apply_cursor, cursor_page
+from app.utils.responses import trusted
+from app.utils.bulk import unique
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/notifications", tags=["notifications"])
+
+NOTIFICATION_LIST_COLUMNS = "id, type, title, message, data, is_read, priority, created_at"
+
+@router.get("", response_model=NotificationPage)
+async def list_notifications(
+    http_response: Response,
+    unread_only: bool = Query(False),
+    priority: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    admin: dict = Depends(get_current_admin)
+):
+    """Notification feed of the current admin, newest first"""
+    supabase = get_supabase()
+    
+    try:
+        if priority and priority not in PRIORITIES:
+            raise ValueError(f"Invalid priority: {priority}")
+        
+        query = supabase.table("admin_notifications").select(NOTIFICATION_LIST_COLUMNS).eq("admin_user_id", admin["id"])
+        if unread_only:
+            query = query.eq("is_read", False)
+        if priority:
+            query = query.eq("priority", priority)
+        
+        response = apply_cursor(query, cursor).limit(limit + 1).execute()
+        data, next_cursor = cursor_page(response.data, limit)
+        
+        return trusted({"success": True, "data": data, "limit": limit, "next_cursor": next_cursor}, http_response, NotificationPage)
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Failed to list notifications: %s", e, extra={"admin_id": admin["id"]})
+        raise HTTPException(status_code=500, detail="Failed to retrieve notifications")
+
+@router.get("/unread-count", response_model=UnreadCountResponse)
+async def get_unread_count(
+    admin: dict = Depends(get_current_admin)
+):
+    """Unread notifications of the current admin; served from a Redis counter, cheap enough to poll"""
+    try:
+        return {"success": True, "unread": await notification_engine.unread_count(admin["id"])}
+    
+    except Exception as e:
+        logger.error("Failed to count unread notifications: %s", e, extra={"admin_id": admin["id"]})
+        raise HTTPException(status_code=500, detail="Failed to count unread notifications")
+
+@router.post("/read")
+async def mark_notifications_read(
+    request: MarkNotificationsReadRequest,
+    admin: dict = Depends(get_current_admin)
+):
+    """Mark notifications of the current admin read"""
+    try:
+        updated = await notification_engine.mark_read(admin["id"], unique(request.notification_ids))
+        return {"success": True, "updated": updated}
+    
+    except Exception as e:
+        logger.error(
+            "Failed to mark notifications read: %s", e,
+            extra={"admin_id": admin["id"], "notifications": len(request.notification_ids)}
+        )
+        raise HTTPException(status_code=500, detail="Failed to mark notifications read")
+
+@router.post("/read-all")
+async def mark_all_notifications_read(
+    admin: dict = Depends(get_current_admin)
+):
+    """Mark every notification of the current admin read"""
+    try:
+        updated = await notification_engine.mark_read(admin["id"])
+        return {"success": True, "updated": updated}
+    
+    except Exception as e:
+        logger.error("Failed to mark all notifications read: %s", e, extra={"admin_id": admin["id"]})
+        raise HTTPException(status_code=500, detail="Failed to mark notifications read")
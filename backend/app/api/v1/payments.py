@@ -1,11 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from typing import Optional
+from app.models.schemas import CursorPaginatedResponse
 from app.dependencies import get_current_admin
 from app.services.host_platform import HostPlatformClient
 from app.config import settings
-from app.core.supabase import get_supabase
-from app.utils.logger import logger
+from app.services.audit_logger import audit_logger
+from app.services.event_bus import event_bus
+from app.services.host_supabase import host_supabase
+from app.utils.logger import get_logger
+from app.utils.responses import trusted
 from pydantic import BaseModel
 
+logger = get_logger(__name__)
+
 router = APIRouter(prefix="/payments", tags=["payments"])
 
 class RefundRequest(BaseModel):
@@ -16,15 +24,16 @@ class RefundRequest(BaseModel):
 @router.post("/refund")
 async def refund_payment(
     refund: RefundRequest,
+    http_request: Request,
     admin: dict = Depends(get_current_admin)
 ):
     """Issue a refund"""
+    client = HostPlatformClient(
+        settings.HOST_DASHBOARD_URL,
+        settings.HOST_DASHBOARD_API_KEY
+    )
+    
     try:
-        client = HostPlatformClient(
-            settings.HOST_DASHBOARD_URL,
-            settings.HOST_DASHBOARD_API_KEY
-        )
-        
         response = await client.refund_payment(
             refund.booking_id,
             refund.amount,
@@ -32,17 +41,18 @@ async def refund_payment(
         )
         
         # Log admin action
-        supabase = get_supabase()
-        supabase.table("admin_audit_log").insert({
-            "admin_user_id": admin["id"],
-            "action_type": "payment_refunded",
-            "target_entity_type": "booking",
-            "target_entity_id": refund.booking_id,
-            "action_details": {
+        audit_logger.log(
+            admin["id"],
+            "payment_refunded",
+            target_entity_type="booking",
+            target_entity_id=refund.booking_id,
+            action_details={
                 "amount": refund.amount,
                 "reason": refund.reason
-            }
-        }).execute()
+            },
+            request=http_request
+        )
+        await event_bus.publish("payment.refunded", ids=[refund.booking_id], amount=refund.amount)
         
         return {
             "success": True,
@@ -50,58 +60,56 @@ async def refund_payment(
             "data": response
         }
     except Exception as e:
-        logger.error(f"Failed to process refund: {e}")
+        logger.error("Failed to process refund: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await client.close()
 
-@router.get("/payouts")
+@router.get("/payouts", response_model=CursorPaginatedResponse)
 async def list_payouts(
-    status: str = None,
+    http_response: Response,
+    status: Optional[str] = Query(None),
+    host_id: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
     admin: dict = Depends(get_current_admin)
 ):
-    """List all payouts"""
-    try:
-        from app.services.host_supabase import HostSupabaseClient
-        
-        client = HostSupabaseClient()
-        payouts = await client.get_all_payouts(status)
-        
-        return {
-            "success": True,
-            "data": payouts,
-            "total": len(payouts)
-        }
-    except ValueError as e:
-        return {
+    """List payouts, newest first"""
+    if not host_supabase.configured:
+        return JSONResponse({
             "success": False,
             "error": "Host Dashboard Supabase credentials not configured"
-        }
+        })
+    
+    try:
+        payouts, next_cursor = await host_supabase.list_payouts(status, host_id, cursor, limit)
+        return trusted({"success": True, "data": payouts, "limit": limit, "next_cursor": next_cursor}, http_response, CursorPaginatedResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Failed to list payouts: {e}")
+        logger.error("Failed to list payouts: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/events")
+@router.get("/events", response_model=CursorPaginatedResponse)
 async def list_stripe_events(
-    limit: int = 100,
+    http_response: Response,
+    event_type: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
     admin: dict = Depends(get_current_admin)
 ):
-    """List Stripe webhook events"""
-    try:
-        from app.services.host_supabase import HostSupabaseClient
-        
-        client = HostSupabaseClient()
-        events = await client.get_stripe_events(limit)
-        
-        return {
-            "success": True,
-            "data": events,
-            "total": len(events)
-        }
-    except ValueError as e:
-        return {
+    """List Stripe webhook events, newest first"""
+    if not host_supabase.configured:
+        return JSONResponse({
             "success": False,
             "error": "Host Dashboard Supabase credentials not configured"
-        }
+        })
+    
+    try:
+        events, next_cursor = await host_supabase.list_stripe_events(event_type, cursor, limit)
+        return trusted({"success": True, "data": events, "limit": limit, "next_cursor": next_cursor}, http_response, CursorPaginatedResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Failed to list Stripe events: {e}")
+        logger.error("Failed to list Stripe events: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
-
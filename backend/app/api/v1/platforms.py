@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List
+from app.models.schemas import PlatformHealthResponse, SuccessResponse
+from app.dependencies import get_current_admin
+from app.services.health_monitor import health_monitor
+from app.core.circuit_breaker import get_breaker
+
+router = APIRouter(prefix="/platforms", tags=["platforms"])
+
+@router.get("/health", response_model=List[PlatformHealthResponse])
+async def get_platforms_health(
+    admin: dict = Depends(get_current_admin)
+):
+    """Latest health probe result for every platform"""
+    return health_monitor.platform_results()
+
+@router.get("/health/{name}/history")
+async def get_health_history(
+    name: str,
+    count: int = Query(60, ge=1, le=500),
+    admin: dict = Depends(get_current_admin)
+):
+    """Recent latency samples for a platform, Redis or Supabase"""
+    if name not in health_monitor.results:
+        raise HTTPException(status_code=404, detail="Unknown dependency")
+    
+    return SuccessResponse(
+        message="Health history retrieved",
+        data={
+            "current": health_monitor.results[name],
+            "circuit": get_breaker(name).snapshot() if name in health_monitor.platforms else None,
+            "history": await health_monitor.history(name, count)
+        }
+    )
@@ -1,93 +1,237 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from typing import Optional
-from app.dependencies import get_current_admin
+from uuid import UUID
+from app.models.schemas import PropertyPage, BulkPropertyStatusRequest, BulkActionResponse
+from app.dependencies import get_current_admin, conditional
+from app.core.supabase import get_supabase
+from app.core.http_cache import touch
 from app.services.host_platform import HostPlatformClient
 from app.config import settings
-from app.core.supabase import get_supabase
-from app.utils.logger import logger
+from app.services.audit_logger import audit_logger
+from app.services.event_bus import event_bus
+from app.core.redis import redis_client
+from app.utils.logger import get_logger
+from app.utils.bulk import unique, chunks, fan_out, bulk_report
+from app.utils.pagination import apply_cursor, cursor_page
+from app.utils.responses import trusted
+from app.utils.projection import PROPERTY_LIST_COLUMNS, attach_payload
+from app.utils.unified_ids import platform_id_by_name, resolve_platform_ids
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/properties", tags=["properties"])
 
-@router.get("")
+def _host_properties(supabase, property_ids):
+    """Resolve unified or Host Dashboard property ids; unified ids of other platforms are left out"""
+    return resolve_platform_ids(
+        supabase, "unified_properties", "platform_property_id",
+        platform_id_by_name(supabase, "host_dashboard"), property_ids
+    )
+
+@router.get("", response_model=PropertyPage, dependencies=[Depends(conditional("properties"))])
 async def list_properties(
+    http_response: Response,
     status: Optional[str] = Query(None),
-    page: int = Query(1, ge=1),
+    city: Optional[str] = Query(None),
+    listing_type: Optional[str] = Query(None),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    platform: Optional[UUID] = Query(None),
+    include_removed: bool = Query(False),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=100),
     admin: dict = Depends(get_current_admin)
 ):
-    """List all properties from Host Dashboard"""
+    """List properties across platforms from the synced unified table"""
+    supabase = get_supabase()
+    
     try:
-        client = HostPlatformClient(
-            settings.HOST_DASHBOARD_URL,
-            settings.HOST_DASHBOARD_API_KEY
-        )
+        query = supabase.table("unified_properties").select(PROPERTY_LIST_COLUMNS)
         
-        response = await client.get_all_properties(page=page, limit=limit, status=status)
+        # Apply filters
+        if status:
+            query = query.eq("status", status)
+        if city:
+            query = query.eq("city", city)
+        if listing_type:
+            query = query.eq("listing_type", listing_type)
+        if min_price is not None:
+            query = query.gte("price", min_price)
+        if max_price is not None:
+            query = query.lte("price", max_price)
+        if platform:
+            query = query.eq("platform_id", str(platform))
+        if not include_removed:
+            query = query.is_("removed_at", "null")
         
-        return {
-            "success": True,
-            "data": response.get("data", []),
-            "total": response.get("total", 0),
-            "page": page,
-            "limit": limit
-        }
+        # Keyset pagination, fetching one extra row to know whether there is a next page
+        response = apply_cursor(query, cursor).limit(limit + 1).execute()
+        data, next_cursor = cursor_page(response.data, limit)
+        
+        return trusted({"success": True, "data": data, "limit": limit, "next_cursor": next_cursor}, http_response, PropertyPage)
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Failed to list properties: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error("Failed to list properties: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to retrieve properties")
 
 @router.get("/{property_id}")
 async def get_property(
     property_id: str,
     admin: dict = Depends(get_current_admin)
 ):
-    """Get property details"""
+    """Get property details, fresh from the source platform where it supports it"""
+    supabase = get_supabase()
+    
+    client = HostPlatformClient(
+        settings.HOST_DASHBOARD_URL,
+        settings.HOST_DASHBOARD_API_KEY
+    )
+    
     try:
-        client = HostPlatformClient(
-            settings.HOST_DASHBOARD_URL,
-            settings.HOST_DASHBOARD_API_KEY
-        )
+        target = _host_properties(supabase, [property_id]).get(property_id)
+        unified_id = target["id"] if target else property_id
+        response = supabase.table("unified_properties").select("*").eq("id", unified_id).execute() if unified_id else None
+        
+        if not response or not response.data:
+            # No unified row: treat it as a Host Dashboard property id
+            return {
+                "success": True,
+                "data": await client.get_property(property_id)
+            }
         
-        response = await client.get_property(property_id)
+        prop = attach_payload(supabase, "unified_properties", response.data[0])
+        platform = supabase.table("platforms").select("name").eq("id", prop["platform_id"]).execute()
+        
+        if platform.data and platform.data[0]["name"] == "host_dashboard":
+            try:
+                prop["live"] = await client.get_property(prop["platform_property_id"])
+            except Exception as e:
+                # Serve the synced copy rather than failing the detail view
+                logger.warning("Live property fetch failed, serving synced copy: %s", e)
         
         return {
             "success": True,
-            "data": response
+            "data": prop
         }
     except Exception as e:
-        logger.error(f"Failed to get property: {e}")
+        logger.error("Failed to get property: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await client.close()
 
 @router.patch("/{property_id}/status")
 async def update_property_status(
     property_id: str,
     status: str,
+    http_request: Request,
     admin: dict = Depends(get_current_admin)
 ):
-    """Update property status (suspend/activate)"""
+    """Update property status (suspend/activate); takes a unified or Host Dashboard property id"""
+    supabase = get_supabase()
+    
+    client = HostPlatformClient(
+        settings.HOST_DASHBOARD_URL,
+        settings.HOST_DASHBOARD_API_KEY
+    )
+    
     try:
-        client = HostPlatformClient(
-            settings.HOST_DASHBOARD_URL,
-            settings.HOST_DASHBOARD_API_KEY
-        )
+        target = _host_properties(supabase, [property_id]).get(property_id)
+        if not target:
+            raise ValueError("Only Host Dashboard properties can change status")
         
-        response = await client.update_property_status(property_id, status)
+        response = await client.update_property_status(target["platform_property_id"], status)
+        
+        # Mirror the change on the unified copy, which the list endpoint serves
+        if target["id"]:
+            try:
+                supabase.table("unified_properties").update({"status": status}).eq("id", target["id"]).execute()
+            except Exception as e:
+                # The upstream change stands and the next sync brings the unified row in line
+                logger.error("Failed to mirror property status: %s", e)
         
         # Log admin action
-        supabase = get_supabase()
-        supabase.table("admin_audit_log").insert({
-            "admin_user_id": admin["id"],
-            "action_type": "property_status_update",
-            "target_entity_type": "property",
-            "target_entity_id": property_id,
-            "action_details": {"new_status": status}
-        }).execute()
+        audit_logger.log(
+            admin["id"],
+            "property_status_update",
+            target_entity_type="property",
+            target_entity_id=target["id"] or property_id,
+            action_details={"new_status": status},
+            request=http_request
+        )
+        await touch("properties")
+        await event_bus.publish("property.status", ids=[target["id"] or property_id], status=status)
         
         return {
             "success": True,
             "message": f"Property status updated to {status}",
             "data": response
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Failed to update property status: {e}")
+        logger.error("Failed to update property status: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await client.close()
 
+@router.post("/bulk/status", response_model=BulkActionResponse)
+async def bulk_update_property_status(
+    request: BulkPropertyStatusRequest,
+    http_request: Request,
+    admin: dict = Depends(get_current_admin)
+):
+    """Update the status of many properties (unified or Host Dashboard ids), with bounded concurrency upstream"""
+    supabase = get_supabase()
+    property_ids = unique(request.property_ids)
+    targets = _host_properties(supabase, property_ids)
+    errors = {
+        property_id: "Only Host Dashboard properties can change status"
+        for property_id in property_ids if property_id not in targets
+    }
+    client = HostPlatformClient(
+        settings.HOST_DASHBOARD_URL,
+        settings.HOST_DASHBOARD_API_KEY
+    )
+    
+    try:
+        errors.update(await fan_out(
+            [property_id for property_id in property_ids if property_id in targets],
+            lambda property_id: client.update_property_status(
+                targets[property_id]["platform_property_id"], request.status, invalidate_lists=False
+            ),
+            settings.BULK_UPSTREAM_CONCURRENCY
+        ))
+    finally:
+        await client.close()
+    await redis_client.delete_pattern("host:properties:*")
+    
+    # Mirror the change on the unified copies now rather than at the next sync
+    updated = [property_id for property_id in property_ids if not errors.get(property_id)]
+    try:
+        for chunk in chunks([targets[property_id]["id"] for property_id in updated if targets[property_id]["id"]]):
+            supabase.table("unified_properties").update({"status": request.status}).in_("id", chunk).execute()
+    except Exception as e:
+        # The upstream change stands and the next sync brings the unified rows in line
+        logger.error("Failed to mirror bulk property status: %s", e)
+    
+    # Log admin actions; the audit logger writes them in multi-row inserts
+    for property_id in updated:
+        audit_logger.log(
+            admin["id"],
+            "property_status_update",
+            target_entity_type="property",
+            target_entity_id=targets[property_id]["id"] or property_id,
+            action_details={"new_status": request.status, "bulk": True},
+            request=http_request
+        )
+    if updated:
+        await touch("properties")
+        await event_bus.publish(
+            "property.status",
+            ids=[targets[property_id]["id"] or property_id for property_id in updated],
+            status=request.status
+        )
+    
+    return bulk_report(property_ids, errors)
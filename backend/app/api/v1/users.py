@@ -1,23 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import Optional, List, Dict
+from uuid import UUID
 from app.models.schemas import (
     UnifiedUserResponse,
     UpdateUserStatusRequest,
+    BulkUserStatusRequest,
+    BulkActionResponse,
     SuccessResponse,
-    PaginatedResponse
+    UserPage
 )
-from app.dependencies import get_current_admin
+from app.dependencies import get_current_admin, conditional
 from app.core.supabase import get_supabase
-from app.utils.logger import logger
+from app.core.http_cache import touch
+from app.services.audit_logger import audit_logger
+from app.services.event_bus import event_bus
+from app.utils.logger import get_logger
+from app.utils.responses import trusted
+from app.utils.bulk import unique, chunks, bulk_report
+from app.utils.projection import USER_LIST_COLUMNS, PROPERTY_LIST_COLUMNS, BOOKING_LIST_COLUMNS, attach_payload
+from app.utils.unified_ids import is_uuid
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
-@router.get("", response_model=PaginatedResponse)
+@router.get("", response_model=UserPage, dependencies=[Depends(conditional("users"))])
 async def list_users(
-    platform: Optional[str] = Query(None),
+    http_response: Response,
+    platform: Optional[UUID] = Query(None),
     user_type: Optional[str] = Query(None),
     account_status: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    person_id: Optional[str] = Query(None),
+    include_removed: bool = Query(False),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
     admin: dict = Depends(get_current_admin)
@@ -27,17 +42,21 @@ async def list_users(
     
     try:
         # Build query
-        query = supabase.table("unified_users").select("*", count="exact")
+        query = supabase.table("unified_users").select(USER_LIST_COLUMNS, count="exact")
         
         # Apply filters
         if platform:
-            query = query.eq("platform_id", platform)
+            query = query.eq("platform_id", str(platform))
         if user_type:
             query = query.eq("user_type", user_type)
         if account_status:
             query = query.eq("account_status", account_status)
+        if person_id:
+            query = query.eq("person_id", person_id)
         if search:
             query = query.or_(f"email.ilike.%{search}%,full_name.ilike.%{search}%")
+        if not include_removed:
+            query = query.is_("removed_at", "null")
         
         # Pagination
         start = (page - 1) * limit
@@ -48,19 +67,19 @@ async def list_users(
         total = response.count if hasattr(response, 'count') else len(response.data)
         total_pages = (total + limit - 1) // limit
         
-        return PaginatedResponse(
-            data=response.data,
-            page=page,
-            limit=limit,
-            total=total,
-            total_pages=total_pages
-        )
+        return trusted({
+            "data": response.data,
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "total_pages": total_pages
+        }, http_response, UserPage)
     
     except Exception as e:
-        logger.error(f"Failed to list users: {e}")
+        logger.error("Failed to list users: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve users")
 
-@router.get("/{user_id}")
+@router.get("/{user_id}", dependencies=[Depends(conditional("users", "properties", "bookings"))])
 async def get_user(
     user_id: str,
     admin: dict = Depends(get_current_admin)
@@ -75,25 +94,36 @@ async def get_user(
         if not response.data:
             raise HTTPException(status_code=404, detail="User not found")
         
-        user = response.data[0]
+        user = attach_payload(supabase, "unified_users", response.data[0])
         
-        # Get user's properties
-        properties_response = supabase.table("unified_properties").select("*").eq(
-            "owner_user_id", user_id
-        ).execute()
+        # Every account of the same person, across platforms
+        if user.get("person_id"):
+            accounts = supabase.table("unified_users").select(USER_LIST_COLUMNS).eq(
+                "person_id", user["person_id"]
+            ).execute().data
+        else:
+            accounts = [user]
+        account_ids = [account["id"] for account in accounts]
+        id_list = ",".join(account_ids)
         
-        # Get user's bookings
-        bookings_response = supabase.table("unified_bookings").select("*").or_(
-            f"guest_user_id.eq.{user_id},host_user_id.eq.{user_id}"
-        ).execute()
+        # Properties and bookings of all linked accounts
+        properties_response = supabase.table("unified_properties").select(PROPERTY_LIST_COLUMNS).in_(
+            "owner_user_id", account_ids
+        ).is_("removed_at", "null").execute()
+        
+        bookings_response = supabase.table("unified_bookings").select(BOOKING_LIST_COLUMNS).or_(
+            f"guest_user_id.in.({id_list}),host_user_id.in.({id_list})"
+        ).is_("removed_at", "null").execute()
         
         return SuccessResponse(
             message="User retrieved successfully",
             data={
                 "user": user,
+                "linked_accounts": [account for account in accounts if account["id"] != user_id],
                 "properties": properties_response.data,
                 "bookings": bookings_response.data,
                 "stats": {
+                    "total_accounts": len(accounts),
                     "total_properties": len(properties_response.data),
                     "total_bookings": len(bookings_response.data)
                 }
@@ -103,13 +133,14 @@ async def get_user(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get user: {e}")
+        logger.error("Failed to get user: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve user")
 
 @router.patch("/{user_id}/status")
 async def update_user_status(
     user_id: str,
     request: UpdateUserStatusRequest,
+    http_request: Request,
     admin: dict = Depends(get_current_admin)
 ):
     """Update user account status (suspend, ban, activate)"""
@@ -125,16 +156,19 @@ async def update_user_status(
             raise HTTPException(status_code=404, detail="User not found")
         
         # Log admin action
-        supabase.table("admin_audit_log").insert({
-            "admin_user_id": admin["id"],
-            "action_type": "user_status_update",
-            "target_entity_type": "user",
-            "target_entity_id": user_id,
-            "action_details": {
+        audit_logger.log(
+            admin["id"],
+            "user_status_update",
+            target_entity_type="user",
+            target_entity_id=user_id,
+            action_details={
                 "new_status": request.status.value,
                 "reason": request.reason
-            }
-        }).execute()
+            },
+            request=http_request
+        )
+        await touch("users")
+        await event_bus.publish("user.status", ids=[user_id], status=request.status.value)
         
         return SuccessResponse(
             message=f"User status updated to {request.status.value}",
@@ -144,6 +178,56 @@ async def update_user_status(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to update user status: {e}")
+        logger.error("Failed to update user status: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update user status")
 
+
+@router.post("/bulk/status", response_model=BulkActionResponse)
+async def bulk_update_user_status(
+    request: BulkUserStatusRequest,
+    http_request: Request,
+    admin: dict = Depends(get_current_admin)
+):
+    """Update the account status of many users at once (moderation sweeps)"""
+    supabase = get_supabase()
+    user_ids = unique(request.user_ids)
+    # A malformed id would fail the whole in.(...) filter of its chunk
+    errors: Dict[str, Optional[str]] = {user_id: "User not found" for user_id in user_ids if not is_uuid(user_id)}
+    updated = set()
+    
+    for chunk in chunks([user_id for user_id in user_ids if user_id not in errors]):
+        try:
+            response = supabase.table("unified_users").update({
+                "account_status": request.status.value
+            }).in_("id", chunk).execute()
+        except Exception as e:
+            # Earlier chunks are committed; report this one as failed and carry on
+            logger.error("Failed to bulk update user status: %s", e)
+            errors.update({user_id: "Failed to update user status" for user_id in chunk})
+            continue
+        
+        landed = {row["id"] for row in response.data}
+        errors.update({user_id: "User not found" for user_id in chunk if user_id not in landed})
+        updated.update(landed)
+        
+        # Audit each chunk as it commits; the audit logger writes them in multi-row inserts
+        for user_id in chunk:
+            if user_id in landed:
+                audit_logger.log(
+                    admin["id"],
+                    "user_status_update",
+                    target_entity_type="user",
+                    target_entity_id=user_id,
+                    action_details={
+                        "new_status": request.status.value,
+                        "reason": request.reason,
+                        "bulk": True
+                    },
+                    request=http_request
+                )
+    
+    if updated:
+        await touch("users")
+        await event_bus.publish("user.status", ids=sorted(updated), status=request.status.value)
+    
+    return bulk_report(user_ids, errors)
@@ -1,22 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from datetime import datetime
 from app.models.schemas import (
     VerificationQueueItem,
     ApproveVerificationRequest,
     RejectVerificationRequest,
     RequestResubmissionRequest,
+    BulkApproveVerificationRequest,
+    BulkRejectVerificationRequest,
+    BulkActionResponse,
     SuccessResponse
 )
-from app.dependencies import get_current_admin
+from app.dependencies import get_current_admin, conditional
 from app.core.supabase import get_supabase
+from app.core.http_cache import touch
 from app.services.agent_platform import AgentPlatformClient
+from app.services.audit_logger import audit_logger
+from app.services.event_bus import event_bus
 from app.config import settings
-from app.utils.logger import logger
+from app.utils.logger import get_logger
+from app.utils.responses import trusted
+from app.utils.bulk import unique, chunks, fan_out, bulk_report
+from app.utils.unified_ids import is_uuid
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/verification", tags=["verification"])
 
-@router.get("/queue", response_model=List[VerificationQueueItem])
+@router.get("/queue", response_model=List[VerificationQueueItem], dependencies=[Depends(conditional("verifications"))])
 async def get_verification_queue(
+    http_response: Response,
     status: str = "pending",
     admin: dict = Depends(get_current_admin)
 ):
@@ -31,12 +44,46 @@ async def get_verification_queue(
         
         response = query.order("created_at", desc=True).execute()
         
-        return response.data
+        return trusted(response.data, http_response, List[VerificationQueueItem])
     
     except Exception as e:
-        logger.error(f"Failed to get verification queue: {e}")
+        logger.error("Failed to get verification queue: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve verification queue")
 
+# Declared before /{verification_id}, which would otherwise match it
+@router.get("/statistics", dependencies=[Depends(conditional("verifications"))])
+async def get_verification_statistics(
+    admin: dict = Depends(get_current_admin)
+):
+    """Get verification statistics"""
+    supabase = get_supabase()
+    
+    try:
+        # Get counts by status
+        response = supabase.table("verification_queue").select("status").execute()
+        
+        stats = {
+            "total": len(response.data),
+            "pending": 0,
+            "in_review": 0,
+            "approved": 0,
+            "rejected": 0
+        }
+        
+        for item in response.data:
+            status = item.get("status", "pending")
+            if status in stats:
+                stats[status] += 1
+        
+        return SuccessResponse(
+            message="Statistics retrieved",
+            data=stats
+        )
+    
+    except Exception as e:
+        logger.error("Failed to get statistics: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to retrieve statistics")
+
 @router.get("/{verification_id}")
 async def get_verification_details(
     verification_id: str,
@@ -79,7 +126,7 @@ async def get_verification_details(
                     verification["platform_user_id"]
                 )
             except Exception as e:
-                logger.error(f"Failed to fetch platform details: {e}")
+                logger.error("Failed to fetch platform details: %s", e)
                 platform_details = None
         else:
             platform_details = None
@@ -97,13 +144,171 @@ async def get_verification_details(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get verification details: {e}")
+        logger.error("Failed to get verification details: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve verification details")
 
+async def _announce_review(reviewed: List[Dict[str, Any]], status: str):
+    """Announce reviewed verifications with per-status count changes, so queue badges update without a refetch"""
+    if not reviewed:
+        return
+    await touch("verifications", "users")
+    delta: Dict[str, int] = {status: len(reviewed)}
+    for row in reviewed:
+        delta[row["status"]] = delta.get(row["status"], 0) - 1
+    await event_bus.publish(
+        "verification.status",
+        ids=[row["id"] for row in reviewed],
+        status=status,
+        delta={key: value for key, value in delta.items() if value}
+    )
+
+async def _bulk_review(
+    verification_ids: List[str],
+    upstream: Callable[[AgentPlatformClient, Dict[str, Any]], Awaitable[Any]],
+    queue_update: Dict[str, Any],
+    user_update: Dict[str, Any]
+) -> Tuple[Dict[str, Optional[str]], Dict[str, Dict[str, Any]]]:
+    """Review many verifications: upstream calls fanned out, then set-based updates of the reviewed ones"""
+    supabase = get_supabase()
+    
+    # A malformed id would fail the whole in.(...) filter of its chunk
+    errors: Dict[str, Optional[str]] = {
+        verification_id: "Verification not found" for verification_id in verification_ids if not is_uuid(verification_id)
+    }
+    verifications: Dict[str, Dict[str, Any]] = {}
+    for chunk in chunks([verification_id for verification_id in verification_ids if verification_id not in errors]):
+        try:
+            response = supabase.table("verification_queue").select("*").in_("id", chunk).execute()
+        except Exception as e:
+            logger.error("Failed to load verifications for bulk review: %s", e)
+            errors.update({verification_id: "Failed to load verification" for verification_id in chunk})
+            continue
+        verifications.update({row["id"]: row for row in response.data})
+        errors.update({
+            verification_id: "Verification not found" for verification_id in chunk if verification_id not in verifications
+        })
+    
+    # Review on the source platform where it has a verification API
+    platform_ids = list({row["platform_id"] for row in verifications.values()})
+    platforms = supabase.table("platforms").select("*").in_("id", platform_ids).execute().data if platform_ids else []
+    clients = {
+        platform["id"]: AgentPlatformClient(platform["api_base_url"], platform["api_key"])
+        for platform in platforms if platform["name"] == "agent_dashboard"
+    }
+    try:
+        errors.update(await fan_out(
+            [verification_id for verification_id, row in verifications.items() if row["platform_id"] in clients],
+            lambda verification_id: upstream(
+                clients[verifications[verification_id]["platform_id"]], verifications[verification_id]
+            ),
+            settings.BULK_UPSTREAM_CONCURRENCY
+        ))
+    finally:
+        for client in clients.values():
+            await client.close()
+    
+    reviewed = [verification_id for verification_id in verifications if not errors.get(verification_id)]
+    try:
+        for chunk in chunks(reviewed):
+            supabase.table("verification_queue").update(queue_update).in_("id", chunk).execute()
+        user_ids = list({verifications[verification_id]["user_id"] for verification_id in reviewed} - {None})
+        for chunk in chunks(user_ids):
+            supabase.table("unified_users").update(user_update).in_("id", chunk).execute()
+    except Exception as e:
+        logger.error("Failed to record bulk verification review: %s", e)
+        errors.update({verification_id: f"Reviewed upstream but not recorded: {e}" for verification_id in reviewed})
+    
+    return errors, verifications
+
+@router.post("/bulk/approve", response_model=BulkActionResponse)
+async def bulk_approve_verifications(
+    request: BulkApproveVerificationRequest,
+    http_request: Request,
+    admin: dict = Depends(get_current_admin)
+):
+    """Approve many verifications at once"""
+    verification_ids = unique(request.verification_ids)
+    errors, verifications = await _bulk_review(
+        verification_ids,
+        lambda client, verification: client.approve_agent(verification["platform_user_id"], request.notes, admin["id"]),
+        {
+            "status": "approved",
+            "reviewed_by": admin["id"],
+            "reviewed_at": datetime.utcnow().isoformat(),
+            "review_notes": request.notes
+        },
+        {"verification_status": "approved", "account_status": "active"}
+    )
+    
+    # Log admin actions; the audit logger writes them in multi-row inserts
+    for verification_id in verification_ids:
+        if not errors.get(verification_id):
+            audit_logger.log(
+                admin["id"],
+                "verification_approved",
+                target_entity_type="verification",
+                target_entity_id=verification_id,
+                action_details={"notes": request.notes, "bulk": True},
+                target_platform=verifications[verification_id]["platform_id"],
+                request=http_request
+            )
+    await _announce_review(
+        [verifications[verification_id] for verification_id in verification_ids if not errors.get(verification_id)],
+        "approved"
+    )
+    
+    return bulk_report(verification_ids, errors)
+
+@router.post("/bulk/reject", response_model=BulkActionResponse)
+async def bulk_reject_verifications(
+    request: BulkRejectVerificationRequest,
+    http_request: Request,
+    admin: dict = Depends(get_current_admin)
+):
+    """Reject many verifications at once"""
+    verification_ids = unique(request.verification_ids)
+    errors, verifications = await _bulk_review(
+        verification_ids,
+        lambda client, verification: client.reject_agent(
+            verification["platform_user_id"], request.reason, request.notes or "", admin["id"]
+        ),
+        {
+            "status": "rejected",
+            "reviewed_by": admin["id"],
+            "reviewed_at": datetime.utcnow().isoformat(),
+            "review_notes": request.notes
+        },
+        {"verification_status": "rejected", "account_status": "suspended"}
+    )
+    
+    # Log admin actions; the audit logger writes them in multi-row inserts
+    for verification_id in verification_ids:
+        if not errors.get(verification_id):
+            audit_logger.log(
+                admin["id"],
+                "verification_rejected",
+                target_entity_type="verification",
+                target_entity_id=verification_id,
+                action_details={
+                    "reason": request.reason,
+                    "notes": request.notes,
+                    "bulk": True
+                },
+                target_platform=verifications[verification_id]["platform_id"],
+                request=http_request
+            )
+    await _announce_review(
+        [verifications[verification_id] for verification_id in verification_ids if not errors.get(verification_id)],
+        "rejected"
+    )
+    
+    return bulk_report(verification_ids, errors)
+
 @router.post("/{verification_id}/approve")
 async def approve_verification(
     verification_id: str,
     request: ApproveVerificationRequest,
+    http_request: Request,
     admin: dict = Depends(get_current_admin)
 ):
     """Approve agent/host verification"""
@@ -154,14 +359,16 @@ async def approve_verification(
         }).eq("id", verification["user_id"]).execute()
         
         # Log admin action
-        supabase.table("admin_audit_log").insert({
-            "admin_user_id": admin["id"],
-            "action_type": "verification_approved",
-            "target_platform": verification["platform_id"],
-            "target_entity_type": "verification",
-            "target_entity_id": verification_id,
-            "action_details": {"notes": request.notes}
-        }).execute()
+        audit_logger.log(
+            admin["id"],
+            "verification_approved",
+            target_entity_type="verification",
+            target_entity_id=verification_id,
+            action_details={"notes": request.notes},
+            target_platform=verification["platform_id"],
+            request=http_request
+        )
+        await _announce_review([verification], "approved")
         
         return SuccessResponse(
             message="Verification approved successfully"
@@ -170,13 +377,14 @@ async def approve_verification(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to approve verification: {e}")
+        logger.error("Failed to approve verification: %s", e)
         raise HTTPException(status_code=500, detail="Failed to approve verification")
 
 @router.post("/{verification_id}/reject")
 async def reject_verification(
     verification_id: str,
     request: RejectVerificationRequest,
+    http_request: Request,
     admin: dict = Depends(get_current_admin)
 ):
     """Reject agent/host verification"""
@@ -228,17 +436,19 @@ async def reject_verification(
         }).eq("id", verification["user_id"]).execute()
         
         # Log admin action
-        supabase.table("admin_audit_log").insert({
-            "admin_user_id": admin["id"],
-            "action_type": "verification_rejected",
-            "target_platform": verification["platform_id"],
-            "target_entity_type": "verification",
-            "target_entity_id": verification_id,
-            "action_details": {
+        audit_logger.log(
+            admin["id"],
+            "verification_rejected",
+            target_entity_type="verification",
+            target_entity_id=verification_id,
+            action_details={
                 "reason": request.reason,
                 "notes": request.notes
-            }
-        }).execute()
+            },
+            target_platform=verification["platform_id"],
+            request=http_request
+        )
+        await _announce_review([verification], "rejected")
         
         return SuccessResponse(
             message="Verification rejected"
@@ -247,39 +457,5 @@ async def reject_verification(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to reject verification: {e}")
+        logger.error("Failed to reject verification: %s", e)
         raise HTTPException(status_code=500, detail="Failed to reject verification")
-
-@router.get("/statistics")
-async def get_verification_statistics(
-    admin: dict = Depends(get_current_admin)
-):
-    """Get verification statistics"""
-    supabase = get_supabase()
-    
-    try:
-        # Get counts by status
-        response = supabase.table("verification_queue").select("status").execute()
-        
-        stats = {
-            "total": len(response.data),
-            "pending": 0,
-            "in_review": 0,
-            "approved": 0,
-            "rejected": 0
-        }
-        
-        for item in response.data:
-            status = item.get("status", "pending")
-            if status in stats:
-                stats[status] += 1
-        
-        return SuccessResponse(
-            message="Statistics retrieved",
-            data=stats
-        )
-    
-    except Exception as e:
-        logger.error(f"Failed to get statistics: {e}")
-        raise HTTPException(status_code=500, detail="Failed to retrieve statistics")
-
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     # API Settings
@@ -26,6 +26,7 @@ class Settings(BaseSettings):
     HOST_DASHBOARD_API_KEY: str
     HOST_DASHBOARD_SUPABASE_URL: Optional[str] = None
     HOST_DASHBOARD_SUPABASE_KEY: Optional[str] = None
+    HOST_SUPABASE_CACHE_TTL: int = 60
     
     # Platform APIs - Agent Dashboard
     AGENT_DASHBOARD_URL: str = "https://krib-real-estate-agent-dahaboard-backend.onrender.com"
@@ -39,6 +40,87 @@ class Settings(BaseSettings):
     CUSTOMER_PLATFORM_SUPABASE_URL: Optional[str] = None
     CUSTOMER_PLATFORM_SUPABASE_KEY: Optional[str] = None
     
+    # Upstream Resilience
+    PLATFORM_TIMEOUT_MIN: float = 2.0
+    PLATFORM_TIMEOUT_MAX: float = 30.0
+    PLATFORM_TIMEOUT_MIN_SAMPLES: int = 50  # real request latencies before the timeout adapts away from the max
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RECOVERY_TIMEOUT: float = 30.0
+    STALE_CACHE_TTL: int = 3600
+    PLATFORM_RETRY_ATTEMPTS: int = 4
+    PLATFORM_RETRY_BASE_DELAY: float = 0.5
+    PLATFORM_RETRY_MAX_DELAY: float = 10.0
+    PLATFORM_RETRY_BUDGET: float = 30.0
+    PLATFORM_RATE_LIMIT: float = 10.0
+    PLATFORM_RATE_BURST: int = 20
+    
+    # Health Checks
+    HEALTH_CHECK_INTERVAL: float = 30.0
+    HEALTH_HISTORY_SIZE: int = 120
+    
+    # Logging
+    LOG_LEVEL: Optional[str] = None  # defaults to DEBUG in development, INFO otherwise
+    LOG_LEVELS: str = ""  # per-module overrides, e.g. "services.sync_service=WARNING"
+    LOG_FORMAT: str = "json"  # json or text
+    LOG_SAMPLE_RATE: int = 100  # keep 1 in N high-volume lines
+    LOG_QUEUE_SIZE: int = 10000
+    
+    # Tracing
+    TRACING_EXPORTER: str = "none"  # none, console, file or otlp
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_SAMPLE_RATIO: float = 1.0
+    
+    # Audit Log
+    AUDIT_LOG_BATCH_SIZE: int = 50
+    AUDIT_LOG_FLUSH_INTERVAL: float = 2.0
+    
+    # Sync
+    SYNC_BATCH_SIZE: int = 500
+    SYNC_RECONCILE: bool = True
+    SYNC_RECONCILE_MAX_FRACTION: float = 0.5
+    SYNC_PAYOUT_LOOKBACK: float = 300.0  # seconds of payout changes re-read behind the watermark
+    
+    # HTTP Responses
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies are sent as is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # higher levels cost more CPU than they save on the wire
+    RESPONSE_VALIDATION: bool = False  # check trusted list responses against their schemas (development)
+    
+    # Admin Events
+    EVENTS_QUEUE_SIZE: int = 100  # undelivered events per session before it is told to resync
+    EVENTS_HEARTBEAT_INTERVAL: float = 15.0
+    EVENTS_TOKEN_EXPIRE_SECONDS: int = 60  # stream tokens only need to outlive the EventSource handshake
+    
+    # Bulk Actions
+    BULK_UPSTREAM_CONCURRENCY: int = 10  # upstream calls in flight per bulk request
+    
+    # Exports
+    EXPORT_CHUNK_SIZE: int = 1000  # rows per query; PostgREST caps responses at its max-rows setting
+    
+    # Stripe Events
+    STRIPE_EVENT_POLL_INTERVAL: float = 60.0
+    STRIPE_EVENT_BATCH_SIZE: int = 500
+    STRIPE_EVENT_LOOKBACK: float = 300.0  # seconds re-read behind the watermark; receipts skip events already applied
+    
+    # Analytics
+    ANALYTICS_FORWARD_DAYS: int = 180  # future nights already booked count toward occupancy this far ahead
+    ANALYTICS_MAX_DAYS: int = 1096  # widest date range one time series request may span
+    
+    # Notifications
+    NOTIFICATION_BATCH_SIZE: int = 100  # rows per insert; a full queue flushes early
+    NOTIFICATION_FLUSH_INTERVAL: float = 5.0
+    NOTIFICATION_MAX_PER_RULE: int = 20  # occurrences per evaluation before they are folded into one digest
+    NOTIFICATION_COOLDOWN: int = 3600  # seconds between repeats of an ongoing condition (platform down, sync failing)
+    NOTIFICATION_UNREAD_TTL: int = 86400
+    NOTIFY_VERIFICATION_PENDING_HOURS: float = 24.0
+    NOTIFY_REFUND_THRESHOLDS: Dict[str, float] = {  # per refund currency; JSON object in the environment
+        "AED": 5000.0, "SAR": 5000.0, "USD": 1400.0, "EUR": 1250.0, "GBP": 1100.0
+    }
+    NOTIFY_REFUND_THRESHOLD: float = 5000.0  # currencies not listed above
+    
+    # Identity Resolution
+    IDENTITY_DEFAULT_COUNTRY_CODE: str = "971"  # for local phone numbers starting with 0
+    
     # Environment
     ENVIRONMENT: str = "development"
     
@@ -0,0 +1,150 @@
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """Raised when a platform call is rejected by an open circuit"""
+    
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit open for {name}, retry in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    """Per-platform circuit breaker with latency-based adaptive timeout"""
+    
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        recovery_timeout: float,
+        min_timeout: float,
+        max_timeout: float,
+        min_samples: int,
+        window: int = 200
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min(min_samples, window)
+        self.latencies: deque = deque(maxlen=window)
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_started: Optional[float] = None
+    
+    def allow_request(self) -> bool:
+        """Check whether a call may go upstream right now"""
+        if self.state == CLOSED:
+            return True
+        
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                return False
+            self._transition(HALF_OPEN)
+        
+        # Half-open: let a single trial request through (a cancelled trial expires)
+        now = time.monotonic()
+        if self._trial_started is not None and now - self._trial_started < self.max_timeout:
+            return False
+        self._trial_started = now
+        return True
+    
+    def record_success(self, latency: Optional[float] = None):
+        """Record a successful call and its latency in seconds; None keeps it out of the timeout"""
+        if latency is not None:
+            self.latencies.append(latency)
+        self.consecutive_failures = 0
+        self._trial_started = None
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+    
+    def record_failure(self):
+        """Record a request that failed after its retries (transport error, timeout or 5xx)"""
+        self.consecutive_failures += 1
+        self._trial_started = None
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._transition(OPEN)
+    
+    def release(self):
+        """End a call without a verdict (e.g. rate limited), freeing the half-open trial slot"""
+        self._trial_started = None
+    
+    def retry_in(self) -> float:
+        """Seconds until the next half-open trial"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+    
+    def timeout(self) -> float:
+        """Request timeout derived from the recent p99 latency"""
+        # Trial requests get the full budget so a cold start can complete, and a few samples
+        # are not a p99: until there are enough, the configured maximum stands
+        if self.state != CLOSED or len(self.latencies) < self.min_samples:
+            return self.max_timeout
+        
+        p99 = self._percentile(0.99)
+        return min(self.max_timeout, max(self.min_timeout, p99 * 3))
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Breaker state for the health endpoint"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_s": round(self.retry_in(), 1),
+            "timeout_s": round(self.timeout(), 2),
+            "latency_samples": len(self.latencies),
+            "p50_ms": self._percentile_ms(0.50),
+            "p99_ms": self._percentile_ms(0.99)
+        }
+    
+    def _transition(self, state: str):
+        if state == self.state:
+            if state == OPEN:
+                self.opened_at = time.monotonic()
+            return
+        
+        logger.warning("Circuit for %s: %s -> %s", self.name, self.state, state)
+        self.state = state
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+        elif state == CLOSED:
+            self.opened_at = None
+    
+    def _percentile(self, q: float) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    
+    def _percentile_ms(self, q: float) -> Optional[int]:
+        if not self.latencies:
+            return None
+        return int(self._percentile(q) * 1000)
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Get the shared breaker for a platform"""
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker(
+            name,
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=settings.CIRCUIT_RECOVERY_TIMEOUT,
+            min_timeout=settings.PLATFORM_TIMEOUT_MIN,
+            max_timeout=settings.PLATFORM_TIMEOUT_MAX,
+            min_samples=settings.PLATFORM_TIMEOUT_MIN_SAMPLES
+        )
+    return _breakers[name]
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every platform breaker"""
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
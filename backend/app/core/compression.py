@@ -0,0 +1,109 @@
+import zlib
+from typing import Optional
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+
+# Media types worth compressing; event streams must not be buffered, archives and Parquet already are compressed
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/plain",
+    "text/html"
+}
+
+class _Encoder:
+    """Incremental brotli or gzip encoder; every chunk but the last is flushed so streams keep flowing"""
+    
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self.brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self.brotli = None
+            self.gzip = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+    
+    def encode(self, data: bytes, final: bool) -> bytes:
+        if self.brotli:
+            return self.brotli.process(data) + (self.brotli.finish() if final else self.brotli.flush())
+        return self.gzip.compress(data) + self.gzip.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Preferred supported encoding of an Accept-Encoding header: br, then gzip"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        _, _, quality = params.partition("q=")
+        try:
+            if quality and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.strip())
+    for encoding in ("br", "gzip"):
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+class CompressionMiddleware:
+    """ASGI middleware compressing JSON and text responses above a size threshold"""
+    
+    def __init__(self, app, minimum_size: int, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+        
+        start = None
+        encoder: Optional[_Encoder] = None
+        
+        async def send_wrapper(message):
+            nonlocal start, encoder
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether the response is worth compressing
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(scope=start)
+                media_type = headers.get("content-type", "").split(";")[0].strip()
+                if (
+                    media_type in COMPRESSIBLE_TYPES
+                    and "content-encoding" not in headers
+                    and (more_body or len(body) >= self.minimum_size)
+                ):
+                    encoder = _Encoder(encoding, self.gzip_level, self.brotli_quality)
+                    headers["Content-Encoding"] = encoding
+                    headers.add_vary_header("Accept-Encoding")
+                    if "content-length" in headers:
+                        del headers["Content-Length"]
+                elif media_type in COMPRESSIBLE_TYPES:
+                    headers.add_vary_header("Accept-Encoding")
+                
+                if encoder and not more_body:
+                    body = encoder.encode(body, final=True)
+                    headers["Content-Length"] = str(len(body))
+                    message = {**message, "body": body}
+                    encoder = None
+                await send(start)
+                start = None
+            
+            if encoder:
+                message = {**message, "body": encoder.encode(body, final=not more_body)}
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,46 @@
+import asyncio
+import hashlib
+import time
+from email.utils import formatdate
+from typing import Dict, Iterable, Optional, Tuple
+from starlette.requests import Request
+from app.core.redis import redis_client
+
+# Dataset -> time of its last local write, shared by all workers
+DATA_VERSION_PREFIX = "data_version:"
+
+async def touch(*datasets: str):
+    """Record a write so validators handed out for these datasets stop matching"""
+    now = time.time()
+    for dataset in datasets:
+        await redis_client.set(f"{DATA_VERSION_PREFIX}{dataset}", now, ex=None)
+
+async def data_versions(datasets: Iterable[str]) -> Optional[Dict[str, float]]:
+    """Current version of each dataset, or None when Redis cannot vouch for all of them"""
+    datasets = list(datasets)
+    versions = await asyncio.gather(*[redis_client.get(f"{DATA_VERSION_PREFIX}{dataset}") for dataset in datasets])
+    missing = [dataset for dataset, version in zip(datasets, versions) if version is None]
+    if missing:
+        # A lost version starts over at now, which no validator handed out before can match
+        if redis_client.redis:
+            await touch(*missing)
+        return None
+    return dict(zip(datasets, versions))
+
+def validators(request: Request, versions: Dict[str, float]) -> Tuple[str, str]:
+    """Weak ETag of the URL and dataset versions, and Last-Modified of the newest version"""
+    digest = hashlib.sha1(
+        f"{request.url.path}?{request.url.query}|{sorted(versions.items())}".encode()
+    ).hexdigest()[:20]
+    # Weak: the compression middleware may re-encode the body
+    return f'W/"{digest}"', formatdate(max(versions.values()), usegmt=True)
+
+def not_modified(request: Request, etag: str) -> bool:
+    """Evaluate If-None-Match; If-Modified-Since is ignored"""
+    # HTTP dates have one-second precision while versions change within a second, so a
+    # write landing in the same second as the validator would be answered with a 304
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
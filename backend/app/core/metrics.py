@@ -0,0 +1,126 @@
+import re
+import time
+from prometheus_client import Counter, Histogram, Gauge, CONTENT_TYPE_LATEST, generate_latest
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUEST_LATENCY = Histogram(
+    "superadmin_http_request_duration_seconds",
+    "API request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+
+UPSTREAM_LATENCY = Histogram(
+    "superadmin_upstream_request_duration_seconds",
+    "Platform API call latency",
+    ["platform", "method", "endpoint", "status"],
+    buckets=LATENCY_BUCKETS
+)
+
+CACHE_LOOKUPS = Counter(
+    "superadmin_cache_lookups_total",
+    "Platform response cache lookups",
+    ["namespace", "result"]
+)
+
+REDIS_ERRORS = Counter(
+    "superadmin_redis_errors_total",
+    "Redis operations that failed and were swallowed",
+    ["operation"]
+)
+
+SUPABASE_LATENCY = Histogram(
+    "superadmin_supabase_query_duration_seconds",
+    "Supabase query latency by table",
+    ["table", "operation"],
+    buckets=LATENCY_BUCKETS
+)
+
+SYNC_ROWS = Counter(
+    "superadmin_sync_rows_total",
+    "Rows processed by platform sync",
+    ["platform", "entity"]
+)
+
+SYNC_WRITES = Counter(
+    "superadmin_sync_writes_total",
+    "Synced rows written, skipped because their content hash was unchanged, or marked removed upstream",
+    ["platform", "entity", "result"]
+)
+
+SYNC_THROUGHPUT = Gauge(
+    "superadmin_sync_rows_per_second",
+    "Throughput of the last sync batch",
+    ["platform", "entity"]
+)
+
+EVENT_SESSIONS = Gauge(
+    "superadmin_event_sessions",
+    "Admin sessions connected to the server-sent event stream"
+)
+
+EVENTS_DROPPED = Counter(
+    "superadmin_events_dropped_total",
+    "Queued events discarded for sessions reading too slowly (replaced by a resync marker)"
+)
+
+# Path segments that identify a record rather than a route
+_ID_SEGMENT = re.compile(r"/(?:[0-9a-fA-F-]{32,36}|\d+)(?=/|$)")
+
+def endpoint_label(endpoint: str) -> str:
+    """Collapse record ids and query strings so labels stay low-cardinality"""
+    return _ID_SEGMENT.sub("/:id", endpoint.split("?", 1)[0])
+
+def cache_namespace(cache_key: str) -> str:
+    """Namespace of a cache key, e.g. host:properties:page:1 -> host:properties"""
+    return ":".join(cache_key.split(":", 2)[:2])
+
+def record_sync(platform: str, entity: str, rows: int, seconds: float):
+    """Record one sync batch"""
+    SYNC_ROWS.labels(platform, entity).inc(rows)
+    if seconds > 0:
+        SYNC_THROUGHPUT.labels(platform, entity).set(rows / seconds)
+
+def record_sync_writes(platform: str, entity: str, written: int, skipped: int):
+    """Record how many synced rows were written vs skipped as unchanged"""
+    SYNC_WRITES.labels(platform, entity, "written").inc(written)
+    SYNC_WRITES.labels(platform, entity, "skipped").inc(skipped)
+
+def record_sync_removed(platform: str, entity: str, removed: int):
+    """Record rows marked removed because they disappeared upstream"""
+    SYNC_WRITES.labels(platform, entity, "removed").inc(removed)
+
+def render_metrics() -> tuple:
+    """Exposition body and content type for /metrics"""
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by matched route"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        started = time.perf_counter()
+        status_code = 500
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"],
+                route.path if route else "unmatched",
+                str(status_code)
+            ).observe(time.perf_counter() - started)
@@ -1,8 +1,12 @@
 import redis.asyncio as redis
-from typing import Optional, Any
+from typing import Optional, Any, List
 import json
 from app.config import settings
-from app.utils.logger import logger
+from app.core.metrics import REDIS_ERRORS
+from app.core.tracing import traced
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class RedisClient:
     def __init__(self):
@@ -19,7 +23,7 @@ class RedisClient:
             await self.redis.ping()
             logger.info("Redis connected successfully")
         except Exception as e:
-            logger.error(f"Redis connection failed: {e}")
+            logger.error("Redis connection failed: %s", e)
             raise
     
     async def disconnect(self):
@@ -27,6 +31,7 @@ class RedisClient:
         if self.redis:
             await self.redis.close()
     
+    @traced("redis.get", key_attribute="redis.key")
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
         if not self.redis:
@@ -38,9 +43,11 @@ class RedisClient:
                 return json.loads(value)
             return None
         except Exception as e:
-            logger.error(f"Redis GET error for key {key}: {e}")
+            logger.error("Redis GET error for key %s: %s", key, e)
+            REDIS_ERRORS.labels("get").inc()
             return None
     
+    @traced("redis.set", key_attribute="redis.key")
     async def set(self, key: str, value: Any, ex: int = 300):
         """Set value in cache with expiry (default 5 min)"""
         if not self.redis:
@@ -54,9 +61,24 @@ class RedisClient:
             )
             return True
         except Exception as e:
-            logger.error(f"Redis SET error for key {key}: {e}")
+            logger.error("Redis SET error for key %s: %s", key, e)
+            REDIS_ERRORS.labels("set").inc()
             return False
     
+    @traced("redis.incrby", key_attribute="redis.key")
+    async def incr(self, key: str, amount: int = 1) -> Optional[int]:
+        """Add amount to an integer key (created at 0); None when Redis is unavailable"""
+        if not self.redis:
+            return None
+        
+        try:
+            return await self.redis.incr(key, amount)
+        except Exception as e:
+            logger.error("Redis INCRBY error for key %s: %s", key, e)
+            REDIS_ERRORS.labels("incrby").inc()
+            return None
+    
+    @traced("redis.delete", key_attribute="redis.key")
     async def delete(self, key: str):
         """Delete key from cache"""
         if not self.redis:
@@ -66,9 +88,11 @@ class RedisClient:
             await self.redis.delete(key)
             return True
         except Exception as e:
-            logger.error(f"Redis DELETE error for key {key}: {e}")
+            logger.error("Redis DELETE error for key %s: %s", key, e)
+            REDIS_ERRORS.labels("delete").inc()
             return False
     
+    @traced("redis.delete_pattern", key_attribute="redis.key")
     async def delete_pattern(self, pattern: str):
         """Delete all keys matching pattern"""
         if not self.redis:
@@ -80,8 +104,88 @@ class RedisClient:
                 await self.redis.delete(*keys)
             return True
         except Exception as e:
-            logger.error(f"Redis DELETE_PATTERN error for pattern {pattern}: {e}")
+            logger.error("Redis DELETE_PATTERN error for pattern %s: %s", pattern, e)
+            REDIS_ERRORS.labels("delete_pattern").inc()
+            return False
+    
+    @traced("redis.rpush", key_attribute="redis.key")
+    async def push_many(self, key: str, values: List[Any]):
+        """Append values to the tail of a list"""
+        if not self.redis or not values:
+            return False
+        
+        try:
+            await self.redis.rpush(key, *[json.dumps(value) for value in values])
+            return True
+        except Exception as e:
+            logger.error("Redis RPUSH error for key %s: %s", key, e)
+            REDIS_ERRORS.labels("rpush").inc()
+            return False
+    
+    @traced("redis.lpop", key_attribute="redis.key")
+    async def pop_many(self, key: str, count: int) -> List[Any]:
+        """Pop up to count values from the head of a list"""
+        if not self.redis:
+            return []
+        
+        try:
+            values = await self.redis.lpop(key, count)
+            return [json.loads(value) for value in values or []]
+        except Exception as e:
+            logger.error("Redis LPOP error for key %s: %s", key, e)
+            REDIS_ERRORS.labels("lpop").inc()
+            return []
+    
+    @traced("redis.lpush", key_attribute="redis.key")
+    async def push_capped(self, key: str, value: Any, maxlen: int):
+        """Prepend value to a list trimmed to maxlen entries (ring buffer)"""
+        if not self.redis:
+            return False
+        
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.lpush(key, json.dumps(value))
+                pipe.ltrim(key, 0, maxlen - 1)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error("Redis LPUSH error for key %s: %s", key, e)
+            REDIS_ERRORS.labels("lpush").inc()
+            return False
+    
+    @traced("redis.lrange", key_attribute="redis.key")
+    async def list_range(self, key: str, count: int) -> List[Any]:
+        """Get the first count values of a list"""
+        if not self.redis:
+            return []
+        
+        try:
+            values = await self.redis.lrange(key, 0, count - 1)
+            return [json.loads(value) for value in values]
+        except Exception as e:
+            logger.error("Redis LRANGE error for key %s: %s", key, e)
+            REDIS_ERRORS.labels("lrange").inc()
+            return []
+    
+    @traced("redis.publish", key_attribute="redis.key")
+    async def publish(self, channel: str, value: Any):
+        """Publish a message to every subscriber of channel"""
+        if not self.redis:
+            return False
+        
+        try:
+            await self.redis.publish(channel, json.dumps(value, default=str))
+            return True
+        except Exception as e:
+            logger.error("Redis PUBLISH error for channel %s: %s", channel, e)
+            REDIS_ERRORS.labels("publish").inc()
+            return False
+    
+    async def ping(self) -> bool:
+        """Check the Redis connection"""
+        if not self.redis:
             return False
+        return await self.redis.ping()
 
 redis_client = RedisClient()
 
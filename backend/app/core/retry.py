@@ -0,0 +1,110 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+import httpx
+from app.config import settings
+
+RETRYABLE_STATUS = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by a total time budget"""
+    
+    def __init__(
+        self,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        budget: float
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+    
+    def is_retryable(self, method: str, error: Exception, retry: Optional[bool] = None) -> bool:
+        """Decide whether a failed attempt may be repeated"""
+        # A refused connection never reached the platform, so any method is safe
+        if isinstance(error, httpx.ConnectError):
+            return retry is not False
+        
+        allowed = retry if retry is not None else method.upper() in IDEMPOTENT_METHODS
+        if not allowed:
+            return False
+        
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in RETRYABLE_STATUS
+        return isinstance(error, httpx.TransportError)
+    
+    def delay(self, attempt: int, error: Exception) -> float:
+        """Seconds to wait before the next attempt (attempt starts at 1)"""
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = parse_retry_after(error.response.headers.get("retry-after"))
+            if retry_after is not None:
+                return retry_after
+        
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date"""
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+class RateLimiter:
+    """Token bucket limiting requests per second to one platform"""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+    
+    def penalize(self, seconds: float):
+        """Drain the bucket after the platform asked us to back off"""
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+retry_policy = RetryPolicy(
+    max_attempts=settings.PLATFORM_RETRY_ATTEMPTS,
+    base_delay=settings.PLATFORM_RETRY_BASE_DELAY,
+    max_delay=settings.PLATFORM_RETRY_MAX_DELAY,
+    budget=settings.PLATFORM_RETRY_BUDGET
+)
+
+_limiters: Dict[str, RateLimiter] = {}
+
+def get_rate_limiter(name: str) -> RateLimiter:
+    """Get the shared rate limiter for a platform"""
+    if name not in _limiters:
+        _limiters[name] = RateLimiter(settings.PLATFORM_RATE_LIMIT, settings.PLATFORM_RATE_BURST)
+    return _limiters[name]
@@ -1,18 +1,78 @@
+import time
 from supabase import create_client, Client
 from app.config import settings
+from app.core.metrics import SUPABASE_LATENCY
+from app.core.tracing import start_span, SpanKind
+
+WRITE_OPERATIONS = {"insert", "update", "upsert", "delete"}
+
+class InstrumentedQuery:
+    """Proxy over a PostgREST query builder that times execute()"""
+    
+    __slots__ = ("_builder", "_table", "_operation")
+    
+    def __init__(self, builder, table: str, operation: str = "select"):
+        self._builder = builder
+        self._table = table
+        self._operation = operation
+    
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        operation = name if name in WRITE_OPERATIONS else self._operation
+        
+        if not callable(attr):
+            # e.g. the `not_` modifier property
+            return InstrumentedQuery(attr, self._table, operation) if hasattr(attr, "execute") else attr
+        
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, "execute"):
+                return InstrumentedQuery(result, self._table, operation)
+            return result
+        
+        return call
+    
+    def execute(self):
+        started = time.perf_counter()
+        try:
+            with start_span(
+                f"supabase.{self._operation} {self._table}",
+                {"db.system": "postgresql", "db.sql.table": self._table, "db.operation": self._operation},
+                SpanKind.CLIENT
+            ):
+                return self._builder.execute()
+        finally:
+            SUPABASE_LATENCY.labels(self._table, self._operation).observe(time.perf_counter() - started)
+
+class InstrumentedClient:
+    """Supabase client whose table and rpc queries are instrumented"""
+    
+    def __init__(self, client: Client, prefix: str = ""):
+        self._client = client
+        self._prefix = prefix
+    
+    def table(self, name: str) -> InstrumentedQuery:
+        return InstrumentedQuery(self._client.table(name), f"{self._prefix}{name}")
+    
+    from_ = table
+    
+    def rpc(self, fn: str, params: dict = None, **kwargs) -> InstrumentedQuery:
+        return InstrumentedQuery(self._client.rpc(fn, params or {}, **kwargs), f"{self._prefix}rpc:{fn}", "rpc")
+    
+    def __getattr__(self, name):
+        return getattr(self._client, name)
 
 class SupabaseClient:
     def __init__(self):
-        self.client: Client = create_client(
+        self.client = InstrumentedClient(create_client(
             settings.SUPABASE_URL,
             settings.SUPABASE_SERVICE_KEY
-        )
+        ))
     
-    def get_client(self) -> Client:
+    def get_client(self) -> InstrumentedClient:
         return self.client
 
 supabase_admin = SupabaseClient()
 
-def get_supabase() -> Client:
+def get_supabase() -> InstrumentedClient:
     return supabase_admin.get_client()
-
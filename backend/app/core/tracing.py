@@ -0,0 +1,128 @@
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Sequence
+from opentelemetry import trace, propagate
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider, ReadableSpan
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from app.config import settings
+
+tracer = trace.get_tracer("krib_superadmin")
+
+_provider: Optional[TracerProvider] = None
+
+class FileSpanExporter(SpanExporter):
+    """Append finished spans to a file as JSON lines"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+    
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = [span.to_json(indent=None) for span in spans]
+        with self._lock, open(self.path, "a") as f:
+            f.write("\n".join(lines) + "\n")
+        return SpanExportResult.SUCCESS
+    
+    def shutdown(self):
+        pass
+
+def _build_exporter(name: str) -> Optional[SpanExporter]:
+    if name == "console":
+        return ConsoleSpanExporter()
+    if name == "file":
+        return FileSpanExporter(settings.TRACING_FILE_PATH)
+    if name == "otlp":
+        # Endpoint and headers come from the standard OTEL_EXPORTER_OTLP_* env vars
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+    return None
+
+def setup_tracing(exporter: Optional[SpanExporter] = None):
+    """Install the tracer provider; pass an exporter to capture spans in tests"""
+    global _provider
+    
+    exporter = exporter or _build_exporter(settings.TRACING_EXPORTER)
+    if exporter is None or _provider is not None:
+        return
+    
+    _provider = TracerProvider(
+        resource=Resource.create({
+            "service.name": "krib-superadmin-backend",
+            "service.version": settings.VERSION,
+            "deployment.environment": settings.ENVIRONMENT
+        }),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO))
+    )
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(_provider)
+
+def shutdown_tracing():
+    """Flush pending spans"""
+    if _provider is not None:
+        _provider.shutdown()
+
+@contextmanager
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None, kind: SpanKind = SpanKind.INTERNAL):
+    """Start a span as the current span, recording exceptions"""
+    with tracer.start_as_current_span(name, kind=kind, attributes=attributes) as span:
+        yield span
+
+def traced(name: str, key_attribute: Optional[str] = None):
+    """Wrap an async method in a span; key_attribute records its first argument"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            attributes = {key_attribute: str(args[0])} if key_attribute and args else None
+            with start_span(name, attributes, SpanKind.CLIENT):
+                return await func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+def inject_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """Add W3C trace context headers for an outgoing request"""
+    propagate.inject(headers)
+    return headers
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span per HTTP request"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        context = propagate.extract(carrier)
+        
+        with tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            context=context,
+            kind=SpanKind.SERVER,
+            attributes={"http.method": scope["method"], "http.target": scope["path"]}
+        ) as span:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+            
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route:
+                    span.update_name(f"{scope['method']} {route.path}")
+                    span.set_attribute("http.route", route.path)
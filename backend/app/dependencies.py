@@ -1,11 +1,15 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.core.security import decode_access_token
 from app.core.supabase import get_supabase
-from app.utils.logger import logger
+from app.core.tracing import start_span
+from app.core.http_cache import data_versions, validators, not_modified
 
 security = HTTPBearer()
 
+# Scope claim of the short-lived tokens that may only open the admin event stream
+EVENTS_SCOPE = "events"
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> dict:
@@ -20,6 +24,13 @@ async def get_current_user(
             detail="Invalid authentication credentials"
         )
     
+    # Stream tokens travel in URLs, so they must not unlock the rest of the API
+    if payload.get("scope"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials"
+        )
+    
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(
@@ -36,11 +47,12 @@ async def get_current_admin(
     supabase = get_supabase()
     
     # Get admin details
-    response = supabase.table("super_admin_users").select("*").eq(
-        "id", current_user["id"]
-    ).eq(
-        "is_active", True
-    ).execute()
+    with start_span("auth.get_current_admin", {"admin.id": current_user["id"]}):
+        response = supabase.table("super_admin_users").select("*").eq(
+            "id", current_user["id"]
+        ).eq(
+            "is_active", True
+        ).execute()
     
     if not response.data:
         raise HTTPException(
@@ -56,6 +68,18 @@ async def get_current_admin(
         "permissions": admin.get("permissions", {})
     }
 
+async def get_stream_admin(token: str = Query(...)) -> dict:
+    """Verify a stream token from the query string; EventSource cannot send an Authorization header"""
+    payload = decode_access_token(token)
+    if not payload or payload.get("scope") != EVENTS_SCOPE or not payload.get("sub"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid stream token"
+        )
+    
+    # Still checked per connection, so a deactivated admin cannot reconnect with a fresh token
+    return await get_current_admin({"id": payload["sub"], "email": payload.get("email")})
+
 async def require_permission(permission: str):
     """Dependency to require specific permission"""
     async def permission_checker(admin: dict = Depends(get_current_admin)):
@@ -75,3 +99,26 @@ async def require_permission(permission: str):
     
     return permission_checker
 
+def conditional(*datasets: str):
+    """Dependency answering repeat GETs with 304 until one of the datasets is written to"""
+    async def check(
+        request: Request,
+        response: Response,
+        admin: dict = Depends(get_current_admin)
+    ):
+        # Read before the query runs: a write landing in between only costs the next poll a full response
+        versions = await data_versions(datasets)
+        if versions is None:
+            return
+        
+        etag, last_modified = validators(request, versions)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": last_modified,
+            "Cache-Control": "private, no-cache"
+        }
+        if not_modified(request, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+    
+    return check
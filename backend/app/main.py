@@ -1,10 +1,23 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.config import settings
 from app.api.v1 import api_router
 from app.core.redis import redis_client
-from app.utils.logger import logger
+from app.core.circuit_breaker import breaker_states
+from app.core.compression import CompressionMiddleware
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.tracing import TracingMiddleware, setup_tracing, shutdown_tracing
+from app.services.audit_logger import audit_logger
+from app.services.notification_engine import notification_engine
+from app.services.health_monitor import health_monitor
+from app.services.host_supabase import host_supabase
+from app.services.stripe_event_consumer import stripe_event_consumer
+from app.services.event_bus import event_bus
+from app.utils.logger import get_logger, RequestIdMiddleware, shutdown_logger
+
+logger = get_logger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -15,18 +28,36 @@ async def lifespan(app: FastAPI):
         await redis_client.connect()
         logger.info("Redis connected")
     except Exception as e:
-        logger.error(f"Redis connection failed: {e}")
+        logger.error("Redis connection failed: %s", e)
+    
+    host_supabase.connect()
+    await audit_logger.start()
+    await notification_engine.start()
+    await health_monitor.start()
+    await stripe_event_consumer.start()
+    await event_bus.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down...")
+    await event_bus.stop()
+    await stripe_event_consumer.stop()
+    await health_monitor.stop()
+    await notification_engine.stop()
+    await audit_logger.stop()
+    host_supabase.close()
     await redis_client.disconnect()
+    shutdown_tracing()
+    shutdown_logger()
+
+setup_tracing()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS
@@ -38,18 +69,54 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Brotli or gzip for JSON and text bodies above the threshold
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
+)
+
+# Request correlation, latency metrics and tracing
+app.add_middleware(RequestIdMiddleware)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 @app.get("/api/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint, served from the last background probe"""
     return {
-        "status": "healthy",
+        "status": "healthy" if health_monitor.is_ready() else "degraded",
         "version": settings.VERSION,
-        "environment": settings.ENVIRONMENT
+        "environment": settings.ENVIRONMENT,
+        "dependencies": health_monitor.results,
+        "circuits": breaker_states()
     }
 
+@app.get("/api/health/live")
+async def liveness_check():
+    """Liveness probe: the process is serving requests"""
+    return {"status": "alive"}
+
+@app.get("/api/health/ready")
+async def readiness_check():
+    """Readiness probe: Redis and Supabase are reachable"""
+    if not health_monitor.is_ready():
+        return JSONResponse(
+            status_code=503,
+            content={"status": "not_ready", "dependencies": health_monitor.results}
+        )
+    return {"status": "ready"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 @app.get("/")
 async def root():
     """Root endpoint"""
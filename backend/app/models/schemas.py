@@ -167,6 +167,41 @@ class AdminActionLog(BaseModel):
     action_details: Dict[str, Any]
     created_at: datetime
 
+# Bulk Action Schemas
+BULK_MAX_ITEMS = 1000
+
+class BulkUserStatusRequest(UpdateUserStatusRequest):
+    user_ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BulkPropertyStatusRequest(BaseModel):
+    property_ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+    status: str
+
+class BulkApproveVerificationRequest(ApproveVerificationRequest):
+    verification_ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BulkRejectVerificationRequest(RejectVerificationRequest):
+    verification_ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BulkItemResult(BaseModel):
+    id: str
+    success: bool
+    error: Optional[str] = None
+
+class BulkActionResponse(BaseModel):
+    success: bool = True
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+# Notification Schemas
+class MarkNotificationsReadRequest(BaseModel):
+    notification_ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class UnreadCountResponse(BaseModel):
+    success: bool = True
+    unread: int
+
 # Response Wrappers
 class SuccessResponse(BaseModel):
     success: bool = True
@@ -185,3 +220,99 @@ class PaginatedResponse(BaseModel):
     total: int
     total_pages: int
 
+class CursorPaginatedResponse(BaseModel):
+    success: bool = True
+    data: List[Any]
+    limit: int
+    next_cursor: Optional[str] = None
+
+# List Row Schemas: the *_LIST_COLUMNS projections as the database returns them
+class UserListItem(BaseModel):
+    id: str
+    person_id: Optional[str] = None
+    email: str
+    platform_id: Optional[str] = None
+    platform_user_id: Optional[str] = None
+    user_type: Optional[str] = None
+    full_name: Optional[str] = None
+    phone: Optional[str] = None
+    verification_status: Optional[str] = None
+    account_status: Optional[str] = None
+    last_synced_at: Optional[datetime] = None
+    removed_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class PropertyListItem(BaseModel):
+    id: str
+    platform_id: Optional[str] = None
+    platform_property_id: Optional[str] = None
+    owner_user_id: Optional[str] = None
+    title: Optional[str] = None
+    property_type: Optional[str] = None
+    listing_type: Optional[str] = None
+    city: Optional[str] = None
+    price: Optional[float] = None
+    price_currency: Optional[str] = None
+    status: Optional[str] = None
+    is_featured: Optional[bool] = None
+    last_synced_at: Optional[datetime] = None
+    removed_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+class BookingListItem(BaseModel):
+    id: str
+    platform_id: Optional[str] = None
+    platform_booking_id: Optional[str] = None
+    property_id: Optional[str] = None
+    guest_user_id: Optional[str] = None
+    host_user_id: Optional[str] = None
+    check_in: Optional[date] = None
+    check_out: Optional[date] = None
+    total_price: Optional[float] = None
+    status: Optional[str] = None
+    payment_status: Optional[str] = None
+    last_synced_at: Optional[datetime] = None
+    removed_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+class TransactionListItem(BaseModel):
+    id: str
+    platform_id: Optional[str] = None
+    booking_id: Optional[str] = None
+    source_id: Optional[str] = None
+    transaction_type: Optional[str] = None
+    amount_total: Optional[float] = None
+    amount_platform_fee: Optional[float] = None
+    amount_host_payout: Optional[float] = None
+    currency: Optional[str] = None
+    payment_provider: Optional[str] = None
+    payment_provider_id: Optional[str] = None
+    status: Optional[str] = None
+    processed_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+class NotificationListItem(BaseModel):
+    id: str
+    type: str
+    title: str
+    message: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+    is_read: bool = False
+    priority: str = "normal"
+    created_at: Optional[datetime] = None
+
+class UserPage(PaginatedResponse):
+    data: List[UserListItem]
+
+class PropertyPage(CursorPaginatedResponse):
+    data: List[PropertyListItem]
+
+class BookingPage(CursorPaginatedResponse):
+    data: List[BookingListItem]
+
+class TransactionPage(CursorPaginatedResponse):
+    data: List[TransactionListItem]
+
+class NotificationPage(CursorPaginatedResponse):
+    data: List[NotificationListItem]
@@ -1,6 +1,5 @@
 from typing import List, Dict, Any, Optional
 from app.services.platform_client import PlatformClient
-from app.utils.logger import logger
 
 class AgentPlatformClient(PlatformClient):
     """Client for Real Estate Agent Dashboard API"""
@@ -8,12 +7,13 @@ class AgentPlatformClient(PlatformClient):
     def __init__(self, base_url: str, api_key: str):
         super().__init__("agent_dashboard", base_url, api_key)
     
-    async def get_pending_verifications(self) -> Dict[str, Any]:
+    async def get_pending_verifications(self, fresh: bool = False) -> Dict[str, Any]:
         """Get all users pending verification"""
         return await self.get(
             "/api/admin/verification/pending",
             cache_key="agent:verification:pending",
-            cache_ttl=60
+            cache_ttl=60,
+            fresh=fresh
         )
     
     async def get_user_verification_details(self, user_id: str) -> Dict[str, Any]:
@@ -102,22 +102,25 @@ class AgentPlatformClient(PlatformClient):
     async def get_all_properties(
         self, 
         page: int = 1, 
-        limit: int = 100
+        limit: int = 100,
+        fresh: bool = False
     ) -> Dict[str, Any]:
         """Get all agent properties"""
         return await self.get(
             "/api/properties",
             params={"page": page, "limit": limit},
             cache_key=f"agent:properties:page:{page}",
-            cache_ttl=300
+            cache_ttl=300,
+            fresh=fresh
         )
     
-    async def get_all_agents(self) -> Dict[str, Any]:
+    async def get_all_agents(self, fresh: bool = False) -> Dict[str, Any]:
         """Get all registered agents"""
         return await self.get(
             "/api/admin/agents",
             cache_key="agent:agents:all",
-            cache_ttl=300
+            cache_ttl=300,
+            fresh=fresh
         )
 
 # Import redis_client at the end to avoid circular import
@@ -0,0 +1,125 @@
+from typing import List, Dict, Iterable, Optional, Tuple
+from datetime import date, timedelta
+from app.core.supabase import get_supabase
+from app.services.ledger_service import ledger_service
+from app.utils.logger import get_logger
+from app.config import settings
+
+logger = get_logger(__name__)
+
+# Keeps in.(...) filters well under URL length limits
+LOOKUP_CHUNK_SIZE = 200
+
+# Earliest day touched since the last analytics rollup refresh (sync_watermarks)
+DIRTY_SOURCE = "analytics:dirty"
+
+def _date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+class AnalyticsService:
+    """Keeps the cross-platform analytics rollups current and reads time series from them"""
+    
+    def __init__(self):
+        self.supabase = get_supabase()
+    
+    def mark_bookings(self, platform_id: str, rows: List[Dict]):
+        """Schedule the stays of bookings about to be written, before and after the write"""
+        days = [row.get("check_in") for row in rows]
+        keys = [row["platform_booking_id"] for row in rows]
+        for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+            # A moved stay also changes the days it used to cover
+            response = self.supabase.table("unified_bookings").select("check_in").eq(
+                "platform_id", platform_id
+            ).in_("platform_booking_id", keys[start:start + LOOKUP_CHUNK_SIZE]).execute()
+            days.extend(item["check_in"] for item in response.data)
+        self.mark_dirty(days)
+    
+    def mark_created(self, platform_id: str, table: str, key: str, rows: List[Dict], columns: Tuple[str, ...] = ()):
+        """Schedule the platform creation days of users or listings about to be written"""
+        # Only rows that are new, back from removal, or moved to another day or group change the counts
+        stored: Dict[str, Dict] = {}
+        keys = [row[key] for row in rows]
+        for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+            response = self.supabase.table(table).select(
+                ", ".join([key, "platform_created_at", "created_at", "removed_at", *columns])
+            ).eq("platform_id", platform_id).in_(key, keys[start:start + LOOKUP_CHUNK_SIZE]).execute()
+            stored.update({item[key]: item for item in response.data})
+        
+        days = []
+        for row in rows:
+            before = stored.get(row[key])
+            if before is None:
+                # A row new to sync counts from its platform date; without one it lands on today
+                days.append(row.get("platform_created_at"))
+            elif (
+                before.get("removed_at")
+                or _date(before.get("platform_created_at")) != _date(row.get("platform_created_at"))
+                or any(before.get(column) != row.get(column) for column in columns)
+            ):
+                # Rows synced without a platform date count from their first sync
+                days.extend([
+                    row.get("platform_created_at"),
+                    before.get("platform_created_at") or before.get("created_at"),
+                    before.get("removed_at")
+                ])
+        self.mark_dirty(days)
+    
+    def mark_dirty(self, values: Iterable[Optional[str]]):
+        """Schedule the days from these dates on for the next rollup refresh"""
+        days = [day for day in (_date(value) for value in values) if day]
+        if days:
+            ledger_service.extend_dirty(DIRTY_SOURCE, days)
+    
+    def refresh_rollups(self, full: bool = False) -> int:
+        """Recompute daily rollups from the earliest dirty day through ANALYTICS_FORWARD_DAYS ahead"""
+        # Removals land on today and the forward window moves with the date, so today is refreshed
+        # even when nothing was marked; full starts from the earliest booking, signup or listing instead
+        # for one-off backfills
+        today = date.today()
+        dirty_since, token = ledger_service.get_dirty(DIRTY_SOURCE)
+        since = min(dirty_since, today) if dirty_since else today
+        until = today + timedelta(days=settings.ANALYTICS_FORWARD_DAYS)
+        response = self.supabase.rpc("refresh_analytics_rollups", {
+            "since": None if full else since.isoformat(),
+            "until": until.isoformat()
+        }).execute()
+        if dirty_since:
+            ledger_service.clear_dirty(DIRTY_SOURCE, token)
+        logger.info(
+            "Refreshed analytics rollups from %s to %s", "the earliest day" if full else since, until,
+            extra={"rows": response.data or 0}
+        )
+        return response.data or 0
+    
+    def timeseries(
+        self,
+        period: str,
+        date_from: date,
+        date_to: date,
+        group_by: Optional[str] = None,
+        platform: Optional[str] = None,
+        city: Optional[str] = None
+    ) -> List[Dict]:
+        """Bookings, GMV, occupancy and new users per period bucket; raises ValueError on a bad range"""
+        if date_from > date_to:
+            raise ValueError("date_from must not be after date_to")
+        if (date_to - date_from).days + 1 > settings.ANALYTICS_MAX_DAYS:
+            raise ValueError(f"Date range exceeds {settings.ANALYTICS_MAX_DAYS} days")
+        
+        response = self.supabase.rpc("analytics_timeseries", {
+            "period": period,
+            "date_from": date_from.isoformat(),
+            "date_to": date_to.isoformat(),
+            "by_platform": group_by in ("platform", "platform_city"),
+            "by_city": group_by in ("city", "platform_city"),
+            "platform": platform,
+            "city_filter": city
+        }).execute()
+        return response.data or []
+
+analytics_service = AnalyticsService()
@@ -0,0 +1,170 @@
+import asyncio
+import ipaddress
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+from fastapi import Request
+from app.core.supabase import get_supabase
+from app.core.redis import redis_client
+from app.config import settings
+from app.utils.logger import get_logger
+from app.utils.unified_ids import is_uuid
+
+logger = get_logger(__name__)
+
+# Redis list holding entries that could not be written to the database
+AUDIT_FALLBACK_KEY = "audit:pending"
+
+# Redis list holding entries the database rejected on their own; they are never replayed
+AUDIT_DEAD_LETTER_KEY = "audit:dead"
+
+class AuditLogger:
+    """Buffered, batched writer for admin_audit_log"""
+    
+    def __init__(self, batch_size: int, flush_interval: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer: List[Dict[str, Any]] = []
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Replay spilled entries and start the background flusher"""
+        await self._replay_fallback()
+        self._task = asyncio.create_task(self._run())
+        logger.info("Audit logger started")
+    
+    async def stop(self):
+        """Stop the background flusher and flush everything still buffered"""
+        if self._task:
+            # Signal instead of cancelling: on Python 3.11 wait_for() can swallow
+            # a cancellation that races with the wakeup event
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            self._stopping = False
+        
+        await self.flush()
+        logger.info("Audit logger stopped")
+    
+    def log(
+        self,
+        admin_user_id: str,
+        action_type: str,
+        target_entity_type: Optional[str] = None,
+        target_entity_id: Optional[str] = None,
+        action_details: Optional[Dict[str, Any]] = None,
+        target_platform: Optional[str] = None,
+        request: Optional[Request] = None
+    ):
+        """Queue an audit entry without touching the database"""
+        action_details = dict(action_details or {})
+        # The id columns are UUIDs; anything else (e.g. a platform's own id) is kept in the details
+        if target_entity_id is not None and not is_uuid(target_entity_id):
+            action_details.setdefault("target_id", str(target_entity_id))
+            target_entity_id = None
+        if target_platform is not None and not is_uuid(target_platform):
+            action_details.setdefault("platform", str(target_platform))
+            target_platform = None
+        
+        entry = {
+            "admin_user_id": admin_user_id,
+            "action_type": action_type,
+            "target_platform": str(target_platform) if target_platform else None,
+            "target_entity_type": target_entity_type,
+            "target_entity_id": str(target_entity_id) if target_entity_id else None,
+            "action_details": action_details,
+            "created_at": datetime.utcnow().isoformat()
+        }
+        
+        if request is not None:
+            entry["ip_address"] = _client_ip(request)
+            entry["user_agent"] = request.headers.get("user-agent")
+        
+        self.buffer.append(entry)
+        
+        if len(self.buffer) >= self.batch_size:
+            self._wakeup.set()
+    
+    async def flush(self):
+        """Write all buffered entries in multi-row inserts"""
+        async with self._flush_lock:
+            entries, self.buffer = self.buffer, []
+            
+            for start in range(0, len(entries), self.batch_size):
+                batch = entries[start:start + self.batch_size]
+                try:
+                    await asyncio.to_thread(_insert_entries, batch)
+                except Exception as e:
+                    logger.warning("Audit log batch of %d failed, retrying row by row: %s", len(batch), e)
+                    await self._insert_each(batch)
+    
+    async def _insert_each(self, batch: List[Dict[str, Any]]):
+        """Write a failed batch one entry at a time so a rejected entry cannot hold back the rest"""
+        unwritten: List[Dict[str, Any]] = []
+        for entry in batch:
+            try:
+                await asyncio.to_thread(_insert_entries, [entry])
+            except Exception as e:
+                if not _rejected(e):
+                    unwritten.append(entry)
+                    continue
+                logger.error("Audit entry rejected, moving it to %s: %s", AUDIT_DEAD_LETTER_KEY, e, extra={"entry": entry})
+                await redis_client.push_many(AUDIT_DEAD_LETTER_KEY, [entry])
+        
+        if unwritten:
+            logger.error("Audit log flush failed, spilling %d entries to Redis", len(unwritten))
+            if not await redis_client.push_many(AUDIT_FALLBACK_KEY, unwritten):
+                # Redis unavailable too: keep entries for the next attempt
+                self.buffer[:0] = unwritten
+    
+    async def _run(self):
+        """Flush on size or time thresholds, whichever comes first"""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            
+            if self._stopping:
+                break
+            self._wakeup.clear()
+            
+            try:
+                await self.flush()
+                await self._replay_fallback()
+            except Exception as e:
+                logger.error("Audit logger flush loop error: %s", e)
+    
+    async def _replay_fallback(self):
+        """Re-queue entries previously spilled to Redis"""
+        entries = await redis_client.pop_many(AUDIT_FALLBACK_KEY, self.batch_size)
+        if entries:
+            logger.info("Replaying %s spilled audit entries", len(entries))
+            self.buffer.extend(entries)
+
+def _insert_entries(entries: List[Dict[str, Any]]):
+    """Insert a batch of audit entries in one statement"""
+    get_supabase().table("admin_audit_log").insert(entries).execute()
+
+def _rejected(error: Exception) -> bool:
+    """Whether the database refused the entry itself (bad value, broken reference) rather than being unreachable"""
+    # SQLSTATE classes 22 (data exception) and 23 (integrity constraint violation)
+    return str(getattr(error, "code", None) or "")[:2] in ("22", "23")
+
+def _client_ip(request: Request) -> Optional[str]:
+    """Resolve the originating client IP behind the Render proxy; None unless it parses"""
+    # X-Forwarded-For is client supplied and lands in an INET column
+    forwarded = request.headers.get("x-forwarded-for")
+    candidate = forwarded.split(",")[0].strip() if forwarded else (request.client.host if request.client else None)
+    try:
+        return str(ipaddress.ip_address(candidate)) if candidate else None
+    except ValueError:
+        return None
+
+audit_logger = AuditLogger(
+    batch_size=settings.AUDIT_LOG_BATCH_SIZE,
+    flush_interval=settings.AUDIT_LOG_FLUSH_INTERVAL
+)
@@ -1,6 +1,5 @@
 from typing import List, Dict, Any, Optional
 from app.services.platform_client import PlatformClient
-from app.utils.logger import logger
 
 class CustomerPlatformClient(PlatformClient):
     """Client for Customer AI Platform API"""
@@ -8,12 +7,13 @@ class CustomerPlatformClient(PlatformClient):
     def __init__(self, base_url: str, api_key: str):
         super().__init__("customer_platform", base_url, api_key)
     
-    async def get_all_users(self) -> Dict[str, Any]:
+    async def get_all_users(self, fresh: bool = False) -> Dict[str, Any]:
         """Get all customer users"""
         return await self.get(
             "/api/users",
             cache_key="customer:users",
-            cache_ttl=300
+            cache_ttl=300,
+            fresh=fresh
         )
     
     async def get_user(self, user_id: str) -> Dict[str, Any]:
@@ -27,14 +27,16 @@ class CustomerPlatformClient(PlatformClient):
     async def get_all_bookings(
         self,
         page: int = 1,
-        limit: int = 100
+        limit: int = 100,
+        fresh: bool = False
     ) -> Dict[str, Any]:
         """Get all customer bookings"""
         return await self.get(
             "/api/bookings",
             params={"page": page, "limit": limit},
             cache_key=f"customer:bookings:page:{page}",
-            cache_ttl=60
+            cache_ttl=60,
+            fresh=fresh
         )
     
     async def get_ai_conversations(
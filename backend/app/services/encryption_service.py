@@ -1,13 +1,15 @@
 from cryptography.fernet import Fernet
 from app.config import settings
-from app.utils.logger import logger
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class EncryptionService:
     def __init__(self):
         try:
             self.cipher = Fernet(settings.ENCRYPTION_KEY.encode())
         except Exception as e:
-            logger.error(f"Failed to initialize encryption: {e}")
+            logger.error("Failed to initialize encryption: %s", e)
             raise
     
     def encrypt(self, data: str) -> str:
@@ -15,7 +17,7 @@ class EncryptionService:
         try:
             return self.cipher.encrypt(data.encode()).decode()
         except Exception as e:
-            logger.error(f"Encryption failed: {e}")
+            logger.error("Encryption failed: %s", e)
             raise
     
     def decrypt(self, encrypted_data: str) -> str:
@@ -23,7 +25,7 @@ class EncryptionService:
         try:
             return self.cipher.decrypt(encrypted_data.encode()).decode()
         except Exception as e:
-            logger.error(f"Decryption failed: {e}")
+            logger.error("Decryption failed: %s", e)
             raise
     
     def encrypt_api_key(self, api_key: str) -> str:
@@ -0,0 +1,91 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Optional, Set
+from app.core.redis import redis_client
+from app.core.metrics import EVENT_SESSIONS, EVENTS_DROPPED
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EVENTS_CHANNEL = "admin:events"
+
+# Sent instead of the events a session missed; the client refetches what it shows
+RESYNC = json.dumps({"type": "resync"})
+
+class EventBus:
+    """Broadcasts compact change events to connected admins across workers via Redis pub/sub"""
+    
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.sessions: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+    
+    async def publish(self, event_type: str, **data):
+        """Announce a change to every worker; never fails the action that caused it"""
+        await redis_client.publish(EVENTS_CHANNEL, {
+            "type": event_type,
+            "at": datetime.utcnow().isoformat(),
+            **data
+        })
+    
+    async def start(self):
+        """Hold one subscription per worker, shared by all of its sessions"""
+        if not redis_client.redis:
+            logger.warning("Redis not connected, admin event stream disabled")
+            return
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self):
+        while True:
+            pubsub = redis_client.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(EVENTS_CHANNEL)
+                async for message in pubsub.listen():
+                    self._dispatch(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Admin event subscription lost, resubscribing: %s", e)
+                # Whatever was published meanwhile is gone
+                self._dispatch(RESYNC)
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+    
+    def _dispatch(self, data: str):
+        """Queue an already-serialized event on every session without waiting on any of them"""
+        for queue in self.sessions:
+            try:
+                queue.put_nowait(data)
+            except asyncio.QueueFull:
+                # A slow reader gets one resync marker instead of an ever-growing backlog
+                EVENTS_DROPPED.inc(queue.qsize())
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+    
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue]:
+        """Bounded queue of serialized events for one session"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.sessions.add(queue)
+        EVENT_SESSIONS.inc()
+        try:
+            yield queue
+        finally:
+            self.sessions.discard(queue)
+            EVENT_SESSIONS.dec()
+
+event_bus = EventBus(queue_size=settings.EVENTS_QUEUE_SIZE)
@@ -0,0 +1,168 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from app.services.platform_client import PlatformClient
+from app.core.supabase import get_supabase
+from app.core.redis import redis_client
+from app.services.notification_engine import notification_engine
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Dependencies the API cannot serve requests without
+CORE_DEPENDENCIES = ("redis", "supabase")
+
+class HealthMonitor:
+    """Background prober for platforms, Redis and Supabase"""
+    
+    def __init__(self, interval: float, history_size: int):
+        self.interval = interval
+        self.history_size = history_size
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.platforms: Dict[str, Dict[str, Any]] = {}
+        self.clients: Dict[str, PlatformClient] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Start probing on a fixed interval"""
+        self._task = asyncio.create_task(self._run())
+        logger.info("Health monitor started")
+    
+    async def stop(self):
+        """Stop probing and close platform clients"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        for client in self.clients.values():
+            await client.close()
+        self.clients = {}
+    
+    async def check_all(self):
+        """Probe every dependency concurrently and record the results"""
+        results = await asyncio.gather(
+            self._check("supabase", self._probe_supabase),
+            self._check("redis", self._probe_redis)
+        )
+        
+        platform_results = await asyncio.gather(*[
+            self._check(name, self._platform_probe(platform))
+            for name, platform in self.platforms.items()
+        ])
+        
+        checked_at = datetime.utcnow().isoformat()
+        for result in [*results, *platform_results]:
+            result["last_checked"] = checked_at
+            if not result["is_healthy"] and self.results.get(result["name"], {}).get("is_healthy", True):
+                # Only on the transition; the cooldown window absorbs flapping
+                notification_engine.dependency_unhealthy(result, core=result["name"] in CORE_DEPENDENCIES)
+            self.results[result["name"]] = result
+            await redis_client.push_capped(
+                f"health:history:{result['name']}",
+                {
+                    "t": checked_at,
+                    "ok": result["is_healthy"],
+                    "ms": result["response_time_ms"]
+                },
+                self.history_size
+            )
+        
+        await self._mark_checked(checked_at)
+    
+    def is_ready(self) -> bool:
+        """Ready once Redis and Supabase answered the last probe"""
+        return all(
+            self.results.get(name, {}).get("is_healthy", False)
+            for name in CORE_DEPENDENCIES
+        )
+    
+    def platform_results(self) -> List[Dict[str, Any]]:
+        """Latest probe result per registered platform"""
+        return [self.results[name] for name in self.platforms if name in self.results]
+    
+    async def history(self, name: str, count: int = 60) -> List[Dict[str, Any]]:
+        """Most recent probe samples for a dependency"""
+        return await redis_client.list_range(f"health:history:{name}", count)
+    
+    async def _run(self):
+        while True:
+            try:
+                await self.check_all()
+            except Exception as e:
+                logger.error("Health check cycle failed: %s", e)
+            await asyncio.sleep(self.interval)
+    
+    async def _check(self, name: str, probe) -> Dict[str, Any]:
+        """Run one probe, timing it and capturing failures"""
+        platform = self.platforms.get(name, {})
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(probe(), timeout=settings.PLATFORM_TIMEOUT_MAX)
+            is_healthy, error = True, None
+        except Exception as e:
+            is_healthy, error = False, str(e) or e.__class__.__name__
+        
+        return {
+            "name": name,
+            "platform_id": platform.get("id"),
+            "status": platform.get("status"),
+            "is_healthy": is_healthy,
+            "response_time_ms": int((time.monotonic() - started) * 1000),
+            "error": error
+        }
+    
+    async def _probe_supabase(self):
+        """Load the platform registry, doubling as the Supabase probe"""
+        response = await asyncio.to_thread(
+            lambda: get_supabase().table("platforms").select(
+                "id, name, api_base_url, api_key, status, health_check_endpoint"
+            ).execute()
+        )
+        self.platforms = {platform["name"]: platform for platform in response.data}
+    
+    async def _probe_redis(self):
+        if not await redis_client.ping():
+            raise ConnectionError("Redis not connected")
+    
+    def _platform_probe(self, platform: Dict[str, Any]):
+        client = self._client_for(platform)
+        endpoint = platform.get("health_check_endpoint") or "/api/health"
+        return lambda: client.probe(endpoint)
+    
+    def _client_for(self, platform: Dict[str, Any]) -> PlatformClient:
+        """Reuse one client per platform, rebuilt if its config changes"""
+        client = self.clients.get(platform["name"])
+        if client and client.base_url == platform["api_base_url"].rstrip('/') and client.api_key == platform["api_key"]:
+            return client
+        
+        if client:
+            asyncio.create_task(client.close())
+        client = PlatformClient(platform["name"], platform["api_base_url"], platform["api_key"])
+        self.clients[platform["name"]] = client
+        return client
+    
+    async def _mark_checked(self, checked_at: str):
+        """Stamp platforms.last_health_check in a single statement"""
+        ids = [platform["id"] for platform in self.platforms.values()]
+        if not ids:
+            return
+        
+        try:
+            await asyncio.to_thread(
+                lambda: get_supabase().table("platforms").update({
+                    "last_health_check": checked_at
+                }).in_("id", ids).execute()
+            )
+        except Exception as e:
+            logger.error("Failed to update last_health_check: %s", e, extra={"platforms": len(ids)})
+
+health_monitor = HealthMonitor(
+    interval=settings.HEALTH_CHECK_INTERVAL,
+    history_size=settings.HEALTH_HISTORY_SIZE
+)
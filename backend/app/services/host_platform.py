@@ -1,6 +1,5 @@
 from typing import List, Dict, Any, Optional
 from app.services.platform_client import PlatformClient
-from app.utils.logger import logger
 
 class HostPlatformClient(PlatformClient):
     """Client for Host Dashboard API"""
@@ -12,7 +11,8 @@ class HostPlatformClient(PlatformClient):
         self, 
         page: int = 1, 
         limit: int = 100,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        fresh: bool = False
     ) -> Dict[str, Any]:
         """Get all properties from host dashboard"""
         params = {"page": page, "limit": limit}
@@ -23,7 +23,8 @@ class HostPlatformClient(PlatformClient):
             "/api/v1/properties",
             params=params,
             cache_key=f"host:properties:page:{page}:status:{status}",
-            cache_ttl=300
+            cache_ttl=300,
+            fresh=fresh
         )
     
     async def get_property(self, property_id: str) -> Dict[str, Any]:
@@ -38,7 +39,8 @@ class HostPlatformClient(PlatformClient):
         self,
         status: Optional[str] = None,
         page: int = 1,
-        limit: int = 100
+        limit: int = 100,
+        fresh: bool = False
     ) -> Dict[str, Any]:
         """Get all bookings"""
         params = {"page": page, "limit": limit}
@@ -49,7 +51,8 @@ class HostPlatformClient(PlatformClient):
             "/api/v1/bookings",
             params=params,
             cache_key=f"host:bookings:page:{page}:status:{status}",
-            cache_ttl=60
+            cache_ttl=60,
+            fresh=fresh
         )
     
     async def get_booking(self, booking_id: str) -> Dict[str, Any]:
@@ -74,24 +77,27 @@ class HostPlatformClient(PlatformClient):
     async def update_property_status(
         self, 
         property_id: str, 
-        status: str
+        status: str,
+        invalidate_lists: bool = True
     ) -> Dict[str, Any]:
-        """Update property status"""
+        """Update property status; bulk callers clear the listing cache once themselves"""
         # Invalidate cache
         await redis_client.delete(f"host:property:{property_id}")
-        await redis_client.delete_pattern("host:properties:*")
+        if invalidate_lists:
+            await redis_client.delete_pattern("host:properties:*")
         
         return await self.patch(
             f"/api/v1/properties/{property_id}",
             json={"status": status}
         )
     
-    async def get_host_users(self) -> Dict[str, Any]:
+    async def get_host_users(self, fresh: bool = False) -> Dict[str, Any]:
         """Get all host users"""
         return await self.get(
             "/api/v1/users",
             cache_key="host:users",
-            cache_ttl=300
+            cache_ttl=300,
+            fresh=fresh
         )
     
     async def get_analytics(self, host_id: Optional[str] = None) -> Dict[str, Any]:
@@ -1,68 +1,218 @@
 """Host Dashboard Supabase client for direct database access"""
-from supabase import create_client, Client
-from typing import Optional
+from supabase import create_client
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from app.config import settings
+from app.core.supabase import InstrumentedClient
+from app.core.redis import redis_client
+from app.core.metrics import CACHE_LOOKUPS, cache_namespace
+from app.utils.logger import get_logger
+from app.utils.pagination import apply_cursor, cursor_page
+
+logger = get_logger(__name__)
+
+# Columns returned by list views; detail lookups return the full row
+HOST_USER_COLUMNS = (
+    "id, name, email, phone, is_active, total_revenue, stripe_account_id, stripe_account_status, "
+    "stripe_charges_enabled, stripe_payouts_enabled, created_at"
+)
+PAYOUT_COLUMNS = (
+    "id, user_id, booking_id, property_id, amount, currency, platform_fee, original_booking_amount, "
+    "status, failure_code, initiated_at, expected_arrival_date, completed_at, created_at"
+)
+STRIPE_EVENT_COLUMNS = (
+    "id, stripe_event_id, event_type, account_id, payment_intent_id, charge_id, transfer_id, payout_id, "
+    "processed, processed_at, error_message, retry_count, created_at"
+)
+PROPERTY_ANALYTICS_COLUMNS = (
+    "id, property_id, date, views, bookings, revenue, occupancy_rate, avg_daily_rate, inquiries, "
+    "conversion_rate, created_at"
+)
+REVIEW_COLUMNS = (
+    "id, property_id, booking_id, guest_name, rating, comment, response_from_host, is_verified, "
+    "is_featured, created_at"
+)
+
+Page = Tuple[List[Dict[str, Any]], Optional[str]]
 
 class HostSupabaseClient:
     """Direct Supabase client for Host Dashboard database"""
     
     def __init__(self):
+        self.client: Optional[InstrumentedClient] = None
+    
+    def connect(self):
+        """Create the shared client; a no-op when credentials are not configured"""
         if not settings.HOST_DASHBOARD_SUPABASE_URL or not settings.HOST_DASHBOARD_SUPABASE_KEY:
-            raise ValueError("Host Dashboard Supabase credentials not configured")
+            logger.warning("Host Dashboard Supabase credentials not configured")
+            return
         
-        self.client: Client = create_client(
-            settings.HOST_DASHBOARD_SUPABASE_URL,
-            settings.HOST_DASHBOARD_SUPABASE_KEY
+        self.client = InstrumentedClient(
+            create_client(
+                settings.HOST_DASHBOARD_SUPABASE_URL,
+                settings.HOST_DASHBOARD_SUPABASE_KEY
+            ),
+            prefix="host."
         )
     
-    async def get_all_users(self):
-        """Get all host users"""
-        response = self.client.table("users").select("*").execute()
-        return response.data
+    def close(self):
+        """Close the pooled HTTP connections"""
+        if self.client:
+            self.client.postgrest.aclose()
+            self.client = None
+    
+    @property
+    def configured(self) -> bool:
+        return self.client is not None
+    
+    def _table(self, name: str):
+        if not self.client:
+            raise ValueError("Host Dashboard Supabase credentials not configured")
+        return self.client.table(name)
+    
+    async def _cached(self, key: str, load: Callable[[], Page]) -> Page:
+        """Serve a page from Redis, loading and storing it on a miss"""
+        cached = await redis_client.get(key)
+        if cached:
+            CACHE_LOOKUPS.labels(cache_namespace(key), "hit").inc()
+            return cached["data"], cached["next_cursor"]
+        CACHE_LOOKUPS.labels(cache_namespace(key), "miss").inc()
+        
+        data, next_cursor = load()
+        await redis_client.set(key, {"data": data, "next_cursor": next_cursor}, ex=settings.HOST_SUPABASE_CACHE_TTL)
+        return data, next_cursor
+    
+    def _page(self, query, cursor: Optional[str], limit: int) -> Page:
+        """Newest-first keyset page of limit rows and the cursor of the next one"""
+        response = apply_cursor(query, cursor).limit(limit + 1).execute()
+        return cursor_page(response.data, limit)
+    
+    async def list_users(
+        self,
+        is_active: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Page:
+        """Page of host users"""
+        def load() -> Page:
+            query = self._table("users").select(HOST_USER_COLUMNS)
+            if is_active is not None:
+                query = query.eq("is_active", is_active)
+            return self._page(query, cursor, limit)
+        
+        return await self._cached(f"hostdb:users:{is_active}:{cursor}:{limit}", load)
     
     async def get_user(self, user_id: str):
         """Get user by ID"""
-        response = self.client.table("users").select("*").eq("id", user_id).execute()
+        response = self._table("users").select("*").eq("id", user_id).execute()
         return response.data[0] if response.data else None
     
     async def update_user_status(self, user_id: str, is_active: bool):
         """Update user active status"""
-        response = self.client.table("users").update({
+        response = self._table("users").update({
             "is_active": is_active
         }).eq("id", user_id).execute()
+        await redis_client.delete_pattern("hostdb:users:*")
         return response.data
     
-    async def get_all_payouts(self, status: Optional[str] = None):
-        """Get all payouts"""
-        query = self.client.table("payouts").select("*")
-        if status:
-            query = query.eq("status", status)
-        response = query.execute()
-        return response.data
+    async def list_payouts(
+        self,
+        status: Optional[str] = None,
+        user_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Page:
+        """Page of payouts"""
+        def load() -> Page:
+            query = self._table("payouts").select(PAYOUT_COLUMNS)
+            if status:
+                query = query.eq("status", status)
+            if user_id:
+                query = query.eq("user_id", user_id)
+            return self._page(query, cursor, limit)
+        
+        return await self._cached(f"hostdb:payouts:{status}:{user_id}:{cursor}:{limit}", load)
     
     async def get_payout(self, payout_id: str):
         """Get payout by ID"""
-        response = self.client.table("payouts").select("*").eq("id", payout_id).execute()
+        response = self._table("payouts").select("*").eq("id", payout_id).execute()
         return response.data[0] if response.data else None
     
-    async def get_stripe_events(self, limit: int = 100):
-        """Get recent Stripe webhook events"""
-        response = self.client.table("stripe_events").select("*").order("created_at", desc=True).limit(limit).execute()
-        return response.data
+    async def list_payouts_updated_since(
+        self,
+        watermark: Optional[str],
+        last_id: Optional[str],
+        limit: int = 500
+    ) -> List[Dict[str, Any]]:
+        """Payouts changed after (watermark, last_id), oldest first, for incremental ingestion"""
+        query = self._table("payouts").select(
+            f"{PAYOUT_COLUMNS}, stripe_transfer_id, stripe_payout_id, updated_at"
+        )
+        if watermark:
+            query = query.or_(
+                f'updated_at.gt."{watermark}",and(updated_at.eq."{watermark}",id.gt.{last_id})'
+            )
+        return query.order("updated_at").order("id").limit(limit).execute().data
     
-    async def get_property_analytics(self, property_id: str = None):
-        """Get property analytics"""
-        query = self.client.table("property_analytics").select("*")
-        if property_id:
-            query = query.eq("property_id", property_id)
-        response = query.execute()
-        return response.data
+    async def list_stripe_events(
+        self,
+        event_type: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Page:
+        """Page of recent Stripe webhook events (not cached: the log is read for what just arrived)"""
+        query = self._table("stripe_events").select(STRIPE_EVENT_COLUMNS)
+        if event_type:
+            query = query.eq("event_type", event_type)
+        return self._page(query, cursor, limit)
     
-    async def get_reviews(self, property_id: str = None):
-        """Get reviews"""
-        query = self.client.table("reviews").select("*")
-        if property_id:
-            query = query.eq("property_id", property_id)
-        response = query.execute()
-        return response.data
+    async def list_stripe_events_since(
+        self,
+        event_types: List[str],
+        watermark: Optional[str],
+        last_id: Optional[str],
+        limit: int = 500
+    ) -> List[Dict[str, Any]]:
+        """Events of these types received after (watermark, last_id), oldest first, for tailing the log"""
+        # Only the amounts are read from the raw payload
+        query = self._table("stripe_events").select(
+            "id, stripe_event_id, event_type, payment_intent_id, charge_id, transfer_id, payout_id, created_at, "
+            "event_created, amount:raw_data->data->object->amount, "
+            "amount_refunded:raw_data->data->object->amount_refunded, currency:raw_data->data->object->currency"
+        ).in_("event_type", event_types)
+        if watermark:
+            query = query.or_(
+                f'created_at.gt."{watermark}",and(created_at.eq."{watermark}",id.gt.{last_id})'
+            )
+        return query.order("created_at").order("id").limit(limit).execute().data
+    
+    async def list_property_analytics(
+        self,
+        property_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Page:
+        """Page of daily property analytics"""
+        def load() -> Page:
+            query = self._table("property_analytics").select(PROPERTY_ANALYTICS_COLUMNS)
+            if property_id:
+                query = query.eq("property_id", property_id)
+            return self._page(query, cursor, limit)
+        
+        return await self._cached(f"hostdb:property_analytics:{property_id}:{cursor}:{limit}", load)
+    
+    async def list_reviews(
+        self,
+        property_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Page:
+        """Page of reviews"""
+        def load() -> Page:
+            query = self._table("reviews").select(REVIEW_COLUMNS)
+            if property_id:
+                query = query.eq("property_id", property_id)
+            return self._page(query, cursor, limit)
+        
+        return await self._cached(f"hostdb:reviews:{property_id}:{cursor}:{limit}", load)
 
+host_supabase = HostSupabaseClient()
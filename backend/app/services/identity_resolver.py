@@ -0,0 +1,132 @@
+import hashlib
+import re
+import uuid
+from typing import Dict, List, Optional, Set
+from app.core.supabase import get_supabase
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Keeps in.(...) filters well under URL length limits
+LOOKUP_CHUNK_SIZE = 200
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    email = (email or "").strip().lower()
+    return email if "@" in email else None
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Digits in international form without the leading + or 00"""
+    digits = re.sub(r"\D", "", phone or "")
+    if digits.startswith("00"):
+        digits = digits[2:]
+    elif digits.startswith("0"):
+        digits = settings.IDENTITY_DEFAULT_COUNTRY_CODE + digits[1:]
+    return digits if len(digits) >= 8 else None
+
+def normalize_name(name: Optional[str]) -> Optional[str]:
+    """Lowercased words of a name, so spacing and punctuation do not matter"""
+    words = re.findall(r"\w+", (name or "").lower())
+    return " ".join(words) if words else None
+
+def identity_keys(platform_id: str, user: Dict) -> Dict[str, str]:
+    """Blocking keys of a unified user row: key hash -> key type"""
+    keys = {_hash("account", f"{platform_id}:{user['platform_user_id']}"): "account"}
+    email = normalize_email(user.get("email"))
+    if email:
+        keys[_hash("email", email)] = "email"
+    # A phone is often shared (a family, an office line, an agency), and keys merge transitively,
+    # so it only identifies someone together with their name
+    phone = normalize_phone(user.get("phone"))
+    name = normalize_name(user.get("full_name"))
+    if phone and name:
+        keys[_hash("phone", f"{phone}:{name}")] = "phone"
+    return keys
+
+def _hash(kind: str, value: str) -> str:
+    return hashlib.sha256(f"{kind}:{value}".encode()).hexdigest()
+
+class _DisjointSet:
+    def __init__(self):
+        self.parent: Dict[str, str] = {}
+    
+    def find(self, node: str) -> str:
+        self.parent.setdefault(node, node)
+        root = node
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[node] != root:
+            self.parent[node], node = root, self.parent[node]
+        return root
+    
+    def union(self, a: str, b: str):
+        self.parent[self.find(a)] = self.find(b)
+
+class IdentityResolver:
+    """Clusters unified users into people through the identity_keys blocking index"""
+    
+    def __init__(self):
+        self.supabase = get_supabase()
+    
+    def assign(self, platform_id: str, users: List[Dict]):
+        """Set person_id on unified user rows about to be written, merging people they connect"""
+        row_keys = [identity_keys(platform_id, user) for user in users]
+        all_keys = {key: kind for keys in row_keys for key, kind in keys.items()}
+        if not all_keys:
+            return
+        
+        known: Dict[str, str] = {}
+        key_list = list(all_keys)
+        for start in range(0, len(key_list), LOOKUP_CHUNK_SIZE):
+            response = self.supabase.table("identity_keys").select("key_hash, person_id").in_(
+                "key_hash", key_list[start:start + LOOKUP_CHUNK_SIZE]
+            ).execute()
+            known.update({row["key_hash"]: row["person_id"] for row in response.data})
+        
+        # Keys are linked when they share a row or already point at the same person
+        clusters = _DisjointSet()
+        for key, person_id in known.items():
+            clusters.union(f"k:{key}", f"p:{person_id}")
+        for keys in row_keys:
+            first = f"k:{next(iter(keys))}"
+            for key in keys:
+                clusters.union(f"k:{key}", first)
+        
+        people: Dict[str, Set[str]] = {}
+        for key in all_keys:
+            people.setdefault(clusters.find(f"k:{key}"), set())
+        for person_id in known.values():
+            people[clusters.find(f"p:{person_id}")].add(person_id)
+        
+        # The smallest id survives a merge, so every run picks the same one
+        canonical: Dict[str, str] = {}
+        merges: Dict[str, List[str]] = {}
+        for root, person_ids in people.items():
+            canonical[root] = min(person_ids) if person_ids else str(uuid.uuid4())
+            if len(person_ids) > 1:
+                merges[canonical[root]] = sorted(person_ids - {canonical[root]})
+        
+        for user, keys in zip(users, row_keys):
+            user["person_id"] = canonical[clusters.find(f"k:{next(iter(keys))}")]
+        
+        for person_id, merged in merges.items():
+            self._merge(person_id, merged)
+        
+        new_keys = [
+            {"key_hash": key, "key_type": kind, "person_id": canonical[clusters.find(f"k:{key}")]}
+            for key, kind in all_keys.items()
+            if known.get(key) != canonical[clusters.find(f"k:{key}")]
+        ]
+        for start in range(0, len(new_keys), settings.SYNC_BATCH_SIZE):
+            self.supabase.table("identity_keys").upsert(
+                new_keys[start:start + settings.SYNC_BATCH_SIZE],
+                on_conflict="key_hash"
+            ).execute()
+    
+    def _merge(self, person_id: str, merged: List[str]):
+        """Point accounts and keys of `merged` people at `person_id`"""
+        logger.info("Merging %s people into %s", len(merged), person_id)
+        self.supabase.table("unified_users").update({"person_id": person_id}).in_("person_id", merged).execute()
+        self.supabase.table("identity_keys").update({"person_id": person_id}).in_("person_id", merged).execute()
+
+identity_resolver = IdentityResolver()
@@ -0,0 +1,270 @@
+import uuid
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
+from app.services.host_supabase import host_supabase
+from app.core.supabase import get_supabase
+from app.utils.logger import get_logger
+from app.config import settings
+
+logger = get_logger(__name__)
+
+# Keeps in.(...) filters well under URL length limits
+LOOKUP_CHUNK_SIZE = 200
+
+# Upstream payment status -> ledger status
+PAYMENT_STATUSES = {
+    "succeeded": "completed",
+    "paid": "completed",
+    "refunded": "completed",
+    "partially_refunded": "completed",
+    "pending": "pending",
+    "processing": "pending",
+    "failed": "failed"
+}
+
+# Upstream payout status -> ledger status; anything else is still in flight
+PAYOUT_STATUSES = {
+    "paid": "completed",
+    "failed": "failed",
+    "canceled": "failed",
+    "reversed": "failed"
+}
+
+PAYOUT_SOURCE = "host_dashboard:payouts"
+
+# Earliest processed day written since the last finance rollup refresh (sync_watermarks)
+DIRTY_SOURCE = "ledger:dirty"
+
+def _amount(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+def _day(timestamp: Optional[str]) -> Optional[date]:
+    if not timestamp:
+        return None
+    try:
+        # Rollups bucket by UTC day, whatever offset the source wrote
+        return _timestamp(timestamp).astimezone(timezone.utc).date()
+    except ValueError:
+        return None
+
+def _timestamp(value: str) -> datetime:
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def rewind(watermark: Optional[str], seconds: float) -> Optional[str]:
+    """Watermark moved back by seconds, to re-read rows that became visible after later ones"""
+    if not watermark:
+        return watermark
+    return (_timestamp(watermark) - timedelta(seconds=seconds)).isoformat()
+
+def reached(timestamp: str, watermark: Optional[str]) -> bool:
+    """Whether storing timestamp as the watermark would not move it back"""
+    return not watermark or _timestamp(timestamp) >= _timestamp(watermark)
+
+class LedgerService:
+    """Feeds unified_transactions from synced platform data and keeps the finance rollups current"""
+    
+    def __init__(self):
+        self.supabase = get_supabase()
+    
+    def record_bookings(self, platform_id: str, bookings: List[Dict], booking_ids: Dict[str, str]):
+        """Ledger the payment and refund of bookings just written; booking_ids maps platform to unified ID"""
+        rows = []
+        for booking in bookings:
+            booking_id = booking_ids.get(booking.get("id"))
+            if not booking_id:
+                continue
+            try:
+                rows.extend(self._booking_transactions(platform_id, booking_id, booking))
+            except Exception as e:
+                logger.error("Failed to ledger booking %s: %s", booking.get("id"), e, extra={"sample_key": "ledger_row_error"})
+        self.upsert_transactions(rows)
+    
+    def _booking_transactions(self, platform_id: str, booking_id: str, booking: Dict) -> List[Dict]:
+        payment_status = booking.get("payment_status") or "pending"
+        total = _amount(booking.get("total_amount") or booking.get("total_price"))
+        fee = _amount(booking.get("platform_fee_amount"))
+        processed_at = booking.get("payment_processed_at") or booking.get("created_at")
+        common = {
+            "platform_id": platform_id,
+            "booking_id": booking_id,
+            "source_id": str(booking["id"]),
+            "currency": (booking.get("currency") or "AED").upper(),
+            "payment_provider": "stripe" if booking.get("stripe_payment_intent_id") else None,
+            "payment_provider_id": booking.get("stripe_payment_intent_id")
+        }
+        
+        rows = [{
+            **common,
+            "transaction_type": "booking_payment",
+            "amount_total": total,
+            "amount_platform_fee": fee,
+            "amount_host_payout": _amount(booking.get("host_payout_amount")) or total - fee,
+            "status": PAYMENT_STATUSES.get(payment_status, "pending"),
+            "processed_at": processed_at
+        }]
+        
+        refund = _amount(booking.get("refund_amount"))
+        if payment_status == "refunded" and not refund:
+            refund = total
+        if refund > 0:
+            rows.append({
+                **common,
+                "transaction_type": "refund",
+                "amount_total": refund,
+                "amount_platform_fee": 0,
+                "amount_host_payout": None,
+                "status": "completed",
+                "processed_at": booking.get("updated_at") or processed_at
+            })
+        return rows
+    
+    async def ingest_payouts(self, platform_id: str):
+        """Ledger host payouts changed since the stored watermark, oldest first"""
+        if not host_supabase.configured:
+            return
+        
+        position, last_id = self.get_watermark(PAYOUT_SOURCE)
+        # updated_at is set before commit, so a payout can appear behind ones already read;
+        # the upserts are idempotent, so the last SYNC_PAYOUT_LOOKBACK seconds are read again
+        watermark = rewind(position, settings.SYNC_PAYOUT_LOOKBACK)
+        ingested = 0
+        while True:
+            payouts = await host_supabase.list_payouts_updated_since(watermark, last_id, settings.SYNC_BATCH_SIZE)
+            if not payouts:
+                break
+            
+            booking_ids = self._booking_ids(platform_id, [payout.get("booking_id") for payout in payouts])
+            stored = self.upsert_transactions([
+                {
+                    "platform_id": platform_id,
+                    "booking_id": booking_ids.get(payout.get("booking_id")),
+                    "source_id": str(payout["id"]),
+                    "transaction_type": "payout",
+                    "amount_total": _amount(payout.get("amount")),
+                    "amount_platform_fee": _amount(payout.get("platform_fee")),
+                    "amount_host_payout": _amount(payout.get("amount")),
+                    "currency": (payout.get("currency") or "AED").upper(),
+                    "payment_provider": "stripe",
+                    "payment_provider_id": payout.get("stripe_payout_id") or payout.get("stripe_transfer_id"),
+                    "status": PAYOUT_STATUSES.get(payout.get("status"), "pending"),
+                    "processed_at": payout.get("completed_at") or payout.get("initiated_at") or payout.get("created_at")
+                }
+                for payout in payouts
+            ])
+            
+            # Only advance once the page is stored, so a failed run resumes where it stopped
+            if not stored:
+                break
+            watermark, last_id = payouts[-1]["updated_at"], str(payouts[-1]["id"])
+            if reached(watermark, position):
+                self.set_watermark(PAYOUT_SOURCE, watermark, last_id)
+                position = watermark
+            ingested += len(payouts)
+            if len(payouts) < settings.SYNC_BATCH_SIZE:
+                break
+        
+        if ingested:
+            logger.info("Ledgered %s host payouts", ingested)
+    
+    def refresh_rollups(self) -> int:
+        """Recompute daily rollups from the earliest day touched since the last refresh"""
+        since, token = self.get_dirty(DIRTY_SOURCE)
+        if not since:
+            return 0
+        response = self.supabase.rpc("refresh_finance_rollups", {"since": since.isoformat()}).execute()
+        self.clear_dirty(DIRTY_SOURCE, token)
+        logger.info("Refreshed finance rollups since %s", since)
+        return response.data or 0
+    
+    def get_watermark(self, source: str) -> Tuple[Optional[str], Optional[str]]:
+        """Timestamp and ID of the last record ingested from source"""
+        response = self.supabase.table("sync_watermarks").select("watermark, last_id").eq("source", source).execute()
+        if not response.data:
+            return None, None
+        return response.data[0]["watermark"], response.data[0]["last_id"]
+    
+    def set_watermark(self, source: str, watermark: str, last_id: str):
+        self.supabase.table("sync_watermarks").upsert({
+            "source": source,
+            "watermark": watermark,
+            "last_id": last_id,
+            "updated_at": datetime.utcnow().isoformat()
+        }, on_conflict="source").execute()
+    
+    def extend_dirty(self, source: str, days: List[date]):
+        """Move the stored earliest dirty day of source back to the earliest of days"""
+        # Kept in sync_watermarks so a restart or a failed refresh does not lose it; every
+        # change gets a new token so a refresh only clears the range it read
+        earliest = min(days)
+        while True:
+            since, token = self.get_dirty(source)
+            if since and since <= earliest:
+                return
+            
+            row = {
+                "source": source,
+                "watermark": earliest.isoformat(),
+                "last_id": str(uuid.uuid4()),
+                "updated_at": datetime.utcnow().isoformat()
+            }
+            # Compare-and-set on the token: a write only lands on the value it read, so two
+            # workers cannot overwrite an earlier day with a later one. Losing means another
+            # writer or a refresh moved it; read again and retry
+            if token is None:
+                written = self.supabase.table("sync_watermarks").upsert(
+                    row, on_conflict="source", ignore_duplicates=True
+                ).execute().data
+            else:
+                written = self.supabase.table("sync_watermarks").update(row).eq(
+                    "source", source
+                ).eq("last_id", token).execute().data
+            if written:
+                return
+    
+    def get_dirty(self, source: str) -> Tuple[Optional[date], Optional[str]]:
+        """Earliest dirty day of source and the token of that value"""
+        watermark, token = self.get_watermark(source)
+        return _day(watermark), token
+    
+    def clear_dirty(self, source: str, token: Optional[str]):
+        """Drop the dirty range read with token, unless it was extended in the meantime"""
+        self.supabase.table("sync_watermarks").delete().eq("source", source).eq("last_id", token).execute()
+    
+    def upsert_transactions(self, rows: List[Dict]) -> bool:
+        """Idempotent bulk write keyed on the source record; False if any batch failed"""
+        stored = True
+        for start in range(0, len(rows), settings.SYNC_BATCH_SIZE):
+            batch = rows[start:start + settings.SYNC_BATCH_SIZE]
+            try:
+                self.supabase.table("unified_transactions").upsert(
+                    batch, on_conflict="platform_id,transaction_type,source_id"
+                ).execute()
+            except Exception as e:
+                logger.error("Failed to ledger %s transactions: %s", len(batch), e)
+                stored = False
+                continue
+            
+            self.mark_dirty(row["processed_at"] for row in batch)
+        return stored
+    
+    def mark_dirty(self, timestamps: Iterable[Optional[str]]):
+        """Schedule the days of these processed_at values for the next rollup refresh"""
+        days = [day for day in (_day(timestamp) for timestamp in timestamps) if day]
+        if days:
+            self.extend_dirty(DIRTY_SOURCE, days)
+    
+    def _booking_ids(self, platform_id: str, platform_booking_ids: List[Optional[str]]) -> Dict[str, str]:
+        unique_ids = list({k for k in platform_booking_ids if k})
+        ids: Dict[str, str] = {}
+        for start in range(0, len(unique_ids), LOOKUP_CHUNK_SIZE):
+            response = self.supabase.table("unified_bookings").select("id, platform_booking_id").eq(
+                "platform_id", platform_id
+            ).in_("platform_booking_id", unique_ids[start:start + LOOKUP_CHUNK_SIZE]).execute()
+            ids.update({item["platform_booking_id"]: item["id"] for item in response.data})
+        return ids
+
+ledger_service = LedgerService()
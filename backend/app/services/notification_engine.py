@@ -0,0 +1,290 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+from app.core.supabase import get_supabase
+from app.core.redis import redis_client
+from app.services.ledger_service import ledger_service
+from app.services.event_bus import event_bus
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Unread count per admin, seeded from admin_notifications when missing
+UNREAD_KEY = "notifications:unread:{}"
+
+# Where the stale verification sweep left off (sync_watermarks)
+STALE_VERIFICATION_SOURCE = "notifications:verification_stale"
+
+PRIORITIES = ("low", "normal", "high", "critical")
+
+class NotificationEngine:
+    """Rule-driven, deduplicated and batched writer for admin_notifications"""
+    
+    def __init__(self, batch_size: int, flush_interval: float, max_per_rule: int, cooldown: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_per_rule = max_per_rule
+        self.cooldown = cooldown
+        # dedupe_key -> notification, so an occurrence queued twice before a flush is written once
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+        logger.info("Notification engine started")
+    
+    async def stop(self):
+        """Stop the background flusher and write everything still queued"""
+        if self._task:
+            # Signal instead of cancelling, as the audit logger does
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            self._stopping = False
+        
+        await self.flush()
+    
+    def notify(
+        self,
+        rule: str,
+        key: str,
+        title: str,
+        message: str,
+        priority: str = "normal",
+        data: Optional[Dict[str, Any]] = None
+    ):
+        """Queue a notification for every active admin; rule and key identify the occurrence, which is written once"""
+        dedupe_key = f"{rule}:{key}"
+        self.pending.setdefault(dedupe_key, {
+            "type": rule,
+            "title": title,
+            "message": message,
+            "priority": priority,
+            "data": data or {},
+            "is_read": False,
+            "dedupe_key": dedupe_key,
+            "created_at": datetime.utcnow().isoformat()
+        })
+        if len(self.pending) >= self.batch_size:
+            self._wakeup.set()
+    
+    def notify_each(
+        self,
+        rule: str,
+        occurrences: List[Dict[str, Any]],
+        digest_title: str,
+        priority: str = "normal"
+    ):
+        """Queue one notification per occurrence, or a single digest when a rule fires more than max_per_rule at once"""
+        if len(occurrences) <= self.max_per_rule:
+            for occurrence in occurrences:
+                self.notify(rule, occurrence["key"], occurrence["title"], occurrence["message"], priority, occurrence["data"])
+            return
+        
+        # Keyed on the set it covers, so evaluating the same occurrences again does not repeat the digest
+        keys = sorted(occurrence["key"] for occurrence in occurrences)
+        self.notify(
+            rule,
+            f"digest:{keys[0]}:{keys[-1]}:{len(keys)}",
+            digest_title.format(count=len(occurrences)),
+            "; ".join(occurrence["title"] for occurrence in occurrences[:5]) + ("; ..." if len(occurrences) > 5 else ""),
+            priority,
+            {"count": len(occurrences), "items": [occurrence["data"] for occurrence in occurrences[:self.max_per_rule]]}
+        )
+    
+    def _window(self) -> int:
+        """Cooldown bucket: a recurring condition notifies at most once per bucket"""
+        return int(time.time() // self.cooldown)
+    
+    # Rules
+    def stale_verifications(self, rows: Iterable[Dict[str, Any]]):
+        """Verifications still awaiting review past NOTIFY_VERIFICATION_PENDING_HOURS"""
+        cutoff = (datetime.utcnow() - timedelta(hours=settings.NOTIFY_VERIFICATION_PENDING_HOURS)).isoformat()
+        stale = [
+            row for row in rows
+            if row.get("status") in ("pending", "in_review") and (row.get("created_at") or "") <= cutoff
+        ]
+        self.notify_each("verification_stale", [
+            {
+                "key": row["id"],
+                "title": "Verification waiting for review",
+                "message": f"Verification {row['id']} has been {row['status']} since {row['created_at']}",
+                "data": {"verification_id": row["id"], "platform_id": row.get("platform_id"), "created_at": row["created_at"]}
+            }
+            for row in stale
+        ], f"{{count}} verifications waiting more than {settings.NOTIFY_VERIFICATION_PENDING_HOURS:g} hours", "high")
+    
+    def sweep_stale_verifications(self):
+        """Find verifications that crossed the age threshold since the last sweep"""
+        supabase = get_supabase()
+        cutoff = (datetime.utcnow() - timedelta(hours=settings.NOTIFY_VERIFICATION_PENDING_HOURS)).isoformat()
+        watermark, _ = ledger_service.get_watermark(STALE_VERIFICATION_SOURCE)
+        
+        query = supabase.table("verification_queue").select(
+            "id, platform_id, status, created_at"
+        ).in_("status", ["pending", "in_review"]).lte("created_at", cutoff)
+        if watermark:
+            query = query.gt("created_at", watermark)
+        self.stale_verifications(query.order("created_at").execute().data)
+        ledger_service.set_watermark(STALE_VERIFICATION_SOURCE, cutoff, None)
+    
+    def large_refunds(self, refund_rows: Iterable[Dict[str, Any]]):
+        """Refunds at or above the NOTIFY_REFUND_THRESHOLDS amount of their currency"""
+        large = [
+            row for row in refund_rows
+            if (row.get("amount_total") or 0) >= settings.NOTIFY_REFUND_THRESHOLDS.get(
+                (row.get("currency") or "").upper(), settings.NOTIFY_REFUND_THRESHOLD
+            )
+        ]
+        self.notify_each("refund_large", [
+            {
+                # A further partial refund of the same payment raises the refunded total, so it notifies again
+                "key": f"{row['payment_provider_id']}:{row['amount_total']}",
+                "title": f"Refund of {row['amount_total']:,.2f} {row['currency']}",
+                "message": f"Payment {row['payment_provider_id']} refunded {row['amount_total']:,.2f} {row['currency']}",
+                "data": {
+                    "booking_id": row.get("booking_id"),
+                    "payment_provider_id": row["payment_provider_id"],
+                    "amount": row["amount_total"],
+                    "currency": row["currency"]
+                }
+            }
+            for row in large
+        ], "{count} large refunds", "high")
+    
+    def dependency_unhealthy(self, result: Dict[str, Any], core: bool):
+        """A platform or core dependency failed its health probe"""
+        self.notify(
+            "platform_unhealthy",
+            f"{result['name']}:{self._window()}",
+            f"{result['name']} is unhealthy",
+            result.get("error") or "Health probe failed",
+            "critical" if core else "high",
+            {"name": result["name"], "platform_id": result.get("platform_id"), "error": result.get("error")}
+        )
+    
+    def sync_failed(self, error: str):
+        self.notify(
+            "sync_failed",
+            str(self._window()),
+            "Platform sync failed",
+            error,
+            "critical",
+            {"error": error}
+        )
+    
+    # Delivery
+    async def flush(self):
+        """Write queued notifications for every active admin in multi-row upserts"""
+        async with self._flush_lock:
+            notifications, self.pending = list(self.pending.values()), {}
+            if not notifications:
+                return
+            
+            try:
+                written = await asyncio.to_thread(self._write, notifications)
+            except Exception as e:
+                logger.error("Failed to write %d notifications, retrying next flush: %s", len(notifications), e)
+                for notification in notifications:
+                    self.pending.setdefault(notification["dedupe_key"], notification)
+                return
+            
+            for admin_id, count in written.items():
+                await self._add_unread(admin_id, count)
+            if written:
+                await event_bus.publish(
+                    "notifications.new",
+                    count=max(written.values()),
+                    priority=max((n["priority"] for n in notifications), key=PRIORITIES.index)
+                )
+    
+    def _write(self, notifications: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Returns admin id -> notifications actually inserted; repeats of a dedupe_key are skipped by the database"""
+        supabase = get_supabase()
+        admins = supabase.table("super_admin_users").select("id").eq("is_active", True).execute().data
+        rows = [{**notification, "admin_user_id": admin["id"]} for admin in admins for notification in notifications]
+        
+        written: Dict[str, int] = {}
+        for start in range(0, len(rows), self.batch_size):
+            response = supabase.table("admin_notifications").upsert(
+                rows[start:start + self.batch_size],
+                on_conflict="admin_user_id,dedupe_key",
+                ignore_duplicates=True
+            ).execute()
+            for row in response.data:
+                written[row["admin_user_id"]] = written.get(row["admin_user_id"], 0) + 1
+        return written
+    
+    async def _add_unread(self, admin_id: str, count: int):
+        key = UNREAD_KEY.format(admin_id)
+        value = await redis_client.incr(key, count)
+        if value == count:
+            # There was no counter (or it was 0): drop it so the next read seeds it from the table
+            await redis_client.delete(key)
+    
+    async def unread_count(self, admin_id: str) -> int:
+        """Unread notifications of an admin, from the Redis counter; counts the table only to seed it"""
+        key = UNREAD_KEY.format(admin_id)
+        count = await redis_client.get(key)
+        if count is not None:
+            return count
+        
+        response = await asyncio.to_thread(
+            lambda: get_supabase().table("admin_notifications").select("id", count="exact", head=True).eq(
+                "admin_user_id", admin_id
+            ).eq("is_read", False).execute()
+        )
+        count = response.count or 0
+        # The TTL bounds any drift from a seed racing a write
+        await redis_client.set(key, count, ex=settings.NOTIFICATION_UNREAD_TTL)
+        return count
+    
+    async def mark_read(self, admin_id: str, notification_ids: Optional[List[str]] = None) -> int:
+        """Mark some or all unread notifications of an admin read; returns how many changed"""
+        def update():
+            query = get_supabase().table("admin_notifications").update({"is_read": True}).eq(
+                "admin_user_id", admin_id
+            ).eq("is_read", False)
+            if notification_ids is not None:
+                query = query.in_("id", notification_ids)
+            return query.execute().data
+        
+        updated = len(await asyncio.to_thread(update))
+        key = UNREAD_KEY.format(admin_id)
+        if notification_ids is None:
+            await redis_client.set(key, 0, ex=settings.NOTIFICATION_UNREAD_TTL)
+        elif updated:
+            value = await redis_client.incr(key, -updated)
+            if value is not None and value < 0:
+                await redis_client.delete(key)
+        return updated
+    
+    async def _run(self):
+        """Flush on size or time thresholds, whichever comes first"""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            
+            if self._stopping:
+                break
+            self._wakeup.clear()
+            
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Notification flush loop error: %s", e)
+
+notification_engine = NotificationEngine(
+    batch_size=settings.NOTIFICATION_BATCH_SIZE,
+    flush_interval=settings.NOTIFICATION_FLUSH_INTERVAL,
+    max_per_rule=settings.NOTIFICATION_MAX_PER_RULE,
+    cooldown=settings.NOTIFICATION_COOLDOWN
+)
@@ -1,7 +1,16 @@
 from typing import Optional, Dict, Any, List
+import asyncio
+import time
 import httpx
+from app.config import settings
+from app.core.circuit_breaker import get_breaker, CircuitOpenError, CLOSED
 from app.core.redis import redis_client
-from app.utils.logger import logger
+from app.core.retry import retry_policy, get_rate_limiter
+from app.core.tracing import start_span, inject_headers, SpanKind
+from app.core.metrics import UPSTREAM_LATENCY, CACHE_LOOKUPS, cache_namespace, endpoint_label
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class PlatformClient:
     """Base class for platform API clients"""
@@ -10,13 +19,15 @@ class PlatformClient:
         self.name = name
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
+        self.breaker = get_breaker(name)
+        self.rate_limiter = get_rate_limiter(name)
         self.client = httpx.AsyncClient(
             base_url=self.base_url,
             headers={
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json"
             },
-            timeout=30.0,
+            timeout=settings.PLATFORM_TIMEOUT_MAX,
             follow_redirects=True
         )
     
@@ -26,38 +37,124 @@ class PlatformClient:
         endpoint: str, 
         cache_key: Optional[str] = None,
         cache_ttl: int = 300,
+        retry: Optional[bool] = None,
+        fresh: bool = False,
+        probe: bool = False,
         **kwargs
     ) -> Dict[str, Any]:
-        """Make HTTP request with caching"""
+        """Make HTTP request with caching, retries and circuit breaking"""
+        cacheable = cache_key and method.upper() == "GET"
         
-        # Check cache for GET requests
-        if cache_key and method.upper() == "GET":
+        # Check cache for GET requests; fresh reads go upstream and only refresh the cache
+        if cacheable and not fresh:
             cached = await redis_client.get(cache_key)
             if cached:
-                logger.debug(f"Cache hit for {cache_key}")
+                CACHE_LOOKUPS.labels(cache_namespace(cache_key), "hit").inc()
+                logger.debug("Cache hit for %s", cache_key, extra={"sample_key": "cache_hit"})
                 return cached
+            CACHE_LOOKUPS.labels(cache_namespace(cache_key), "miss").inc()
+        
+        started = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                data = await self._send(method, endpoint, probe, **kwargs)
+                break
+            except CircuitOpenError:
+                # Fail fast (or serve stale data) while the platform is unhealthy
+                if cacheable and not fresh:
+                    stale = await redis_client.get(f"{cache_key}:stale")
+                    if stale:
+                        CACHE_LOOKUPS.labels(cache_namespace(cache_key), "stale").inc()
+                        logger.warning("Circuit open for %s, serving stale %s", self.name, cache_key, extra={"sample_key": "stale_hit"})
+                        return stale
+                raise
+            except Exception as e:
+                delay = retry_policy.delay(attempt, e)
+                # The breaker hears once per request, when it fails for good; a half-open trial gets one attempt
+                if (
+                    attempt >= retry_policy.max_attempts
+                    or not retry_policy.is_retryable(method, e, retry)
+                    or time.monotonic() - started + delay > retry_policy.budget
+                    or self.breaker.state != CLOSED
+                ):
+                    self._record_failure(e)
+                    raise
+                
+                if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 429:
+                    self.rate_limiter.penalize(delay)
+                
+                logger.warning("Retrying %s %s on %s in %.2fs (attempt %d)", method, endpoint, self.name, delay, attempt + 1)
+                await asyncio.sleep(delay)
+                attempt += 1
+        
+        # Cache successful GET requests
+        if cacheable:
+            await redis_client.set(cache_key, data, ex=cache_ttl)
+            await redis_client.set(f"{cache_key}:stale", data, ex=settings.STALE_CACHE_TTL)
+        
+        return data
+    
+    async def _send(self, method: str, endpoint: str, probe: bool = False, **kwargs) -> Dict[str, Any]:
+        """Single rate-limited attempt through the circuit breaker"""
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(self.name, self.breaker.retry_in())
+        
+        await self.rate_limiter.acquire()
         
-        # Make request
+        started = time.monotonic()
+        status = "error"
         try:
             url = endpoint if endpoint.startswith('http') else f"{self.base_url}{endpoint}"
-            logger.info(f"{method} {url}")
+            logger.info("%s %s", method, url, extra={"sample_key": "upstream_request"})
             
-            response = await self.client.request(method, endpoint, **kwargs)
+            with start_span(
+                f"{self.name} {method.upper()} {endpoint_label(endpoint)}",
+                {"peer.service": self.name, "http.method": method.upper(), "http.url": url},
+                SpanKind.CLIENT
+            ) as span:
+                # Propagate trace context to the source platform
+                headers = inject_headers(dict(kwargs.pop("headers", None) or {}))
+                response = await self.client.request(
+                    method,
+                    endpoint,
+                    headers=headers,
+                    timeout=self.breaker.timeout(),
+                    **kwargs
+                )
+                span.set_attribute("http.status_code", response.status_code)
+            status = str(response.status_code)
             response.raise_for_status()
             data = response.json()
-            
-            # Cache successful GET requests
-            if cache_key and method.upper() == "GET":
-                await redis_client.set(cache_key, data, ex=cache_ttl)
-            
+            # Probes hit a cheap endpoint on a fixed interval; their latency would drag the
+            # adaptive timeout down to what a health check needs rather than a real request
+            self.breaker.record_success(None if probe else time.monotonic() - started)
             return data
-            
+        
         except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error for {self.name} - {endpoint}: {e.response.status_code} {e.response.text}")
+            if e.response.status_code < 500 and e.response.status_code != 429:
+                # The platform answered; client errors say nothing about its health
+                self.breaker.record_success(None if probe else time.monotonic() - started)
+            logger.error("HTTP error for %s - %s: %s %s", self.name, endpoint, e.response.status_code, e.response.text)
             raise
         except Exception as e:
-            logger.error(f"Request failed for {self.name} - {endpoint}: {str(e)}")
+            # Transport errors, or e.g. an HTML error page instead of JSON while the platform restarts
+            logger.error("Request failed for %s - %s: %s", self.name, endpoint, e)
             raise
+        finally:
+            UPSTREAM_LATENCY.labels(
+                self.name, method.upper(), endpoint_label(endpoint), status
+            ).observe(time.monotonic() - started)
+    
+    def _record_failure(self, error: Exception):
+        """Breaker verdict on a request that failed after its last attempt"""
+        if isinstance(error, httpx.HTTPStatusError) and error.response.status_code < 500:
+            # Rate limiting is not a failure, but the throttled request did not show health either;
+            # other client errors were already counted as answers
+            if error.response.status_code == 429:
+                self.breaker.release()
+            return
+        self.breaker.record_failure()
     
     async def get(self, endpoint: str, **kwargs) -> Dict[str, Any]:
         """GET request"""
@@ -85,9 +182,15 @@ class PlatformClient:
             await self.get("/api/health", cache_key=f"{self.name}:health", cache_ttl=30)
             return True
         except Exception as e:
-            logger.error(f"Health check failed for {self.name}: {e}")
+            logger.error("Health check failed for %s: %s", self.name, e)
             return False
     
+    async def probe(self, endpoint: str = "/api/health") -> float:
+        """Uncached single-attempt health request, returns latency in seconds"""
+        started = time.monotonic()
+        await self._request("GET", endpoint, retry=False, probe=True)
+        return time.monotonic() - started
+    
     async def close(self):
         """Close HTTP client"""
         await self.client.aclose()
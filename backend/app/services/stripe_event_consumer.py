@@ -0,0 +1,205 @@
+import asyncio
+from typing import List, Dict, Any, Optional
+from app.services.host_supabase import host_supabase
+from app.services.ledger_service import ledger_service, PAYMENT_STATUSES, rewind, reached
+from app.services.event_bus import event_bus
+from app.services.notification_engine import notification_engine
+from app.core.supabase import get_supabase
+from app.core.http_cache import touch
+from app.utils.logger import get_logger
+from app.config import settings
+
+logger = get_logger(__name__)
+
+# Keeps in.(...) filters well under URL length limits
+LOOKUP_CHUNK_SIZE = 200
+
+STRIPE_EVENT_SOURCE = "host_dashboard:stripe_events"
+
+# Payment intent events -> upstream booking payment status (charge.refunded is derived from its amounts)
+PAYMENT_EVENTS = {
+    "payment_intent.processing": "processing",
+    "payment_intent.succeeded": "succeeded",
+    "payment_intent.payment_failed": "failed",
+    "payment_intent.canceled": "failed"
+}
+
+# Payout and transfer events -> ledger status of the payout
+PAYOUT_EVENTS = {
+    "payout.paid": "completed",
+    "payout.failed": "failed",
+    "payout.canceled": "failed",
+    "transfer.reversed": "failed"
+}
+
+EVENT_TYPES = [*PAYMENT_EVENTS, "charge.refunded", *PAYOUT_EVENTS]
+
+def _major(amount: Any) -> float:
+    """Stripe amounts are in minor units"""
+    try:
+        return float(amount or 0) / 100
+    except (TypeError, ValueError):
+        return 0.0
+
+def _chunks(items: List, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class StripeEventConsumer:
+    """Tails the Host Dashboard stripe_events log into the ledger and booking payment statuses"""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.supabase = get_supabase()
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Start polling on a fixed interval; a no-op without Host Dashboard credentials"""
+        if not host_supabase.configured:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info("Stripe event consumer started")
+    
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self):
+        while True:
+            try:
+                await self.consume()
+            except Exception as e:
+                logger.error("Stripe event consumption failed: %s", e)
+            await asyncio.sleep(self.interval)
+    
+    async def consume(self) -> int:
+        """Apply events received since the stored watermark; returns how many were new"""
+        stored, last_id = ledger_service.get_watermark(STRIPE_EVENT_SOURCE)
+        # Log rows become visible at commit, not in created_at order, so the tail starts
+        # STRIPE_EVENT_LOOKBACK seconds behind the stored position
+        watermark = rewind(stored, settings.STRIPE_EVENT_LOOKBACK)
+        consumed = 0
+        while True:
+            events = await host_supabase.list_stripe_events_since(
+                EVENT_TYPES, watermark, last_id, settings.STRIPE_EVENT_BATCH_SIZE
+            )
+            if not events:
+                break
+            
+            # Delivery is at least once: the watermark only moves after a page is applied,
+            # and receipts keep a redelivered or re-read event from being applied twice
+            fresh = self._unprocessed(events)
+            if fresh:
+                self._apply(fresh)
+                self.supabase.table("stripe_event_receipts").upsert([
+                    {"stripe_event_id": event["stripe_event_id"], "event_type": event["event_type"]}
+                    for event in fresh
+                ], on_conflict="stripe_event_id", ignore_duplicates=True).execute()
+            
+            watermark, last_id = events[-1]["created_at"], str(events[-1]["id"])
+            # Pages re-read from the lookback window must not move the stored position back
+            if reached(watermark, stored):
+                ledger_service.set_watermark(STRIPE_EVENT_SOURCE, watermark, last_id)
+                stored = watermark
+            consumed += len(fresh)
+            if len(events) < settings.STRIPE_EVENT_BATCH_SIZE:
+                break
+        
+        if consumed:
+            logger.info("Applied %s Stripe events", consumed)
+            ledger_service.refresh_rollups()
+            await touch("bookings", "transactions")
+            await event_bus.publish("payments.updated", count=consumed)
+        return consumed
+    
+    def _unprocessed(self, events: List[Dict]) -> List[Dict]:
+        """Events of the page not applied before, one per Stripe event id, in log order"""
+        by_id = {}
+        for event in events:
+            if event.get("stripe_event_id"):
+                by_id.setdefault(event["stripe_event_id"], event)
+        
+        done = set()
+        for chunk in _chunks(list(by_id), LOOKUP_CHUNK_SIZE):
+            response = self.supabase.table("stripe_event_receipts").select("stripe_event_id").in_(
+                "stripe_event_id", chunk
+            ).execute()
+            done.update(row["stripe_event_id"] for row in response.data)
+        
+        return [event for event_id, event in by_id.items() if event_id not in done]
+    
+    def _apply(self, events: List[Dict]):
+        """Fold the events into final states per payment intent and payout, then write them in bulk"""
+        payments: Dict[str, str] = {}
+        refunds: Dict[str, Dict] = {}
+        payouts: Dict[str, str] = {}
+        
+        # Later events win
+        for event in events:
+            event_type = event["event_type"]
+            intent = event.get("payment_intent_id")
+            if event_type == "charge.refunded" and intent:
+                refunded = _major(event.get("amount_refunded"))
+                payments[intent] = "refunded" if refunded >= _major(event.get("amount")) else "partially_refunded"
+                refunds[intent] = event
+            elif event_type in PAYMENT_EVENTS and intent:
+                payments[intent] = PAYMENT_EVENTS[event_type]
+            elif event_type in PAYOUT_EVENTS and (event.get("payout_id") or event.get("transfer_id")):
+                payouts[event.get("payout_id") or event.get("transfer_id")] = PAYOUT_EVENTS[event_type]
+        
+        # Events for bookings or payouts not ledgered yet are covered when sync first writes them
+        by_intent = {tx["payment_provider_id"]: tx for tx in self._transactions("booking_payment", list(payments))}
+        for status in set(payments.values()):
+            matched = [tx for intent, tx in by_intent.items() if payments[intent] == status]
+            self._set_status([tx["id"] for tx in matched], PAYMENT_STATUSES[status])
+            for chunk in _chunks([tx["booking_id"] for tx in matched if tx.get("booking_id")], LOOKUP_CHUNK_SIZE):
+                self.supabase.table("unified_bookings").update({"payment_status": status}).in_("id", chunk).execute()
+            ledger_service.mark_dirty(tx["processed_at"] for tx in matched)
+        
+        refund_rows = [
+            {
+                "platform_id": by_intent[intent]["platform_id"],
+                "booking_id": by_intent[intent].get("booking_id"),
+                "source_id": by_intent[intent]["source_id"],
+                "transaction_type": "refund",
+                "amount_total": _major(event.get("amount_refunded")),
+                "amount_platform_fee": 0,
+                "amount_host_payout": None,
+                "currency": (event.get("currency") or by_intent[intent].get("currency") or "AED").upper(),
+                "payment_provider": "stripe",
+                "payment_provider_id": intent,
+                "status": "completed",
+                "processed_at": event["created_at"]
+            }
+            for intent, event in refunds.items()
+            if intent in by_intent
+        ]
+        if refund_rows and not ledger_service.upsert_transactions(refund_rows):
+            raise RuntimeError(f"Failed to ledger {len(refund_rows)} refunds")
+        notification_engine.large_refunds(refund_rows)
+        
+        by_provider = {tx["payment_provider_id"]: tx for tx in self._transactions("payout", list(payouts))}
+        for status in set(payouts.values()):
+            matched = [tx for provider_id, tx in by_provider.items() if payouts[provider_id] == status]
+            self._set_status([tx["id"] for tx in matched], status)
+            ledger_service.mark_dirty(tx["processed_at"] for tx in matched)
+    
+    def _transactions(self, transaction_type: str, provider_ids: List[str]) -> List[Dict]:
+        rows = []
+        for chunk in _chunks(provider_ids, LOOKUP_CHUNK_SIZE):
+            response = self.supabase.table("unified_transactions").select(
+                "id, platform_id, booking_id, source_id, currency, payment_provider_id, processed_at"
+            ).eq("transaction_type", transaction_type).in_("payment_provider_id", chunk).execute()
+            rows.extend(response.data)
+        return rows
+    
+    def _set_status(self, transaction_ids: List[str], status: str):
+        for chunk in _chunks(transaction_ids, LOOKUP_CHUNK_SIZE):
+            self.supabase.table("unified_transactions").update({"status": status}).in_("id", chunk).execute()
+
+stripe_event_consumer = StripeEventConsumer(interval=settings.STRIPE_EVENT_POLL_INTERVAL)
@@ -1,13 +1,82 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Iterable, Set, Tuple
 from datetime import datetime
+import hashlib
+import json
+import time
 from app.services.host_platform import HostPlatformClient
 from app.services.agent_platform import AgentPlatformClient
 from app.services.customer_platform import CustomerPlatformClient
+from app.services.identity_resolver import identity_resolver
+from app.services.ledger_service import ledger_service
+from app.services.analytics_service import analytics_service
+from app.services.event_bus import event_bus
+from app.services.notification_engine import notification_engine
 from app.core.supabase import get_supabase
 from app.core.redis import redis_client
-from app.utils.logger import logger
+from app.core.http_cache import touch
+from app.core.metrics import record_sync, record_sync_writes, record_sync_removed
+from app.utils.projection import PAYLOAD_TABLES
+from app.utils.logger import get_logger
 from app.config import settings
 
+logger = get_logger(__name__)
+
+# Keeps in.(...) filters well under URL length limits
+LOOKUP_CHUNK_SIZE = 200
+
+# Local IDs read per page while reconciling
+RECONCILE_PAGE_SIZE = 1000
+
+# Entity -> (unified table, platform ID column)
+ENTITY_TABLES = {
+    "users": ("unified_users", "platform_user_id"),
+    "properties": ("unified_properties", "platform_property_id"),
+    "bookings": ("unified_bookings", "platform_booking_id")
+}
+
+# Upstream fields kept in platform_specific_data, per platform and entity. Columns already
+# mapped onto the unified row, images and free-text notes stay on the source platform.
+PAYLOAD_FIELDS: Dict[str, Dict[str, tuple]] = {
+    "host_dashboard": {
+        "users": ("first_name", "last_name", "stripe_account_id", "created_at", "updated_at"),
+        "properties": (
+            "description", "bedrooms", "bathrooms", "max_guests", "base_price_per_night", "address",
+            "amenities", "rating", "review_count", "created_at", "updated_at"
+        ),
+        "bookings": (
+            "nights", "guests", "total_amount", "booking_source", "commission_rate", "platform_fee_amount",
+            "host_payout_amount", "host_payout_status", "refund_amount", "stripe_payment_intent_id",
+            "created_at", "updated_at"
+        )
+    },
+    "agent_dashboard": {
+        "users": (
+            "first_name", "last_name", "company_name", "trade_license_number", "rera_certificate_number",
+            "created_at", "updated_at"
+        ),
+        "properties": (
+            "description", "community", "sub_community", "building_name", "bedrooms", "bathrooms",
+            "size_sqft", "furnished", "amenities", "created_at", "updated_at"
+        )
+    },
+    "customer_platform": {
+        "users": ("first_name", "last_name", "created_at", "updated_at"),
+        "bookings": (
+            "nights", "guests", "total_amount", "booking_source", "platform_fee_amount", "refund_amount",
+            "stripe_payment_intent_id", "created_at", "updated_at"
+        )
+    }
+}
+
+def _content_hash(row: Dict[str, Any]) -> str:
+    """Stable hash of a mapped row (including its source payload)"""
+    payload = json.dumps(row, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
 class SyncService:
     """Service to synchronize data from all platforms"""
     
@@ -16,6 +85,11 @@ class SyncService:
         self.host_client: Optional[HostPlatformClient] = None
         self.agent_client: Optional[AgentPlatformClient] = None
         self.customer_client: Optional[CustomerPlatformClient] = None
+        self.platform_names: Dict[str, str] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+        # Upstream IDs seen this run, and listings that could not be read completely
+        self.seen: Dict[Tuple[str, str], Set[str]] = {}
+        self.incomplete: Set[Tuple[str, str]] = set()
     
     async def initialize_clients(self):
         """Initialize platform clients"""
@@ -23,6 +97,7 @@ class SyncService:
         platforms_response = self.supabase.table("platforms").select("*").execute()
         
         for platform in platforms_response.data:
+            self.platform_names[platform["id"]] = platform["name"]
             if platform["name"] == "host_dashboard":
                 self.host_client = HostPlatformClient(
                     platform["api_base_url"],
@@ -44,14 +119,38 @@ class SyncService:
         logger.info("Starting full platform sync...")
         
         await self.initialize_clients()
+        self.stats = {}
+        self.seen = {}
+        self.incomplete = set()
         
         try:
             await self.sync_host_platform()
             await self.sync_agent_platform()
             await self.sync_customer_platform()
-            logger.info("Full platform sync completed successfully")
+            if settings.SYNC_RECONCILE:
+                self.reconcile_removed()
+            try:
+                ledger_service.refresh_rollups()
+            except Exception as e:
+                logger.error("Failed to refresh finance rollups: %s", e)
+            try:
+                analytics_service.refresh_rollups()
+            except Exception as e:
+                logger.error("Failed to refresh analytics rollups: %s", e)
+            try:
+                notification_engine.sweep_stale_verifications()
+            except Exception as e:
+                logger.error("Failed to sweep stale verifications: %s", e)
+            logger.info("Full platform sync completed successfully", extra={"rows": self.stats})
+            # The queue is rewritten and the ledger and analytics rolled up on every run
+            await touch("verifications", "transactions", "analytics", *[
+                entity for entity, counts in self.stats.items() if counts["written"] or counts.get("removed")
+            ])
+            await event_bus.publish("sync.completed", rows=self.stats)
+            return self.stats
         except Exception as e:
-            logger.error(f"Platform sync failed: {e}")
+            logger.error("Platform sync failed: %s", e)
+            notification_engine.sync_failed(str(e))
             raise
     
     async def sync_host_platform(self):
@@ -68,32 +167,33 @@ class SyncService:
         
         # Sync users
         try:
-            users_data = await self.host_client.get_host_users()
+            users_data = await self.host_client.get_host_users(fresh=True)
             await self._sync_users(platform_id, users_data.get("data", []), "host")
         except Exception as e:
-            logger.error(f"Failed to sync host users: {e}")
+            logger.error("Failed to sync host users: %s", e)
+            self.incomplete.add((platform_id, "users"))
         
         # Sync properties
-        try:
-            page = 1
-            while True:
-                properties_data = await self.host_client.get_all_properties(page=page, limit=100)
-                properties = properties_data.get("data", [])
-                
-                if not properties:
-                    break
-                
-                await self._sync_properties(platform_id, properties, "short_term")
-                page += 1
-        except Exception as e:
-            logger.error(f"Failed to sync host properties: {e}")
+        if not await self._sync_paginated(
+            "host properties",
+            lambda page: self.host_client.get_all_properties(page=page, limit=100, fresh=True),
+            lambda properties: self._sync_properties(platform_id, properties, "short_term")
+        ):
+            self.incomplete.add((platform_id, "properties"))
         
         # Sync bookings
+        if not await self._sync_paginated(
+            "host bookings",
+            lambda page: self.host_client.get_all_bookings(page=page, limit=100, fresh=True),
+            lambda bookings: self._sync_bookings(platform_id, bookings)
+        ):
+            self.incomplete.add((platform_id, "bookings"))
+        
+        # Ledger payouts; booking payments and refunds are ledgered as bookings are written
         try:
-            bookings_data = await self.host_client.get_all_bookings()
-            await self._sync_bookings(platform_id, bookings_data.get("data", []))
+            await ledger_service.ingest_payouts(platform_id)
         except Exception as e:
-            logger.error(f"Failed to sync host bookings: {e}")
+            logger.error("Failed to ingest host payouts: %s", e)
         
         logger.info("Host platform sync completed")
     
@@ -111,31 +211,25 @@ class SyncService:
         
         # Sync agents
         try:
-            agents_data = await self.agent_client.get_all_agents()
+            agents_data = await self.agent_client.get_all_agents(fresh=True)
             await self._sync_users(platform_id, agents_data.get("data", []), "agent")
         except Exception as e:
-            logger.error(f"Failed to sync agents: {e}")
+            logger.error("Failed to sync agents: %s", e)
+            self.incomplete.add((platform_id, "users"))
         
         # Sync properties
-        try:
-            page = 1
-            while True:
-                properties_data = await self.agent_client.get_all_properties(page=page, limit=100)
-                properties = properties_data.get("data", [])
-                
-                if not properties:
-                    break
-                
-                await self._sync_properties(platform_id, properties, "long_term")
-                page += 1
-        except Exception as e:
-            logger.error(f"Failed to sync agent properties: {e}")
+        if not await self._sync_paginated(
+            "agent properties",
+            lambda page: self.agent_client.get_all_properties(page=page, limit=100, fresh=True),
+            lambda properties: self._sync_properties(platform_id, properties, "long_term")
+        ):
+            self.incomplete.add((platform_id, "properties"))
         
         # Sync verification queue
         try:
             await self.sync_verification_queue()
         except Exception as e:
-            logger.error(f"Failed to sync verification queue: {e}")
+            logger.error("Failed to sync verification queue: %s", e)
         
         logger.info("Agent platform sync completed")
     
@@ -153,17 +247,19 @@ class SyncService:
         
         # Sync customers
         try:
-            users_data = await self.customer_client.get_all_users()
+            users_data = await self.customer_client.get_all_users(fresh=True)
             await self._sync_users(platform_id, users_data.get("data", []), "customer")
         except Exception as e:
-            logger.error(f"Failed to sync customers: {e}")
+            logger.error("Failed to sync customers: %s", e)
+            self.incomplete.add((platform_id, "users"))
         
         # Sync bookings
-        try:
-            bookings_data = await self.customer_client.get_all_bookings()
-            await self._sync_bookings(platform_id, bookings_data.get("data", []))
-        except Exception as e:
-            logger.error(f"Failed to sync customer bookings: {e}")
+        if not await self._sync_paginated(
+            "customer bookings",
+            lambda page: self.customer_client.get_all_bookings(page=page, limit=100, fresh=True),
+            lambda bookings: self._sync_bookings(platform_id, bookings)
+        ):
+            self.incomplete.add((platform_id, "bookings"))
         
         logger.info("Customer platform sync completed")
     
@@ -179,82 +275,123 @@ class SyncService:
         platform_id = platform_response.data["id"]
         
         # Get pending verifications
-        pending_response = await self.agent_client.get_pending_verifications()
+        pending_response = await self.agent_client.get_pending_verifications(fresh=True)
         pending_verifications = pending_response.get("data", [])
         
-        for verification in pending_verifications:
+        # Last occurrence wins; ON CONFLICT cannot touch the same row twice in one statement
+        by_user = {v["id"]: v for v in pending_verifications if v.get("id")}
+        verifications = list(by_user.values())
+        self._mark_seen(platform_id, "users", verifications)
+        
+        new_ids: List[str] = []
+        for start in range(0, len(verifications), settings.SYNC_BATCH_SIZE):
+            batch = verifications[start:start + settings.SYNC_BATCH_SIZE]
             try:
-                # Get or create unified user
-                user_id = await self._get_or_create_unified_user(
-                    platform_id,
-                    verification["id"],
-                    verification.get("email", ""),
-                    "agent",
+                # Agents synced earlier in this run keep their full profile; only unknown ones are created here
+                user_ids = self._unified_user_ids(platform_id, [v["id"] for v in batch])
+                user_ids.update(self._upsert_unified_users(platform_id, "agent", [
                     {
-                        "first_name": verification.get("first_name"),
-                        "last_name": verification.get("last_name"),
-                        "phone": verification.get("phone"),
-                        "verification_status": verification.get("verification_status")
+                        "id": v["id"],
+                        "email": v.get("email", ""),
+                        "first_name": v.get("first_name"),
+                        "last_name": v.get("last_name"),
+                        "phone": v.get("phone"),
+                        "verification_status": v.get("verification_status")
                     }
-                )
-                
-                # Check if already in queue
-                existing = self.supabase.table("verification_queue").select("*").eq(
-                    "platform_id", platform_id
-                ).eq(
-                    "platform_user_id", verification["id"]
-                ).execute()
+                    for v in batch
+                    if v["id"] not in user_ids
+                ]))
                 
-                if not existing.data:
-                    # Add to queue
-                    self.supabase.table("verification_queue").insert({
+                queued = self._lookup_ids("verification_queue", "platform_user_id", platform_id, [v["id"] for v in batch])
+                now = datetime.utcnow().isoformat()
+                rows = [
+                    {
                         "platform_id": platform_id,
-                        "user_id": user_id,
-                        "platform_user_id": verification["id"],
+                        "user_id": user_ids.get(v["id"]),
+                        "platform_user_id": v["id"],
                         "verification_type": "agent_registration",
-                        "status": "pending",
-                        "documents": verification.get("documents", {}),
-                        "created_at": verification.get("created_at", datetime.utcnow().isoformat())
-                    }).execute()
-                else:
-                    # Update existing
-                    self.supabase.table("verification_queue").update({
-                        "status": self._map_verification_status(verification.get("verification_status")),
-                        "documents": verification.get("documents", {}),
-                        "updated_at": datetime.utcnow().isoformat()
-                    }).eq("id", existing.data[0]["id"]).execute()
+                        "status": self._map_verification_status(v.get("verification_status")),
+                        "documents": v.get("documents", {}),
+                        "updated_at": now
+                    }
+                    for v in batch
+                ]
+                # created_at is the queue age the list order and the stale sweep go by: set once on
+                # entry (upstream time, else now) and left alone afterwards. Rows in one upsert need the
+                # same columns, so new and queued ones go in separate statements.
+                new_rows = []
+                entering = [
+                    {**row, "created_at": v.get("created_at") or now}
+                    for v, row in zip(batch, rows) if v["id"] not in queued
+                ]
+                if entering:
+                    new_rows = self.supabase.table("verification_queue").upsert(
+                        entering, on_conflict="platform_id,platform_user_id"
+                    ).execute().data
+                known = [row for row in rows if row["platform_user_id"] in queued]
+                if known:
+                    self.supabase.table("verification_queue").upsert(known, on_conflict="platform_id,platform_user_id").execute()
+                new_ids.extend(row["id"] for row in new_rows)
+                # The sweep only looks past its watermark, so one that arrives already overdue is caught here
+                notification_engine.stale_verifications(new_rows)
             
             except Exception as e:
-                logger.error(f"Failed to sync verification for user {verification.get('id')}: {e}")
+                logger.error("Failed to sync verification batch of %s: %s", len(batch), e)
         
-        logger.info(f"Synced {len(pending_verifications)} pending verifications")
+        if new_ids:
+            await event_bus.publish("verification.new", ids=new_ids, delta={"pending": len(new_ids)})
+        logger.info("Synced %s pending verifications", len(pending_verifications))
     
-    async def _sync_users(self, platform_id: str, users: List[Dict], user_type: str):
-        """Sync users to unified_users table"""
-        for user in users:
+    async def _sync_paginated(
+        self,
+        label: str,
+        fetch_page: Callable[[int], Awaitable[Dict[str, Any]]],
+        handle_page: Callable[[List[Dict]], Awaitable[None]]
+    ) -> bool:
+        """Walk an upstream listing page by page; False if it stopped early or a page failed to store"""
+        page = 1
+        complete = True
+        while True:
+            # Transient upstream errors are retried inside the platform client
             try:
-                await self._get_or_create_unified_user(
-                    platform_id,
-                    user["id"],
-                    user.get("email", ""),
-                    user_type,
-                    user
-                )
+                page_data = await fetch_page(page)
+            except Exception as e:
+                logger.error("Failed to fetch %s page %s, stopping pagination: %s", label, page, e)
+                return False
+            
+            items = page_data.get("data", [])
+            if not items:
+                return complete
+            
+            # A page that fails to store (a lookup, a write hook, a payload write) costs only that page;
+            # the walk goes on and the listing is reported incomplete so reconciliation skips it
+            try:
+                await handle_page(items)
             except Exception as e:
-                logger.error(f"Failed to sync user {user.get('id')}: {e}")
+                logger.error("Failed to store %s page %s, continuing: %s", label, page, e)
+                complete = False
+            page += 1
+    
+    async def _sync_users(self, platform_id: str, users: List[Dict], user_type: str):
+        """Sync users to unified_users table"""
+        started = time.monotonic()
+        self._mark_seen(platform_id, "users", users)
+        self._upsert_unified_users(platform_id, user_type, [user for user in users if user.get("id")])
+        self._record_batch(platform_id, "users", len(users), started)
     
     async def _sync_properties(self, platform_id: str, properties: List[Dict], listing_type: str):
         """Sync properties to unified_properties table"""
+        started = time.monotonic()
+        self._mark_seen(platform_id, "properties", properties)
+        owner_ids = self._unified_user_ids(platform_id, [prop.get("user_id") for prop in properties])
+        
+        rows = []
         for prop in properties:
             try:
-                # Get owner user ID
-                owner_id = await self._get_unified_user_id(platform_id, prop.get("user_id"))
-                
-                # Upsert property
-                property_data = {
+                rows.append({
                     "platform_id": platform_id,
                     "platform_property_id": prop["id"],
-                    "owner_user_id": owner_id,
+                    "owner_user_id": owner_ids.get(prop.get("user_id")),
                     "title": prop.get("title", ""),
                     "property_type": prop.get("property_type", ""),
                     "listing_type": listing_type,
@@ -263,114 +400,280 @@ class SyncService:
                     "price_currency": prop.get("price_currency", "AED"),
                     "status": prop.get("status", "active"),
                     "is_featured": prop.get("is_featured", False),
-                    "platform_specific_data": prop,
-                    "last_synced_at": datetime.utcnow().isoformat()
-                }
-                
-                self.supabase.table("unified_properties").upsert(
-                    property_data,
-                    on_conflict="platform_id,platform_property_id"
-                ).execute()
-                
+                    "platform_created_at": prop.get("created_at") or None,
+                    "platform_specific_data": self._trim_payload(platform_id, "properties", prop)
+                })
             except Exception as e:
-                logger.error(f"Failed to sync property {prop.get('id')}: {e}")
+                logger.error("Failed to sync property %s: %s", prop.get("id"), e, extra={"sample_key": "sync_row_error"})
+        
+        self._write_changed(
+            platform_id, "properties", "unified_properties", "platform_property_id", rows,
+            before_write=lambda changed: analytics_service.mark_created(
+                platform_id, "unified_properties", "platform_property_id", changed, ("city", "price_currency")
+            )
+        )
+        self._record_batch(platform_id, "properties", len(properties), started)
     
     async def _sync_bookings(self, platform_id: str, bookings: List[Dict]):
         """Sync bookings to unified_bookings table"""
+        started = time.monotonic()
+        self._mark_seen(platform_id, "bookings", bookings)
+        property_ids = self._unified_property_ids(platform_id, [booking.get("property_id") for booking in bookings])
+        user_ids = self._unified_user_ids(
+            platform_id,
+            [booking.get("guest_id") for booking in bookings] + [booking.get("host_id") for booking in bookings]
+        )
+        
+        rows = []
         for booking in bookings:
             try:
-                # Get property ID
-                property_response = self.supabase.table("unified_properties").select("id").eq(
-                    "platform_id", platform_id
-                ).eq(
-                    "platform_property_id", booking.get("property_id")
-                ).execute()
-                
-                if not property_response.data:
-                    logger.warning(f"Property not found for booking {booking.get('id')}")
+                property_id = property_ids.get(booking.get("property_id"))
+                if not property_id:
+                    logger.warning("Property not found for booking %s", booking.get("id"), extra={"sample_key": "sync_missing_property"})
                     continue
                 
-                property_id = property_response.data[0]["id"]
-                
-                # Get guest and host user IDs
-                guest_id = await self._get_unified_user_id(platform_id, booking.get("guest_id"))
-                host_id = await self._get_unified_user_id(platform_id, booking.get("host_id"))
-                
-                # Upsert booking
-                booking_data = {
+                rows.append({
                     "platform_id": platform_id,
                     "platform_booking_id": booking["id"],
                     "property_id": property_id,
-                    "guest_user_id": guest_id,
-                    "host_user_id": host_id,
+                    "guest_user_id": user_ids.get(booking.get("guest_id")),
+                    "host_user_id": user_ids.get(booking.get("host_id")),
                     "check_in": booking.get("check_in"),
                     "check_out": booking.get("check_out"),
                     "total_price": float(booking.get("total_price", 0)),
                     "status": booking.get("status", "pending"),
                     "payment_status": booking.get("payment_status", "pending"),
-                    "platform_specific_data": booking,
-                    "last_synced_at": datetime.utcnow().isoformat()
-                }
-                
-                self.supabase.table("unified_bookings").upsert(
-                    booking_data,
-                    on_conflict="platform_id,platform_booking_id"
-                ).execute()
-                
+                    "platform_specific_data": self._trim_payload(platform_id, "bookings", booking)
+                })
             except Exception as e:
-                logger.error(f"Failed to sync booking {booking.get('id')}: {e}")
+                logger.error("Failed to sync booking %s: %s", booking.get("id"), e, extra={"sample_key": "sync_row_error"})
+        
+        self._write_changed(
+            platform_id, "bookings", "unified_bookings", "platform_booking_id", rows,
+            before_write=lambda changed: analytics_service.mark_bookings(platform_id, changed),
+            after_write=lambda written: ledger_service.record_bookings(platform_id, bookings, written)
+        )
+        self._record_batch(platform_id, "bookings", len(bookings), started)
     
-    async def _get_or_create_unified_user(
+    def _write_changed(
         self,
         platform_id: str,
-        platform_user_id: str,
-        email: str,
-        user_type: str,
-        platform_data: Dict
-    ) -> str:
-        """Get or create unified user record"""
-        # Check if user exists
-        existing = self.supabase.table("unified_users").select("id").eq(
-            "platform_id", platform_id
-        ).eq(
-            "platform_user_id", platform_user_id
-        ).execute()
-        
-        if existing.data:
-            return existing.data[0]["id"]
-        
-        # Create new user
-        user_data = {
-            "email": email,
-            "platform_id": platform_id,
-            "platform_user_id": platform_user_id,
-            "user_type": user_type,
-            "full_name": f"{platform_data.get('first_name', '')} {platform_data.get('last_name', '')}".strip() or platform_data.get('name', ''),
-            "phone": platform_data.get("phone", ""),
-            "verification_status": platform_data.get("verification_status", ""),
-            "account_status": "active",
-            "platform_specific_data": platform_data,
-            "last_synced_at": datetime.utcnow().isoformat()
-        }
+        entity: str,
+        table: str,
+        key: str,
+        rows: List[Dict],
+        before_write: Optional[Callable[[List[Dict]], None]] = None,
+        after_write: Optional[Callable[[Dict[str, str]], None]] = None
+    ) -> Dict[str, str]:
+        """Upsert only rows whose content hash changed; returns platform key -> unified ID for all rows"""
+        # Last occurrence wins; ON CONFLICT cannot touch the same row twice in one statement
+        rows = list({row[key]: row for row in rows}.values())
+        if not rows:
+            return {}
+        
+        for row in rows:
+            row["content_hash"] = _content_hash(row)
+        
+        stored: Dict[str, Dict] = {}
+        for chunk in _chunks([row[key] for row in rows], LOOKUP_CHUNK_SIZE):
+            response = self.supabase.table(table).select(f"id, {key}, content_hash, removed_at").eq(
+                "platform_id", platform_id
+            ).in_(key, chunk).execute()
+            stored.update({item[key]: item for item in response.data})
+        
+        ids = {k: item["id"] for k, item in stored.items()}
+        # Rows marked removed that are back upstream are rewritten even when unchanged
+        changed = [
+            row for row in rows
+            if stored.get(row[key], {}).get("content_hash") != row["content_hash"]
+            or stored[row[key]].get("removed_at")
+        ]
+        
+        # The hash covers the payload, but it is stored in the side table
+        payloads = {row[key]: row.pop("platform_specific_data", None) for row in changed}
+        now = datetime.utcnow().isoformat()
+        for row in changed:
+            row["last_synced_at"] = now
+            row["removed_at"] = None
+        if changed and before_write:
+            before_write(changed)
+        
+        written = self._upsert_rows(table, key, changed)
+        ids.update(written)
+        failed = self._write_payloads(table, [
+            {"id": row_id, "platform_specific_data": payloads[k], "updated_at": now}
+            for k, row_id in written.items()
+        ])
+        self._clear_hashes(table, failed)
+        if written and after_write:
+            after_write(written)
+        
+        skipped = len(rows) - len(changed)
+        counts = self.stats.setdefault(entity, {"written": 0, "skipped": 0})
+        counts["written"] += len(written)
+        counts["skipped"] += skipped
+        record_sync_writes(self.platform_names.get(platform_id, platform_id), entity, len(written), skipped)
+        return ids
+    
+    def _upsert_rows(self, table: str, key: str, rows: List[Dict]) -> Dict[str, str]:
+        """Bulk upsert, retrying row by row when a batch fails so one bad row is isolated"""
+        on_conflict = f"platform_id,{key}"
+        written: Dict[str, str] = {}
+        
+        for batch in _chunks(rows, settings.SYNC_BATCH_SIZE):
+            try:
+                response = self.supabase.table(table).upsert(batch, on_conflict=on_conflict).execute()
+                written.update({item[key]: item["id"] for item in response.data})
+                continue
+            except Exception as e:
+                logger.warning("Bulk upsert of %s rows into %s failed, retrying row by row: %s", len(batch), table, e)
+            
+            for row in batch:
+                try:
+                    response = self.supabase.table(table).upsert(row, on_conflict=on_conflict).execute()
+                    written.update({item[key]: item["id"] for item in response.data})
+                except Exception as e:
+                    logger.error("Failed to sync %s row %s: %s", table, row[key], e, extra={"sample_key": "sync_row_error"})
         
-        response = self.supabase.table("unified_users").insert(user_data).execute()
-        return response.data[0]["id"]
+        return written
+    
+    def reconcile_removed(self):
+        """Mark unified rows whose upstream record no longer exists as removed"""
+        # Listings are read fresh: a platform that is down fails its listing and lands in incomplete
+        # rather than being diffed against cached or stale pages
+        for (platform_id, entity), seen in self.seen.items():
+            platform = self.platform_names.get(platform_id, platform_id)
+            if (platform_id, entity) in self.incomplete:
+                logger.warning("Skipping %s reconciliation for %s: upstream listing incomplete", entity, platform)
+                continue
+            try:
+                self._reconcile(platform_id, entity, seen)
+            except Exception as e:
+                logger.error("Failed to reconcile %s for %s: %s", entity, platform, e)
     
-    async def _get_unified_user_id(self, platform_id: str, platform_user_id: str) -> Optional[str]:
-        """Get unified user ID from platform user ID"""
-        if not platform_user_id:
-            return None
+    def _reconcile(self, platform_id: str, entity: str, seen: Set[str]):
+        """Diff live local IDs (streamed in key order) against the upstream set and flag the rest"""
+        table, key = ENTITY_TABLES[entity]
+        platform = self.platform_names.get(platform_id, platform_id)
         
-        response = self.supabase.table("unified_users").select("id").eq(
-            "platform_id", platform_id
-        ).eq(
-            "platform_user_id", platform_user_id
-        ).execute()
+        missing: List[str] = []
+        local = 0
+        last_key = None
+        while True:
+            query = self.supabase.table(table).select(key).eq("platform_id", platform_id).is_("removed_at", "null")
+            if last_key:
+                query = query.gt(key, last_key)
+            page = query.order(key).limit(RECONCILE_PAGE_SIZE).execute().data
+            
+            local += len(page)
+            missing.extend(row[key] for row in page if row[key] not in seen)
+            if len(page) < RECONCILE_PAGE_SIZE:
+                break
+            last_key = page[-1][key]
         
-        if response.data:
-            return response.data[0]["id"]
+        # A listing that suddenly lost most of its rows is more likely an upstream fault than mass deletion
+        if missing and len(missing) > local * settings.SYNC_RECONCILE_MAX_FRACTION:
+            logger.warning(
+                "Not marking %s of %s %s removed for %s: above SYNC_RECONCILE_MAX_FRACTION=%s",
+                len(missing), local, entity, platform, settings.SYNC_RECONCILE_MAX_FRACTION
+            )
+            return
         
-        return None
+        now = datetime.utcnow().isoformat()
+        for chunk in _chunks(missing, LOOKUP_CHUNK_SIZE):
+            removed = self.supabase.table(table).update({"removed_at": now}).eq(
+                "platform_id", platform_id
+            ).in_(key, chunk).execute().data
+            if entity == "bookings":
+                analytics_service.mark_dirty(row.get("check_in") for row in removed)
+        
+        counts = self.stats.setdefault(entity, {"written": 0, "skipped": 0})
+        counts["removed"] = counts.get("removed", 0) + len(missing)
+        record_sync_removed(platform, entity, len(missing))
+        if missing:
+            logger.info("Marked %s %s removed for %s", len(missing), entity, platform)
+    
+    def _mark_seen(self, platform_id: str, entity: str, items: List[Dict]):
+        self.seen.setdefault((platform_id, entity), set()).update(
+            str(item["id"]) for item in items if item.get("id")
+        )
+    
+    def _write_payloads(self, table: str, rows: List[Dict]) -> List[str]:
+        """Store upstream payloads of written rows in the table's side table; returns IDs that failed"""
+        failed: List[str] = []
+        for batch in _chunks(rows, settings.SYNC_BATCH_SIZE):
+            try:
+                self.supabase.table(PAYLOAD_TABLES[table]).upsert(batch, on_conflict="id").execute()
+            except Exception as e:
+                logger.error("Failed to store %s payloads for %s: %s", len(batch), table, e)
+                failed.extend(row["id"] for row in batch)
+        return failed
+    
+    def _clear_hashes(self, table: str, ids: List[str]):
+        """Forget the stored hash of rows whose payload was not written, so the next sync rewrites them"""
+        # The payload side table references the row, so the row has to be written first
+        for chunk in _chunks(ids, LOOKUP_CHUNK_SIZE):
+            try:
+                self.supabase.table(table).update({"content_hash": None}).in_("id", chunk).execute()
+            except Exception as e:
+                logger.error("Failed to clear %s content hashes on %s: %s", len(chunk), table, e)
+    
+    def _trim_payload(self, platform_id: str, entity: str, payload: Dict) -> Dict:
+        """Keep only the whitelisted upstream fields for this platform and entity"""
+        fields = PAYLOAD_FIELDS.get(self.platform_names.get(platform_id), {}).get(entity)
+        if fields is None:
+            return payload
+        return {field: payload[field] for field in fields if field in payload}
+    
+    def _record_batch(self, platform_id: str, entity: str, rows: int, started: float):
+        """Export sync throughput for a processed batch"""
+        record_sync(
+            self.platform_names.get(platform_id, platform_id),
+            entity,
+            rows,
+            time.monotonic() - started
+        )
+    
+    def _upsert_unified_users(self, platform_id: str, user_type: str, users: List[Dict]) -> Dict[str, str]:
+        """Insert or refresh unified users; returns platform user ID -> unified ID"""
+        rows = [
+            {
+                "email": user.get("email", ""),
+                "platform_id": platform_id,
+                "platform_user_id": user["id"],
+                "user_type": user_type,
+                "full_name": f"{user.get('first_name') or ''} {user.get('last_name') or ''}".strip() or user.get("name", ""),
+                "phone": user.get("phone") or "",
+                "verification_status": user.get("verification_status") or "",
+                "platform_created_at": user.get("created_at") or None,
+                "platform_specific_data": self._trim_payload(platform_id, "users", user)
+            }
+            for user in users
+        ]
+        def before_write(changed: List[Dict]):
+            identity_resolver.assign(platform_id, changed)
+            analytics_service.mark_created(platform_id, "unified_users", "platform_user_id", changed)
+        
+        # account_status is left out so a refresh never lifts a suspension
+        return self._write_changed(platform_id, "users", "unified_users", "platform_user_id", rows, before_write=before_write)
+    
+    def _unified_user_ids(self, platform_id: str, platform_user_ids: List[Optional[str]]) -> Dict[str, str]:
+        """Map platform user IDs to unified user IDs in a few queries"""
+        return self._lookup_ids("unified_users", "platform_user_id", platform_id, platform_user_ids)
+    
+    def _unified_property_ids(self, platform_id: str, platform_property_ids: List[Optional[str]]) -> Dict[str, str]:
+        """Map platform property IDs to unified property IDs in a few queries"""
+        return self._lookup_ids("unified_properties", "platform_property_id", platform_id, platform_property_ids)
+    
+    def _lookup_ids(self, table: str, key: str, platform_id: str, keys: List[Optional[str]]) -> Dict[str, str]:
+        unique_keys = list({k for k in keys if k})
+        ids: Dict[str, str] = {}
+        for chunk in _chunks(unique_keys, LOOKUP_CHUNK_SIZE):
+            response = self.supabase.table(table).select(f"id, {key}").eq(
+                "platform_id", platform_id
+            ).in_(key, chunk).execute()
+            ids.update({item[key]: item["id"] for item in response.data})
+        return ids
     
     def _map_verification_status(self, platform_status: str) -> str:
         """Map platform verification status to unified status"""
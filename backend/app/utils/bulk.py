@@ -0,0 +1,38 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from app.models.schemas import BulkActionResponse, BulkItemResult
+
+# Keeps in.(...) filters well under URL length limits
+BULK_CHUNK_SIZE = 200
+
+def unique(ids: Iterable[str]) -> List[str]:
+    """Drop repeated ids, keeping request order"""
+    return list(dict.fromkeys(ids))
+
+def chunks(items: List, size: int = BULK_CHUNK_SIZE) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+async def fan_out(
+    keys: List[str],
+    call: Callable[[str], Awaitable[Any]],
+    concurrency: int
+) -> Dict[str, Optional[str]]:
+    """Run call for every key with at most `concurrency` in flight; returns key -> error (None on success)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def run(key: str) -> Optional[str]:
+        async with semaphore:
+            try:
+                await call(key)
+                return None
+            except Exception as e:
+                return str(e) or type(e).__name__
+    
+    return dict(zip(keys, await asyncio.gather(*[run(key) for key in keys])))
+
+def bulk_report(ids: List[str], errors: Dict[str, Optional[str]]) -> BulkActionResponse:
+    """Per-item outcome in request order; ids without an error succeeded"""
+    results = [BulkItemResult(id=item_id, success=not errors.get(item_id), error=errors.get(item_id)) for item_id in ids]
+    succeeded = sum(result.success for result in results)
+    return BulkActionResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
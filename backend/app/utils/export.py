@@ -0,0 +1,141 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Format -> media type
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+def iter_chunks(build_query: Callable[[], Any], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Walk a table in id order, chunk_size rows per query, so memory stays bounded"""
+    last_id = None
+    while True:
+        query = build_query()
+        if last_id:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(chunk_size).execute().data
+        if rows:
+            yield rows
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1]["id"]
+
+def _scalar(value: Any) -> Any:
+    """Nested JSON values are written as JSON text so every format has flat columns"""
+    return json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+
+def encode_csv(chunks: Iterable[List[Dict]], columns: List[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in chunks:
+        writer.writerows([_scalar(row.get(column)) for column in columns] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+def encode_ndjson(chunks: Iterable[List[Dict]], columns: List[str]) -> Iterator[bytes]:
+    for rows in chunks:
+        yield "".join(
+            json.dumps({column: row.get(column) for column in columns}, default=str) + "\n"
+            for row in rows
+        ).encode()
+
+class _Sink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain"""
+    
+    def __init__(self):
+        self.parts: List[bytes] = []
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+    
+    def drain(self) -> bytes:
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+def _date(value: Any) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+def _float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+def _text(value: Any) -> Optional[str]:
+    value = _scalar(value)
+    return None if value is None else str(value)
+
+def parquet_schema(columns: List[str], column_types: Dict[str, str]):
+    """Arrow schema from the columns' SQL types, so every chunk is written with the same types"""
+    import pyarrow as pa
+    
+    types = {
+        "numeric": pa.float64(),
+        "boolean": pa.bool_(),
+        "date": pa.date32(),
+        "timestamptz": pa.timestamp("us", tz="UTC")
+    }
+    return pa.schema([pa.field(column, types.get(column_types.get(column), pa.string())) for column in columns])
+
+# SQL type -> conversion of the PostgREST JSON value to what the arrow type accepts
+PARQUET_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "numeric": _float,
+    "boolean": lambda value: None if value is None else bool(value),
+    "date": _date,
+    "timestamptz": _timestamp
+}
+
+def encode_parquet(
+    chunks: Iterable[List[Dict]],
+    columns: List[str],
+    column_types: Optional[Dict[str, str]] = None
+) -> Iterator[bytes]:
+    """One zstd-compressed row group per chunk, typed by column_types (SQL type per column; text otherwise)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    column_types = column_types or {}
+    schema = parquet_schema(columns, column_types)
+    converters = {column: PARQUET_CONVERTERS.get(column_types.get(column), _text) for column in columns}
+    
+    sink = _Sink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    for rows in chunks:
+        data = {column: [converters[column](row.get(column)) for row in rows] for column in columns}
+        writer.write_table(pa.Table.from_pydict(data, schema=schema))
+        yield sink.drain()
+    
+    writer.close()
+    yield sink.drain()
+
+ENCODERS = {
+    "csv": encode_csv,
+    "ndjson": encode_ndjson,
+    "parquet": encode_parquet
+}
+
+def gzip_stream(parts: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for part in parts:
+        compressed = compressor.compress(part)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
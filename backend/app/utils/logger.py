@@ -1,26 +1,191 @@
+import atexit
+import json
 import logging
+import queue
 import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+from opentelemetry import trace
 from app.config import settings
 
+ROOT_LOGGER = "krib_superadmin"
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_listener: Optional[QueueListener] = None
+
+# Attributes every LogRecord has; anything else was passed via `extra`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "sample_key"}
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, with request and trace correlation"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        if getattr(record, "trace_id", None):
+            entry["trace_id"] = record.trace_id
+        
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key != "trace_id":
+                entry[key] = value
+        
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        
+        return json.dumps(entry, default=str)
+
+class ContextFilter(logging.Filter):
+    """Attach the request id and trace id of the current context"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        
+        span_context = trace.get_current_span().get_span_context()
+        if span_context.is_valid:
+            record.trace_id = format(span_context.trace_id, "032x")
+        
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keep 1 in `rate` records that carry extra={"sample_key": ...}"""
+    
+    def __init__(self, rate: int):
+        super().__init__()
+        self.rate = max(1, rate)
+        self.counters: Dict[str, int] = {}
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "sample_key", None)
+        if key is None:
+            return True
+        
+        count = self.counters.get(key, 0)
+        self.counters[key] = count + 1
+        if count % self.rate:
+            return False
+        
+        record.sampled = self.rate
+        return True
+
+class DeferredQueueHandler(QueueHandler):
+    """Queue records unformatted so formatting happens on the listener thread"""
+    
+    dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Records stay in-process, so no need to pre-render msg/args for pickling
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Never block the event loop on logging; drop instead
+            DeferredQueueHandler.dropped += 1
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    """Parse LOG_LEVELS such as 'services.sync_service=WARNING,core.redis=ERROR'"""
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
 def setup_logger():
-    """Configure application logger"""
-    logger = logging.getLogger("krib_superadmin")
-    logger.setLevel(logging.DEBUG if settings.ENVIRONMENT == "development" else logging.INFO)
+    """Configure application logger (safe to call more than once)"""
+    global _listener
+    
+    logger = get_logger()
+    if _listener is not None:
+        return logger
+    
+    default_level = settings.LOG_LEVEL or ("DEBUG" if settings.ENVIRONMENT == "development" else "INFO")
+    logger.setLevel(default_level)
+    logger.propagate = False
+    
+    for name, level in _parse_levels(settings.LOG_LEVELS).items():
+        get_logger(name).setLevel(level)
     
-    # Console handler
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(logging.DEBUG if settings.ENVIRONMENT == "development" else logging.INFO)
+    # Console handler, driven from a background thread
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        stream_handler.setFormatter(JSONFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
     
-    # Formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    handler.setFormatter(formatter)
+    queue_handler = DeferredQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATE))
+    queue_handler.addFilter(ContextFilter())
     
-    logger.addHandler(handler)
+    logger.handlers = [queue_handler]
+    
+    _listener = QueueListener(queue_handler.queue, stream_handler, respect_handler_level=False)
+    _listener.start()
+    atexit.register(shutdown_logger)
     
     return logger
 
-logger = setup_logger()
+def shutdown_logger():
+    """Drain queued records and stop the listener thread"""
+    global _listener
+    
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def get_logger(name: Optional[str] = None) -> logging.Logger:
+    """Child logger for a module, e.g. get_logger(__name__); the application logger without a name"""
+    if not name:
+        return logging.getLogger(ROOT_LOGGER)
+    if name.startswith("app."):
+        name = name[len("app."):]
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+class RequestIdMiddleware:
+    """ASGI middleware binding an X-Request-ID to every log line of a request"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request_id = None
+        for key, value in scope["headers"]:
+            if key == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        
+        token = request_id_var.set(request_id)
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
 
+setup_logger()
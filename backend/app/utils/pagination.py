@@ -0,0 +1,38 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+def encode_cursor(row: Dict[str, Any], column: str = "created_at") -> str:
+    """Opaque cursor pointing just past `row` in (column, id) order"""
+    payload = json.dumps([row[column], row["id"]], default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Inverse of encode_cursor; raises ValueError on a malformed cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        # Both end up inside a PostgREST filter string: accept only a timestamp and a UUID,
+        # rendered back from their parsed form
+        return datetime.fromisoformat(str(value)).isoformat(), str(uuid.UUID(str(row_id)))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+def apply_cursor(query, cursor: Optional[str], column: str = "created_at"):
+    """Newest first, continuing after `cursor` (keyset pagination on column, id)"""
+    if cursor:
+        value, row_id = decode_cursor(cursor)
+        query = query.or_(
+            f'{column}.lt."{value}",and({column}.eq."{value}",id.lt."{row_id}")'
+        )
+    return query.order(column, desc=True).order("id", desc=True)
+
+def cursor_page(rows: List[Dict[str, Any]], limit: int, column: str = "created_at") -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Trim the look-ahead row of a limit + 1 fetch and build the next cursor"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1], column)
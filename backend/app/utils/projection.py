@@ -0,0 +1,34 @@
+from typing import Any, Dict
+
+# Typed columns returned by list views; the raw upstream payload lives in the *_payloads side tables
+USER_LIST_COLUMNS = (
+    "id, person_id, email, platform_id, platform_user_id, user_type, full_name, phone, "
+    "verification_status, account_status, last_synced_at, removed_at, created_at, updated_at"
+)
+PROPERTY_LIST_COLUMNS = (
+    "id, platform_id, platform_property_id, owner_user_id, title, property_type, listing_type, "
+    "city, price, price_currency, status, is_featured, last_synced_at, removed_at, created_at"
+)
+BOOKING_LIST_COLUMNS = (
+    "id, platform_id, platform_booking_id, property_id, guest_user_id, host_user_id, "
+    "check_in, check_out, total_price, status, payment_status, last_synced_at, removed_at, created_at"
+)
+TRANSACTION_LIST_COLUMNS = (
+    "id, platform_id, booking_id, source_id, transaction_type, amount_total, amount_platform_fee, "
+    "amount_host_payout, currency, payment_provider, payment_provider_id, status, processed_at, created_at"
+)
+
+# Unified table -> side table holding its platform_specific_data, keyed by the unified row id
+PAYLOAD_TABLES = {
+    "unified_users": "unified_user_payloads",
+    "unified_properties": "unified_property_payloads",
+    "unified_bookings": "unified_booking_payloads"
+}
+
+def attach_payload(supabase, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Load the upstream payload of a single row for a detail view"""
+    response = supabase.table(PAYLOAD_TABLES[table]).select("platform_specific_data").eq(
+        "id", row["id"]
+    ).execute()
+    row["platform_specific_data"] = response.data[0]["platform_specific_data"] if response.data else None
+    return row
@@ -0,0 +1,33 @@
+from functools import lru_cache
+from typing import Any
+import orjson
+from fastapi import Response
+from pydantic import TypeAdapter, ValidationError
+from app.config import settings
+
+class TrustedJSONResponse(Response):
+    """JSON rendered with orjson straight from rows as the database shaped them"""
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        # Numerics come back from PostgREST as JSON already; str covers anything else
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+@lru_cache(maxsize=None)
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+def trusted(content: Any, response: Response, model: Any) -> TrustedJSONResponse:
+    """Send content as is, skipping FastAPI's dump, re-validation and re-serialization against model"""
+    # model documents the shape; checking it on every request would cost more than rendering
+    if settings.RESPONSE_VALIDATION:
+        try:
+            _adapter(model).validate_python(content)
+        except ValidationError as e:
+            # Not a ValueError to the route: a response that breaks its schema is a server error, not a bad request
+            raise RuntimeError(f"Response does not match {model}: {e}") from e
+    
+    trusted_response = TrustedJSONResponse(content)
+    # FastAPI only copies headers set by dependencies (ETag and friends) onto responses it builds itself
+    trusted_response.headers.raw.extend(response.headers.raw)
+    return trusted_response
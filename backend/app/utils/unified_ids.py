@@ -0,0 +1,40 @@
+import uuid
+from typing import Any, Dict, List, Optional
+from app.utils.bulk import chunks
+
+def is_uuid(value: Any) -> bool:
+    try:
+        uuid.UUID(str(value))
+        return True
+    except ValueError:
+        return False
+
+def platform_id_by_name(supabase, name: str) -> Optional[str]:
+    response = supabase.table("platforms").select("id").eq("name", name).execute()
+    return response.data[0]["id"] if response.data else None
+
+def resolve_platform_ids(supabase, table: str, key: str, platform_id: Optional[str], ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Map ids, unified or the platform's own, to {"id": unified id or None, key: platform id}"""
+    # Unified ids of rows on another platform are left out so callers can reject them;
+    # ids found nowhere pass through as platform ids without a unified row
+    resolved: Dict[str, Dict[str, Any]] = {}
+    elsewhere = set()
+    candidates = [item_id for item_id in ids if is_uuid(item_id)]
+    
+    for chunk in chunks(candidates):
+        for row in supabase.table(table).select(f"id, platform_id, {key}").in_("id", chunk).execute().data:
+            if row["platform_id"] == platform_id:
+                resolved[row["id"]] = {"id": row["id"], key: row[key]}
+            else:
+                elsewhere.add(row["id"])
+    
+    remaining = [item_id for item_id in candidates if item_id not in resolved and item_id not in elsewhere]
+    if platform_id:
+        for chunk in chunks(remaining):
+            rows = supabase.table(table).select(f"id, {key}").eq("platform_id", platform_id).in_(key, chunk).execute().data
+            resolved.update({row[key]: {"id": row["id"], key: row[key]} for row in rows})
+    
+    for item_id in ids:
+        if item_id not in resolved and item_id not in elsewhere:
+            resolved[item_id] = {"id": None, key: item_id}
+    return resolved
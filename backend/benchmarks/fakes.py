@@ -0,0 +1,529 @@
+"""In-process stand-ins for Redis and the Supabase (PostgREST) client"""
+import fnmatch
+import re
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+class FakePipeline:
+    """Buffers commands and runs them on execute()"""
+    
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.commands: List[Callable] = []
+    
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+        
+        def queue(*args, **kwargs):
+            self.commands.append(lambda: method(*args, **kwargs))
+            return self
+        
+        return queue
+    
+    async def execute(self):
+        return [await command() for command in self.commands]
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeRedis:
+    """Subset of redis.asyncio.Redis used by RedisClient, with optional latency"""
+    
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.values: Dict[str, Any] = {}
+        self.expires: Dict[str, float] = {}
+    
+    async def _tick(self):
+        if self.latency:
+            import asyncio
+            await asyncio.sleep(self.latency)
+    
+    def _alive(self, key: str) -> bool:
+        expires = self.expires.get(key)
+        if expires is not None and expires < time.monotonic():
+            self.values.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.values
+    
+    async def ping(self):
+        await self._tick()
+        return True
+    
+    async def close(self):
+        pass
+    
+    async def get(self, key):
+        await self._tick()
+        return self.values.get(key) if self._alive(key) else None
+    
+    async def set(self, key, value, ex=None, nx=False):
+        await self._tick()
+        if nx and self._alive(key):
+            return None
+        self.values[key] = value
+        if ex:
+            self.expires[key] = time.monotonic() + ex
+        else:
+            self.expires.pop(key, None)
+        return True
+    
+    async def incr(self, key, amount=1):
+        await self._tick()
+        value = int(self.values.get(key, 0) if self._alive(key) else 0) + amount
+        self.values[key] = str(value)
+        return value
+    
+    async def delete(self, *keys):
+        await self._tick()
+        removed = 0
+        for key in keys:
+            if self.values.pop(key, None) is not None:
+                removed += 1
+            self.expires.pop(key, None)
+        return removed
+    
+    async def keys(self, pattern):
+        await self._tick()
+        return [key for key in list(self.values) if self._alive(key) and fnmatch.fnmatchcase(key, pattern)]
+    
+    async def rpush(self, key, *values):
+        await self._tick()
+        self.values.setdefault(key, []).extend(values)
+        return len(self.values[key])
+    
+    async def lpush(self, key, *values):
+        await self._tick()
+        items = self.values.setdefault(key, [])
+        for value in values:
+            items.insert(0, value)
+        return len(items)
+    
+    async def lpop(self, key, count=None):
+        await self._tick()
+        items = self.values.get(key) or []
+        if count is None:
+            return items.pop(0) if items else None
+        popped, self.values[key] = items[:count], items[count:]
+        return popped or None
+    
+    async def ltrim(self, key, start, end):
+        await self._tick()
+        items = self.values.get(key) or []
+        self.values[key] = items[start:end + 1 if end >= 0 else None]
+        return True
+    
+    async def lrange(self, key, start, end):
+        await self._tick()
+        items = self.values.get(key) or []
+        return items[start:end + 1 if end >= 0 else None]
+    
+    async def publish(self, channel, message):
+        await self._tick()
+        return 0
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+class FakeResponse:
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+def _like(pattern: str, case_insensitive: bool) -> re.Pattern:
+    regex = "^" + re.escape(pattern).replace("%", ".*").replace("_", ".") + "$"
+    return re.compile(regex, re.IGNORECASE if case_insensitive else 0)
+
+def _coerce(value: Any, other: Any) -> Any:
+    """Compare loosely like PostgREST does on text-encoded filter values"""
+    if isinstance(other, bool) and isinstance(value, str):
+        return value.lower() == "true"
+    if isinstance(other, (int, float)) and isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+def _match(row: Dict, column: str, op: str, value: Any) -> bool:
+    actual = row.get(column)
+    if op == "is":
+        return actual is None if value in (None, "null") else actual == value
+    if op == "in":
+        return str(actual) in {str(v) for v in value}
+    if op in ("like", "ilike"):
+        return actual is not None and bool(_like(str(value), op == "ilike").match(str(actual)))
+    if actual is None:
+        return op == "neq"
+    
+    value = _coerce(value, actual)
+    if op == "eq":
+        return actual == value or str(actual) == str(value)
+    if op == "neq":
+        return not (actual == value or str(actual) == str(value))
+    if op == "gt":
+        return actual > value
+    if op == "gte":
+        return actual >= value
+    if op == "lt":
+        return actual < value
+    if op == "lte":
+        return actual <= value
+    raise NotImplementedError(f"Filter operator {op} not supported by FakeSupabase")
+
+def _parse_or(expression: str) -> List[Callable[[Dict], bool]]:
+    """Parse PostgREST or=(a.eq.1,and(b.eq."x",c.lt.2)) conditions into predicates"""
+    predicates = []
+    for part in re.split(r",(?![^()]*\))", expression):
+        if part.startswith("and(") and part.endswith(")"):
+            nested = _parse_or(part[4:-1])
+            predicates.append(lambda row, nested=nested: all(p(row) for p in nested))
+            continue
+        column, op, value = part.split(".", 2)
+        if op == "in":
+            value = [v.strip('"') for v in value.strip("()").split(",")]
+        else:
+            value = value.strip('"')
+        predicates.append(lambda row, c=column, o=op, v=value: _match(row, c, o, v))
+    return predicates
+
+class FakeQuery:
+    """Chainable PostgREST-style query over an in-memory table"""
+    
+    def __init__(self, db: "FakeSupabase", table: str):
+        self.db = db
+        self.table_name = table
+        self.action = "select"
+        self.columns: Optional[List[str]] = None
+        self.count: Optional[str] = None
+        self.filters: List[Callable[[Dict], bool]] = []
+        self.ordering: List[tuple] = []
+        self.offset = 0
+        self.max_rows: Optional[int] = None
+        self.single_row = False
+        self.payload: Any = None
+        self.on_conflict: Optional[str] = None
+        self.ignore_duplicates = False
+    
+    # Actions
+    def select(self, columns: str = "*", count: Optional[str] = None, **kwargs):
+        if self.action == "select":
+            self.columns = None if columns.strip() == "*" else [c.strip() for c in columns.split(",")]
+        self.count = count
+        return self
+    
+    def insert(self, rows, **kwargs):
+        self.action, self.payload = "insert", rows
+        return self
+    
+    def upsert(self, rows, on_conflict: str = "id", ignore_duplicates: bool = False, **kwargs):
+        self.action, self.payload = "upsert", rows
+        self.on_conflict, self.ignore_duplicates = on_conflict, ignore_duplicates
+        return self
+    
+    def update(self, values: Dict, **kwargs):
+        self.action, self.payload = "update", values
+        return self
+    
+    def delete(self, **kwargs):
+        self.action = "delete"
+        return self
+    
+    # Filters
+    def _filter(self, column: str, op: str, value: Any):
+        self.filters.append(lambda row: _match(row, column, op, value))
+        return self
+    
+    def eq(self, column, value):
+        return self._filter(column, "eq", value)
+    
+    def neq(self, column, value):
+        return self._filter(column, "neq", value)
+    
+    def gt(self, column, value):
+        return self._filter(column, "gt", value)
+    
+    def gte(self, column, value):
+        return self._filter(column, "gte", value)
+    
+    def lt(self, column, value):
+        return self._filter(column, "lt", value)
+    
+    def lte(self, column, value):
+        return self._filter(column, "lte", value)
+    
+    def in_(self, column, values):
+        return self._filter(column, "in", list(values))
+    
+    def is_(self, column, value):
+        return self._filter(column, "is", value)
+    
+    def like(self, column, pattern):
+        return self._filter(column, "like", pattern)
+    
+    def ilike(self, column, pattern):
+        return self._filter(column, "ilike", pattern)
+    
+    def or_(self, expression: str, **kwargs):
+        predicates = _parse_or(expression)
+        self.filters.append(lambda row: any(p(row) for p in predicates))
+        return self
+    
+    # Modifiers
+    def order(self, column: str, desc: bool = False, **kwargs):
+        self.ordering.append((column, desc))
+        return self
+    
+    def range(self, start: int, end: int):
+        self.offset, self.max_rows = start, end - start + 1
+        return self
+    
+    def limit(self, size: int, **kwargs):
+        self.max_rows = size
+        return self
+    
+    def single(self):
+        self.single_row = True
+        return self
+    
+    maybe_single = single
+    
+    def execute(self) -> FakeResponse:
+        self.db.queries += 1
+        if self.db.latency:
+            # The real client is synchronous too, so block like it does
+            time.sleep(self.db.latency)
+        return getattr(self, f"_execute_{self.action}")()
+    
+    # Execution
+    def _rows(self) -> List[Dict]:
+        return self.db.tables.setdefault(self.table_name, [])
+    
+    def _selected(self) -> List[Dict]:
+        return [row for row in self._rows() if all(f(row) for f in self.filters)]
+    
+    def _project(self, rows: List[Dict]) -> List[Dict]:
+        if self.columns is None:
+            return [dict(row) for row in rows]
+        return [{column: row.get(column) for column in self.columns} for row in rows]
+    
+    def _execute_select(self) -> FakeResponse:
+        rows = self._selected()
+        total = len(rows) if self.count else None
+        
+        for column, desc in reversed(self.ordering):
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column) if row.get(column) is not None else 0), reverse=desc)
+        
+        end = None if self.max_rows is None else self.offset + self.max_rows
+        data = self._project(rows[self.offset:end])
+        
+        if self.single_row:
+            return FakeResponse(data[0] if data else None, total)
+        return FakeResponse(data, total)
+    
+    def _with_defaults(self, row: Dict) -> Dict:
+        now = datetime.utcnow().isoformat()
+        return {"id": str(uuid.uuid4()), "created_at": now, **row}
+    
+    def _execute_insert(self) -> FakeResponse:
+        rows = self.payload if isinstance(self.payload, list) else [self.payload]
+        inserted = [self._with_defaults(row) for row in rows]
+        self._rows().extend(inserted)
+        return FakeResponse(self._project(inserted))
+    
+    def _execute_upsert(self) -> FakeResponse:
+        rows = self.payload if isinstance(self.payload, list) else [self.payload]
+        keys = [column.strip() for column in self.on_conflict.split(",")]
+        index = {tuple(str(row.get(k)) for k in keys): row for row in self._rows()}
+        
+        written = []
+        for row in rows:
+            existing = index.get(tuple(str(row.get(k)) for k in keys))
+            if existing is None:
+                new_row = self._with_defaults(row)
+                self._rows().append(new_row)
+                index[tuple(str(new_row.get(k)) for k in keys)] = new_row
+                written.append(new_row)
+            elif not self.ignore_duplicates:
+                existing.update(row)
+                written.append(existing)
+        return FakeResponse(self._project(written))
+    
+    def _execute_update(self) -> FakeResponse:
+        rows = self._selected()
+        for row in rows:
+            row.update(self.payload)
+            if "updated_at" in row or self.table_name in self.db.timestamped:
+                row["updated_at"] = datetime.utcnow().isoformat()
+        return FakeResponse(self._project(rows))
+    
+    def _execute_delete(self) -> FakeResponse:
+        rows = self._selected()
+        ids = {id(row) for row in rows}
+        self.db.tables[self.table_name] = [row for row in self._rows() if id(row) not in ids]
+        return FakeResponse(self._project(rows))
+
+class FakeRpc:
+    def __init__(self, db: "FakeSupabase", fn: str, params: Dict):
+        self.db = db
+        self.fn = fn
+        self.params = params
+    
+    def execute(self) -> FakeResponse:
+        self.db.queries += 1
+        if self.fn not in self.db.functions:
+            raise NotImplementedError(f"RPC {self.fn} not registered on FakeSupabase")
+        return FakeResponse(self.db.functions[self.fn](self.db, **self.params))
+
+class FakeSupabase:
+    """In-memory Supabase client; register SQL functions in `functions`"""
+    
+    # Tables with an update_updated_at_column trigger
+    timestamped = {"super_admin_users", "platforms", "unified_users", "verification_queue"}
+    
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.tables: Dict[str, List[Dict]] = {}
+        self.functions: Dict[str, Callable] = {}
+        self.queries = 0
+    
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+    
+    from_ = table
+    
+    def rpc(self, fn: str, params: Optional[Dict] = None, **kwargs) -> FakeRpc:
+        return FakeRpc(self, fn, params or {})
+
+def refresh_finance_rollups(db: FakeSupabase, since: str) -> int:
+    """Python port of the refresh_finance_rollups SQL function (009_ledger.sql)"""
+    rollups = [row for row in db.tables.get("finance_daily_rollups", []) if row["day"] < since]
+    totals: Dict[tuple, Dict[str, Any]] = {}
+    columns = {
+        "booking_payment": ("payment_count", "gross_volume"),
+        "refund": ("refund_count", "refunds"),
+        "payout": ("payout_count", "payouts")
+    }
+    
+    for tx in db.tables.get("unified_transactions", []):
+        day = str(tx.get("processed_at") or "")[:10]
+        if tx.get("status") != "completed" or not day or day < since:
+            continue
+        key = (tx["platform_id"], tx.get("currency") or "AED", day)
+        row = totals.setdefault(key, {
+            "platform_id": key[0], "currency": key[1], "day": key[2],
+            "gross_volume": 0.0, "platform_fees": 0.0, "host_earnings": 0.0, "refunds": 0.0, "payouts": 0.0,
+            "payment_count": 0, "refund_count": 0, "payout_count": 0
+        })
+        count_column, amount_column = columns[tx["transaction_type"]]
+        row[count_column] += 1
+        row[amount_column] += tx["amount_total"]
+        if tx["transaction_type"] == "booking_payment":
+            row["platform_fees"] += tx["amount_platform_fee"]
+            row["host_earnings"] += tx.get("amount_host_payout") or 0
+    
+    db.tables["finance_daily_rollups"] = rollups + list(totals.values())
+    return len(totals)
+
+BOOKED_STATUSES = ("confirmed", "checked_in", "completed")
+
+def refresh_analytics_rollups(db: FakeSupabase, since: Optional[str], until: str) -> int:
+    """Python port of the refresh_analytics_rollups SQL function (012_analytics_rollups.sql)"""
+    def created(row: Dict[str, Any]) -> str:
+        return str(row.get("platform_created_at") or row["created_at"])[:10]
+    
+    if since is None:
+        since = min([
+            *(str(b["check_in"])[:10] for b in db.tables.get("unified_bookings", []) if b.get("check_in") and not b.get("removed_at")),
+            *(created(row) for row in db.tables.get("unified_users", []) + db.tables.get("unified_properties", []))
+        ], default=until)
+    rollups = [row for row in db.tables.get("analytics_daily_rollups", []) if row["day"] < since]
+    start, end = date.fromisoformat(since), date.fromisoformat(until)
+    properties = {prop["id"]: prop for prop in db.tables.get("unified_properties", [])}
+    totals: Dict[tuple, Dict[str, Any]] = {}
+    
+    def add(platform_id, city, currency, day: date, column: str, amount=1):
+        key = (platform_id, city, currency, day.isoformat())
+        row = totals.setdefault(key, {
+            "platform_id": platform_id, "city": city, "currency": currency, "day": key[3],
+            "bookings": 0, "cancellations": 0, "gmv": 0.0, "booked_nights": 0, "listing_nights": 0, "new_users": 0
+        })
+        row[column] += amount
+    
+    for prop in properties.values():
+        listed = date.fromisoformat(created(prop))
+        removed = date.fromisoformat(str(prop["removed_at"])[:10]) if prop.get("removed_at") else None
+        day = max(listed, start)
+        while day <= end and (removed is None or day < removed):
+            add(prop["platform_id"], prop.get("city") or "", prop.get("price_currency") or "AED", day, "listing_nights")
+            day += timedelta(days=1)
+    
+    for booking in db.tables.get("unified_bookings", []):
+        if booking.get("removed_at") or not booking.get("check_in"):
+            continue
+        prop = properties.get(booking.get("property_id"), {})
+        group = (booking["platform_id"], prop.get("city") or "", prop.get("price_currency") or "AED")
+        check_in = date.fromisoformat(str(booking["check_in"])[:10])
+        booked = booking.get("status") in BOOKED_STATUSES
+        if start <= check_in <= end:
+            add(*group, check_in, "bookings")
+            add(*group, check_in, "cancellations", int(booking.get("status") == "cancelled"))
+            add(*group, check_in, "gmv", float(booking.get("total_price") or 0) if booked else 0.0)
+        if booked and booking.get("check_out"):
+            night = max(check_in, start)
+            while night < date.fromisoformat(str(booking["check_out"])[:10]) and night <= end:
+                add(*group, night, "booked_nights")
+                night += timedelta(days=1)
+    
+    for user in db.tables.get("unified_users", []):
+        day = date.fromisoformat(created(user))
+        if start <= day <= end:
+            add(user["platform_id"], "", "", day, "new_users")
+    
+    refreshed = [row for key, row in totals.items() if key[0] is not None]
+    db.tables["analytics_daily_rollups"] = rollups + refreshed
+    return len(refreshed)
+
+def analytics_timeseries(
+    db: FakeSupabase,
+    period: str,
+    date_from: str,
+    date_to: str,
+    by_platform: bool = False,
+    by_city: bool = False,
+    platform: Optional[str] = None,
+    city_filter: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Python port of the analytics_timeseries SQL function (012_analytics_rollups.sql)"""
+    def bucket(day: str) -> str:
+        value = date.fromisoformat(day)
+        if period == "week":
+            value -= timedelta(days=value.weekday())
+        elif period == "month":
+            value = value.replace(day=1)
+        return value.isoformat()
+    
+    buckets: Dict[tuple, Dict[str, Any]] = {}
+    for row in db.tables.get("analytics_daily_rollups", []):
+        if not date_from <= row["day"] <= date_to:
+            continue
+        if (platform and row["platform_id"] != platform) or (city_filter is not None and row["city"] != city_filter):
+            continue
+        key = (bucket(row["day"]), row["platform_id"] if by_platform else None, row["city"] if by_city else None)
+        out = buckets.setdefault(key, {
+            "bucket": key[0], "platform_id": key[1], "city": key[2], "bookings": 0, "cancellations": 0,
+            "gmv": {}, "booked_nights": 0, "listing_nights": 0, "new_users": 0
+        })
+        for column in ("bookings", "cancellations", "booked_nights", "listing_nights", "new_users"):
+            out[column] += row[column]
+        if row["gmv"]:
+            out["gmv"][row["currency"]] = out["gmv"].get(row["currency"], 0) + row["gmv"]
+    
+    for out in buckets.values():
+        out["occupancy"] = round(out["booked_nights"] / out["listing_nights"], 4) if out["listing_nights"] else None
+    return [buckets[key] for key in sorted(buckets, key=lambda key: (key[0], key[1] or "", key[2] or ""))]
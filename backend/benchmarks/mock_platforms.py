@@ -0,0 +1,196 @@
+"""Local stand-ins for the Host, Agent and Customer platform APIs"""
+import asyncio
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+import uvicorn
+from fastapi import FastAPI, Request
+
+CITIES = ["Dubai", "Abu Dhabi", "Sharjah", "Ajman", "Ras Al Khaimah", "Fujairah"]
+PROPERTY_TYPES = ["apartment", "villa", "studio", "townhouse", "penthouse"]
+
+@dataclass
+class DatasetConfig:
+    users: int = 500
+    properties: int = 2000
+    bookings: int = 3000
+    pending_verifications: int = 200
+    latency_ms: float = 20.0
+    jitter_ms: float = 5.0
+    seed: int = 42
+
+def _id(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def build_dataset(config: DatasetConfig) -> Dict[str, Dict[str, List[Dict]]]:
+    """Deterministic records for every platform"""
+    rng = random.Random(config.seed)
+    today = date.today()
+    
+    def person(prefix: str, i: int) -> Dict:
+        return {
+            "id": _id(rng),
+            "email": f"{prefix}{i}@example.com",
+            "first_name": f"{prefix.title()}{i}",
+            "last_name": "Bench",
+            "phone": f"+9715{rng.randint(10000000, 99999999)}",
+            "verification_status": rng.choice(["pending", "approved", "approved", "under_review"]),
+            "created_at": (datetime.utcnow() - timedelta(days=rng.randint(0, 365))).isoformat()
+        }
+    
+    def listing(owner: Dict, price_field: str) -> Dict:
+        return {
+            "id": _id(rng),
+            "user_id": owner["id"],
+            "title": f"{rng.choice(PROPERTY_TYPES).title()} in {rng.choice(CITIES)}",
+            "property_type": rng.choice(PROPERTY_TYPES),
+            "address": {"city": rng.choice(CITIES)},
+            price_field: round(rng.uniform(200, 5000), 2),
+            "status": rng.choice(["active", "active", "active", "inactive", "draft"]),
+            "is_featured": rng.random() < 0.1,
+            "description": "x" * rng.randint(200, 2000),
+            "amenities": rng.sample(["pool", "gym", "wifi", "parking", "sea_view", "balcony"], 3),
+            "created_at": (datetime.utcnow() - timedelta(days=rng.randint(0, 365))).isoformat()
+        }
+    
+    def booking(prop: Dict, guest: Dict) -> Dict:
+        check_in = today + timedelta(days=rng.randint(-180, 90))
+        return {
+            "id": _id(rng),
+            "property_id": prop["id"],
+            "guest_id": guest["id"],
+            "host_id": prop["user_id"],
+            "check_in": check_in.isoformat(),
+            "check_out": (check_in + timedelta(days=rng.randint(1, 14))).isoformat(),
+            "total_price": round(rng.uniform(300, 20000), 2),
+            "status": rng.choice(["confirmed", "confirmed", "completed", "cancelled", "pending"]),
+            "payment_status": rng.choice(["paid", "paid", "pending", "refunded"]),
+            "created_at": (datetime.utcnow() - timedelta(days=rng.randint(0, 200))).isoformat()
+        }
+    
+    hosts = [person("host", i) for i in range(config.users)]
+    agents = [person("agent", i) for i in range(config.users)]
+    customers = [person("customer", i) for i in range(config.users)]
+    
+    host_properties = [listing(rng.choice(hosts), "base_price_per_night") for _ in range(config.properties)]
+    agent_properties = [listing(rng.choice(agents), "price") for _ in range(config.properties)]
+    
+    host_bookings = [booking(rng.choice(host_properties), rng.choice(customers)) for _ in range(config.bookings)]
+    
+    pending = [
+        {**agent, "verification_status": "pending", "documents": {"license": f"doc-{agent['id']}.pdf"}}
+        for agent in agents[:config.pending_verifications]
+    ]
+    
+    return {
+        "host": {"users": hosts, "properties": host_properties, "bookings": host_bookings},
+        "agent": {"users": agents, "properties": agent_properties, "pending": pending},
+        "customer": {"users": customers, "bookings": host_bookings}
+    }
+
+def _page(items: List[Dict], page: int, limit: int) -> Dict:
+    start = (page - 1) * limit
+    return {"data": items[start:start + limit], "total": len(items), "page": page, "limit": limit}
+
+def create_platform_app(platform: str, data: Dict[str, List[Dict]], config: DatasetConfig) -> FastAPI:
+    """FastAPI app mimicking one source platform's admin API"""
+    app = FastAPI(title=f"mock-{platform}")
+    rng = random.Random(config.seed)
+    by_id = {item["id"]: item for items in data.values() for item in items}
+    
+    @app.middleware("http")
+    async def simulated_latency(request: Request, call_next):
+        delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+        await asyncio.sleep(max(0.0, delay) / 1000)
+        return await call_next(request)
+    
+    @app.get("/api/health")
+    async def health():
+        return {"status": "healthy"}
+    
+    if platform == "host":
+        @app.get("/api/v1/users")
+        async def host_users():
+            return {"data": data["users"]}
+        
+        @app.get("/api/v1/properties")
+        async def host_properties(page: int = 1, limit: int = 100, status: Optional[str] = None):
+            items = [p for p in data["properties"] if not status or p["status"] == status]
+            return _page(items, page, limit)
+        
+        @app.get("/api/v1/properties/{property_id}")
+        async def host_property(property_id: str):
+            return by_id.get(property_id, {})
+        
+        @app.patch("/api/v1/properties/{property_id}")
+        async def host_update_property(property_id: str, request: Request):
+            return {**by_id.get(property_id, {}), **(await request.json())}
+        
+        @app.get("/api/v1/bookings")
+        async def host_bookings(page: int = 1, limit: int = 100, status: Optional[str] = None):
+            items = [b for b in data["bookings"] if not status or b["status"] == status]
+            return _page(items, page, limit)
+        
+        @app.get("/api/v1/bookings/{booking_id}")
+        async def host_booking(booking_id: str):
+            return by_id.get(booking_id, {})
+    
+    elif platform == "agent":
+        @app.get("/api/admin/agents")
+        async def agents():
+            return {"data": data["users"]}
+        
+        @app.get("/api/properties")
+        async def agent_properties(page: int = 1, limit: int = 100):
+            return _page(data["properties"], page, limit)
+        
+        @app.get("/api/admin/verification/pending")
+        async def pending():
+            return {"data": data["pending"]}
+        
+        @app.get("/api/admin/verification/user/{user_id}")
+        async def verification_details(user_id: str):
+            return {"data": by_id.get(user_id, {})}
+        
+        @app.post("/api/admin/verification/user/{user_id}/action")
+        async def verification_action(user_id: str, request: Request):
+            return {"success": True, "action": (await request.json()).get("action")}
+    
+    elif platform == "customer":
+        @app.get("/api/users")
+        async def customers():
+            return {"data": data["users"]}
+        
+        @app.get("/api/bookings")
+        async def customer_bookings(page: int = 1, limit: int = 100):
+            return _page(data["bookings"], page, limit)
+    
+    return app
+
+class MockPlatformServer:
+    """Runs a mock platform app with uvicorn on a background thread"""
+    
+    def __init__(self, app: FastAPI, port: int):
+        self.port = port
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+    
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+    
+    def start(self):
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Mock platform on port {self.port} did not start")
+            time.sleep(0.05)
+    
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
@@ -0,0 +1,461 @@
+"""Performance suite for the super admin backend.
+
+Runs from the backend directory:
+    
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --compare results.json
+
+Platform APIs are served by local mock servers; Redis and Supabase are
+replaced by in-memory fakes unless --real-supabase / --real-redis point the
+run at a local stack (e.g. `supabase start` and a local redis-server).
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import platform as py_platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List
+
+from benchmarks.fakes import FakeRedis, FakeSupabase, refresh_finance_rollups, refresh_analytics_rollups, analytics_timeseries
+from benchmarks.mock_platforms import (
+    DatasetConfig,
+    MockPlatformServer,
+    build_dataset,
+    create_platform_app
+)
+
+PLATFORMS = {
+    "host_dashboard": ("host", "Host Dashboard"),
+    "agent_dashboard": ("agent", "Real Estate Agent Dashboard"),
+    "customer_platform": ("customer", "Customer AI Platform")
+}
+
+def configure_environment():
+    """Settings the app requires at import time"""
+    defaults = {
+        "SUPABASE_URL": "http://127.0.0.1:54321",
+        "SUPABASE_SERVICE_KEY": "bench.service.key",
+        "REDIS_URL": "redis://127.0.0.1:6379/0",
+        "SECRET_KEY": "benchmark-secret",
+        "ENCRYPTION_KEY": base64.urlsafe_b64encode(b"0" * 32).decode(),
+        "HOST_DASHBOARD_API_KEY": "bench",
+        "AGENT_DASHBOARD_API_KEY": "bench",
+        "AGENT_DASHBOARD_SUPABASE_KEY": "bench.agent.key",
+        "CUSTOMER_PLATFORM_API_KEY": "bench",
+        "ENVIRONMENT": "benchmark",
+        "LOG_LEVEL": "WARNING",
+        # Measure the request path, not the per-platform token bucket
+        "PLATFORM_RATE_LIMIT": "10000",
+        "PLATFORM_RATE_BURST": "10000",
+        "TRACING_EXPORTER": "none"
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def summarize(samples: List[float], wall: float, concurrency: int) -> Dict[str, Any]:
+    """Latency distribution in milliseconds plus throughput"""
+    return {
+        "requests": len(samples),
+        "concurrency": concurrency,
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+        "throughput_rps": round(len(samples) / wall, 2)
+    }
+
+async def run_concurrent(
+    operation: Callable[[int], Awaitable[Any]],
+    requests: int,
+    concurrency: int
+) -> Dict[str, Any]:
+    """Run `requests` calls of operation with at most `concurrency` in flight"""
+    samples: List[float] = []
+    counter = iter(range(requests))
+    
+    async def worker():
+        for i in counter:
+            started = time.perf_counter()
+            await operation(i)
+            samples.append(time.perf_counter() - started)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return summarize(samples, time.perf_counter() - started, concurrency)
+
+class BenchmarkSuite:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.dataset_config = DatasetConfig(
+            users=args.users,
+            properties=args.properties,
+            bookings=args.bookings,
+            pending_verifications=args.pending,
+            latency_ms=args.platform_latency_ms,
+            seed=args.seed
+        )
+        self.servers: List[MockPlatformServer] = []
+        self.fake_db: FakeSupabase = None
+        self.fake_redis: FakeRedis = None
+        self.results: Dict[str, Any] = {}
+    
+    def setup(self):
+        """Start mock platforms and wire the app to the fakes"""
+        dataset = build_dataset(self.dataset_config)
+        urls = {}
+        for i, (name, (key, _)) in enumerate(PLATFORMS.items()):
+            server = MockPlatformServer(
+                create_platform_app(key, dataset[key], self.dataset_config),
+                self.args.base_port + i
+            )
+            server.start()
+            self.servers.append(server)
+            urls[name] = server.url
+        
+        from app.core import supabase as supabase_module
+        if not self.args.real_supabase:
+            self.fake_db = FakeSupabase(latency=self.args.db_latency_ms / 1000)
+            self.fake_db.functions["refresh_finance_rollups"] = refresh_finance_rollups
+            self.fake_db.functions["refresh_analytics_rollups"] = refresh_analytics_rollups
+            self.fake_db.functions["analytics_timeseries"] = analytics_timeseries
+            supabase_module.supabase_admin.client = supabase_module.InstrumentedClient(self.fake_db)
+        
+        self.supabase = supabase_module.get_supabase()
+        self._seed(urls)
+    
+    def _seed(self, urls: Dict[str, str]):
+        self.supabase.table("super_admin_users").upsert({
+            "email": "bench-admin@krib.ai",
+            "full_name": "Bench Admin",
+            "role": "super_admin",
+            "permissions": {},
+            "is_active": True
+        }, on_conflict="email").execute()
+        admin = self.supabase.table("super_admin_users").select("id").eq(
+            "email", "bench-admin@krib.ai"
+        ).execute()
+        self.admin_id = admin.data[0]["id"]
+        
+        self.supabase.table("platforms").upsert([
+            {
+                "name": name,
+                "display_name": display_name,
+                "api_base_url": urls[name],
+                "api_key": "bench",
+                "status": "active"
+            }
+            for name, (_, display_name) in PLATFORMS.items()
+        ], on_conflict="name").execute()
+    
+    async def connect_redis(self):
+        from app.core.redis import redis_client
+        if self.args.real_redis:
+            await redis_client.connect()
+            await redis_client.redis.flushdb()
+        else:
+            self.fake_redis = FakeRedis(latency=self.args.redis_latency_ms / 1000)
+            redis_client.redis = self.fake_redis
+        return redis_client
+    
+    async def run(self):
+        redis_client = await self.connect_redis()
+        
+        import httpx
+        from app.main import app
+        from app.core.security import create_access_token
+        from app.services.audit_logger import audit_logger
+        
+        await audit_logger.start()
+        
+        token = create_access_token({"sub": self.admin_id, "email": "bench-admin@krib.ai"})
+        response_bytes: List[int] = []
+        
+        async def record_size(response):
+            await response.aread()
+            response_bytes.append(len(response.content))
+        
+        self.http = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://bench",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=60,
+            event_hooks={"response": [record_size]}
+        )
+        
+        scenarios = {
+            "sync_full": self.bench_sync,
+            "sync_unchanged": self.bench_sync_unchanged,
+            "list_users": self.bench_list_users,
+            "get_user": self.bench_get_user,
+            "list_properties": self.bench_list_properties,
+            "analytics_timeseries": self.bench_analytics_timeseries,
+            "platform_cache_hit": self.bench_cache_hit,
+            "platform_cache_miss": self.bench_cache_miss,
+            "admin_user_status_update": self.bench_admin_action
+        }
+        selected = self.args.scenarios or list(scenarios)
+        
+        try:
+            if "sync_full" not in selected:
+                # Other scenarios read the unified tables, so populate them first
+                from app.services.sync_service import sync_service
+                await sync_service.sync_all_platforms()
+            
+            for name in selected:
+                print(f"running {name}...", file=sys.stderr)
+                response_bytes.clear()
+                self.results[name] = await scenarios[name]()
+                if response_bytes:
+                    self.results[name]["mean_response_bytes"] = round(statistics.mean(response_bytes))
+        finally:
+            await self.http.aclose()
+            await audit_logger.stop()
+            await redis_client.disconnect()
+    
+    async def bench_sync(self) -> Dict[str, Any]:
+        """Full sync of all three platforms into the unified tables"""
+        from app.services.sync_service import sync_service
+        
+        queries_before = self.fake_db.queries if self.fake_db else None
+        started = time.perf_counter()
+        stats = await sync_service.sync_all_platforms()
+        wall = time.perf_counter() - started
+        
+        rows = {}
+        for table in ("unified_users", "unified_properties", "unified_bookings", "unified_transactions", "verification_queue"):
+            response = self.supabase.table(table).select("id", count="exact").limit(1).execute()
+            rows[table] = response.count
+        
+        total = sum(rows.values())
+        result = {
+            "seconds": round(wall, 3),
+            "rows": rows,
+            "rows_per_second": round(total / wall, 2),
+            "writes": stats
+        }
+        if self.fake_db:
+            result["db_queries"] = self.fake_db.queries - queries_before
+        return result
+    
+    async def bench_sync_unchanged(self) -> Dict[str, Any]:
+        """Repeat sync with nothing changed upstream; every row should be skipped"""
+        return await self.bench_sync()
+    
+    def _user_ids(self) -> List[str]:
+        response = self.supabase.table("unified_users").select("id").limit(1000).execute()
+        return [row["id"] for row in response.data]
+    
+    async def bench_list_users(self) -> Dict[str, Any]:
+        """Paginated, filtered user listing under concurrency"""
+        rng = random.Random(self.args.seed)
+        user_types = [None, "host", "agent", "customer"]
+        
+        async def call(i: int):
+            params = {"page": rng.randint(1, 5), "limit": 50}
+            user_type = rng.choice(user_types)
+            if user_type:
+                params["user_type"] = user_type
+            response = await self.http.get("/api/v1/users", params=params)
+            response.raise_for_status()
+        
+        return await run_concurrent(call, self.args.requests, self.args.concurrency)
+    
+    async def bench_get_user(self) -> Dict[str, Any]:
+        """User profile with properties and bookings under concurrency"""
+        user_ids = self._user_ids()
+        rng = random.Random(self.args.seed)
+        
+        async def call(i: int):
+            response = await self.http.get(f"/api/v1/users/{rng.choice(user_ids)}")
+            response.raise_for_status()
+        
+        return await run_concurrent(call, self.args.requests, self.args.concurrency)
+    
+    async def bench_list_properties(self) -> Dict[str, Any]:
+        """Filtered property listing, following next_cursor for a few pages"""
+        rng = random.Random(self.args.seed)
+        statuses = [None, "active", "inactive"]
+        
+        async def call(i: int):
+            params = {"limit": 50}
+            status = rng.choice(statuses)
+            if status:
+                params["status"] = status
+            for _ in range(rng.randint(1, 3)):
+                response = await self.http.get("/api/v1/properties", params=params)
+                response.raise_for_status()
+                params["cursor"] = response.json()["next_cursor"]
+                if not params["cursor"]:
+                    break
+        
+        return await run_concurrent(call, self.args.requests, self.args.concurrency)
+    
+    async def bench_analytics_timeseries(self) -> Dict[str, Any]:
+        """Cross-platform time series read from the analytics rollups"""
+        rng = random.Random(self.args.seed)
+        
+        async def call(i: int):
+            params = {"period": rng.choice(["day", "week", "month"]), "date_from": "2024-01-01"}
+            group_by = rng.choice([None, "platform", "city", "platform_city"])
+            if group_by:
+                params["group_by"] = group_by
+            response = await self.http.get("/api/v1/analytics/timeseries", params=params)
+            response.raise_for_status()
+        
+        return await run_concurrent(call, self.args.requests, self.args.concurrency)
+    
+    async def _host_client(self):
+        from app.services.host_platform import HostPlatformClient
+        platform = self.supabase.table("platforms").select("*").eq("name", "host_dashboard").execute().data[0]
+        return HostPlatformClient(platform["api_base_url"], platform["api_key"])
+    
+    async def bench_cache_hit(self) -> Dict[str, Any]:
+        """PlatformClient GET served from the Redis cache"""
+        client = await self._host_client()
+        await client.get_all_properties(page=1, limit=100)
+        
+        async def call(i: int):
+            await client.get_all_properties(page=1, limit=100)
+        
+        try:
+            return await run_concurrent(call, self.args.requests, self.args.concurrency)
+        finally:
+            await client.close()
+    
+    async def bench_cache_miss(self) -> Dict[str, Any]:
+        """PlatformClient GET going upstream (cache cleared before each call)"""
+        from app.core.redis import redis_client
+        client = await self._host_client()
+        
+        async def call(i: int):
+            page = i % 20 + 1
+            await redis_client.delete(f"host:properties:page:{page}:status:None")
+            await client.get_all_properties(page=page, limit=100)
+        
+        try:
+            return await run_concurrent(call, self.args.requests, self.args.concurrency)
+        finally:
+            await client.close()
+    
+    async def bench_admin_action(self) -> Dict[str, Any]:
+        """Admin write path: status update plus audit logging"""
+        user_ids = self._user_ids()
+        rng = random.Random(self.args.seed)
+        
+        async def call(i: int):
+            response = await self.http.patch(
+                f"/api/v1/users/{rng.choice(user_ids)}/status",
+                json={"status": "active", "reason": "benchmark"}
+            )
+            response.raise_for_status()
+        
+        return await run_concurrent(call, self.args.requests, self.args.concurrency)
+    
+    def teardown(self):
+        for server in self.servers:
+            server.stop()
+    
+    def report(self) -> Dict[str, Any]:
+        return {
+            "meta": {
+                "timestamp": datetime.utcnow().isoformat(),
+                "git_commit": _git_commit(),
+                "python": py_platform.python_version(),
+                "dataset": vars(self.dataset_config),
+                "db_latency_ms": self.args.db_latency_ms,
+                "redis_latency_ms": self.args.redis_latency_ms,
+                "real_supabase": self.args.real_supabase,
+                "real_redis": self.args.real_redis,
+                "requests": self.args.requests,
+                "concurrency": self.args.concurrency
+            },
+            "scenarios": self.results
+        }
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+def compare(previous: Dict[str, Any], current: Dict[str, Any], max_regression: float) -> bool:
+    """Print per-metric deltas; False if any latency regressed past the threshold"""
+    ok = True
+    for name, result in current["scenarios"].items():
+        before = previous.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "seconds"):
+            if metric not in result or metric not in before or not before[metric]:
+                continue
+            change = (result[metric] - before[metric]) / before[metric]
+            flag = ""
+            if change > max_regression:
+                flag = "  REGRESSION"
+                ok = False
+            print(f"{name:28s} {metric:8s} {before[metric]:>10.2f} -> {result[metric]:>10.2f} ({change:+.1%}){flag}")
+    return ok
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Super admin backend performance suite")
+    parser.add_argument("--users", type=int, default=500, help="users per platform")
+    parser.add_argument("--properties", type=int, default=2000, help="properties per platform")
+    parser.add_argument("--bookings", type=int, default=3000)
+    parser.add_argument("--pending", type=int, default=200, help="pending agent verifications")
+    parser.add_argument("--platform-latency-ms", type=float, default=20.0)
+    parser.add_argument("--db-latency-ms", type=float, default=2.0, help="per-query latency of the fake Supabase")
+    parser.add_argument("--redis-latency-ms", type=float, default=0.2, help="per-command latency of the fake Redis")
+    parser.add_argument("--requests", type=int, default=500, help="requests per latency scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--base-port", type=int, default=18801)
+    parser.add_argument("--real-supabase", action="store_true", help="use SUPABASE_URL instead of the fake")
+    parser.add_argument("--real-redis", action="store_true", help="use REDIS_URL instead of the fake")
+    parser.add_argument("--scenarios", nargs="*", help="subset of scenarios to run")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="previous JSON results to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed relative slowdown")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    configure_environment()
+    
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+    
+    suite = BenchmarkSuite(args)
+    suite.setup()
+    try:
+        asyncio.run(suite.run())
+    finally:
+        suite.teardown()
+    
+    report = suite.report()
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    
+    if previous and not compare(previous, report, args.max_regression):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""Measure what rendering a list page costs on each response path.
+
+Runs from the backend directory:
+    
+    python -m benchmarks.serialization --rows 100 --output serialization.json
+
+For every list endpoint a page of synthetic rows shaped like its projection
+(JSONB columns included) goes through:
+
+- model: the route's untyped response model with FastAPI's stdlib JSONResponse,
+  which is how the list endpoints used to answer
+- model_orjson: the same validation and serialization rendered by ORJSONResponse,
+  the app's default response class
+- typed_model: the typed page schema through FastAPI, what RESPONSE_VALIDATION checks
+- trusted: TrustedJSONResponse, which the list endpoints now return
+
+Times are per page, in microseconds; only the rendering is measured.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from benchmarks.run import configure_environment
+
+configure_environment()
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.models.schemas import (
+    PaginatedResponse,
+    CursorPaginatedResponse,
+    UserPage,
+    PropertyPage,
+    BookingPage,
+    TransactionPage,
+    VerificationQueueItem
+)
+from app.utils.responses import TrustedJSONResponse
+
+def _timestamp(rng: random.Random) -> str:
+    return (datetime(2025, 1, 1) + timedelta(minutes=rng.randrange(600000))).isoformat() + "+00:00"
+
+def _id(rng: random.Random) -> str:
+    return "%08x-%04x-4%03x-a%03x-%012x" % (
+        rng.getrandbits(32), rng.getrandbits(16), rng.getrandbits(12), rng.getrandbits(12), rng.getrandbits(48)
+    )
+
+def user_row(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id": _id(rng), "person_id": _id(rng), "email": f"user{rng.randrange(10**6)}@example.com",
+        "platform_id": _id(rng), "platform_user_id": _id(rng), "user_type": rng.choice(["host", "agent", "guest"]),
+        "full_name": "Layla Haddad", "phone": "+971501234567", "verification_status": "approved",
+        "account_status": "active", "last_synced_at": _timestamp(rng), "removed_at": None,
+        "created_at": _timestamp(rng), "updated_at": _timestamp(rng)
+    }
+
+def property_row(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id": _id(rng), "platform_id": _id(rng), "platform_property_id": _id(rng), "owner_user_id": _id(rng),
+        "title": "Two bedroom apartment with marina view", "property_type": "apartment",
+        "listing_type": "short_term", "city": "Dubai", "price": round(rng.uniform(200, 5000), 2),
+        "price_currency": "AED", "status": "active", "is_featured": rng.random() < 0.1,
+        "last_synced_at": _timestamp(rng), "removed_at": None, "created_at": _timestamp(rng)
+    }
+
+def booking_row(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id": _id(rng), "platform_id": _id(rng), "platform_booking_id": _id(rng), "property_id": _id(rng),
+        "guest_user_id": _id(rng), "host_user_id": _id(rng), "check_in": "2025-03-01", "check_out": "2025-03-05",
+        "total_price": round(rng.uniform(500, 20000), 2), "status": "confirmed", "payment_status": "paid",
+        "last_synced_at": _timestamp(rng), "removed_at": None, "created_at": _timestamp(rng)
+    }
+
+def transaction_row(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id": _id(rng), "platform_id": _id(rng), "booking_id": _id(rng), "source_id": _id(rng),
+        "transaction_type": "payment", "amount_total": round(rng.uniform(500, 20000), 2),
+        "amount_platform_fee": 150.0, "amount_host_payout": 1350.0, "currency": "AED",
+        "payment_provider": "stripe", "payment_provider_id": f"pi_{rng.getrandbits(64):x}", "status": "completed",
+        "processed_at": _timestamp(rng), "created_at": _timestamp(rng)
+    }
+
+def verification_row(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id": _id(rng), "platform_id": _id(rng), "user_id": _id(rng), "platform_user_id": _id(rng),
+        "verification_type": "agent_registration", "status": "pending",
+        "documents": {
+            "emirates_id": {"front": f"https://files.example.com/{_id(rng)}.jpg", "back": f"https://files.example.com/{_id(rng)}.jpg"},
+            "rera_license": {"number": str(rng.randrange(10**6)), "expires": "2026-12-31"},
+            "history": [{"status": "submitted", "at": _timestamp(rng)} for _ in range(3)]
+        },
+        "created_at": _timestamp(rng), "updated_at": _timestamp(rng)
+    }
+
+def stripe_event_row(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id": _id(rng), "stripe_event_id": f"evt_{rng.getrandbits(64):x}", "event_type": "payment_intent.succeeded",
+        "processed": True, "created_at": _timestamp(rng),
+        "raw_data": {
+            "id": f"pi_{rng.getrandbits(64):x}", "object": "payment_intent", "amount": rng.randrange(10**6),
+            "currency": "aed", "metadata": {"booking_id": _id(rng), "property_id": _id(rng)},
+            "charges": {"data": [{"id": f"ch_{rng.getrandbits(64):x}", "amount": 1000, "paid": True,
+                                  "billing_details": {"address": {"city": "Dubai", "country": "AE"}}}]}
+        }
+    }
+
+def _cursor_page(rows: List[Dict]) -> Dict[str, Any]:
+    return {"success": True, "data": rows, "limit": len(rows), "next_cursor": "eyJpZCI6IC4uLn0"}
+
+def _offset_page(rows: List[Dict]) -> Dict[str, Any]:
+    return {"data": rows, "page": 1, "limit": len(rows), "total": 5000, "total_pages": 50}
+
+# Endpoint -> (row factory, page builder, untyped model, typed model)
+ENDPOINTS: Dict[str, tuple] = {
+    "GET /users": (user_row, _offset_page, PaginatedResponse, UserPage),
+    "GET /properties": (property_row, _cursor_page, CursorPaginatedResponse, PropertyPage),
+    "GET /bookings": (booking_row, _cursor_page, CursorPaginatedResponse, BookingPage),
+    "GET /finance/transactions": (transaction_row, _cursor_page, CursorPaginatedResponse, TransactionPage),
+    "GET /verification/queue": (verification_row, lambda rows: rows, List[VerificationQueueItem], List[VerificationQueueItem]),
+    "GET /payments/events": (stripe_event_row, _cursor_page, CursorPaginatedResponse, CursorPaginatedResponse)
+}
+
+def _through_fastapi(model: Any, response_class: type, content: Any) -> Callable[[], Any]:
+    """Render content the way a route with response_model=model does when it returns a model or rows"""
+    field = APIRoute("/", lambda: None, response_model=model).response_field
+    
+    async def render():
+        # Routes built the wrapper model themselves before returning it
+        value = model(**content) if isinstance(content, dict) else content
+        return response_class(await serialize_response(field=field, response_content=value)).body
+    
+    return render
+
+def _trusted(content: Any) -> Callable[[], Any]:
+    async def render():
+        return TrustedJSONResponse(content).body
+    
+    return render
+
+def _measure(render: Callable[[], Any], iterations: int) -> List[float]:
+    """Wall time of each render in microseconds; every path pays the same event loop overhead"""
+    loop = asyncio.new_event_loop()
+    try:
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            loop.run_until_complete(render())
+            samples.append((time.perf_counter() - started) * 1e6)
+        return samples
+    finally:
+        loop.close()
+
+def run(rows: int, iterations: int, seed: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for name, (row, page, model, typed_model) in ENDPOINTS.items():
+        rng = random.Random(seed)
+        content = page([row(rng) for _ in range(rows)])
+        paths = {
+            "model": _through_fastapi(model, JSONResponse, content),
+            "model_orjson": _through_fastapi(model, ORJSONResponse, content),
+            "typed_model": _through_fastapi(typed_model, ORJSONResponse, content),
+            "trusted": _trusted(content)
+        }
+        
+        endpoint: Dict[str, Any] = {"response_bytes": len(TrustedJSONResponse(content).body)}
+        for path, render in paths.items():
+            _measure(render, max(1, iterations // 10))
+            samples = _measure(render, iterations)
+            endpoint[path] = {
+                "mean_us": round(statistics.mean(samples), 1),
+                "p50_us": round(statistics.median(samples), 1)
+            }
+        endpoint["speedup"] = round(endpoint["model"]["mean_us"] / endpoint["trusted"]["mean_us"], 1)
+        results[name] = endpoint
+    return results
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Per-page rendering cost of each response path")
+    parser.add_argument("--rows", type=int, default=100, help="rows per page")
+    parser.add_argument("--iterations", type=int, default=200, help="renders per endpoint and path")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = run(args.rows, args.iterations, args.seed)
+    
+    print(f"{'endpoint':<28}{'bytes':>9}{'model':>10}{'orjson':>10}{'typed':>10}{'trusted':>10}{'speedup':>9}")
+    for name, endpoint in results.items():
+        print(
+            f"{name:<28}{endpoint['response_bytes']:>9}"
+            + "".join(f"{endpoint[path]['mean_us']:>10.0f}" for path in ("model", "model_orjson", "typed_model", "trusted"))
+            + f"{endpoint['speedup']:>8}x"
+        )
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"rows": args.rows, "iterations": args.iterations, "endpoints": results}, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+-- Indexes for the unified property and booking listings
+-- Run after migrations.sql. Listings page newest first on (created_at, id),
+-- so each filter column leads an index that ends in that sort order.
+
+CREATE INDEX IF NOT EXISTS idx_unified_properties_created ON unified_properties(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_unified_properties_status ON unified_properties(status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_unified_properties_city ON unified_properties(city, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_unified_properties_platform ON unified_properties(platform_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_unified_properties_price ON unified_properties(price);
+
+CREATE INDEX IF NOT EXISTS idx_unified_bookings_created ON unified_bookings(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_unified_bookings_status ON unified_bookings(status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_unified_bookings_platform ON unified_bookings(platform_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_unified_bookings_property ON unified_bookings(property_id, created_at DESC, id DESC);
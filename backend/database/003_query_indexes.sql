@@ -0,0 +1,30 @@
+-- Composite and partial indexes for the queries the backend issues
+-- Run after 002_listing_indexes.sql. `python -m benchmarks.query_plans`
+-- checks that each hot query is served by an index.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- users.get_user: bookings where the user is guest or host (combined with a BitmapOr)
+CREATE INDEX IF NOT EXISTS idx_unified_bookings_guest ON unified_bookings(guest_user_id) WHERE guest_user_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_unified_bookings_host ON unified_bookings(host_user_id) WHERE host_user_id IS NOT NULL;
+
+-- users.list_users: suspended/banned filter (a small slice of all users) and substring search
+CREATE INDEX IF NOT EXISTS idx_unified_users_restricted ON unified_users(account_status) WHERE account_status <> 'active';
+CREATE INDEX IF NOT EXISTS idx_unified_users_email_trgm ON unified_users USING gin (email gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_unified_users_name_trgm ON unified_users USING gin (full_name gin_trgm_ops);
+
+-- properties.list_properties filtered by platform and status together
+CREATE INDEX IF NOT EXISTS idx_unified_properties_platform_status ON unified_properties(platform_id, status, created_at DESC, id DESC);
+
+-- Sync: verification lookup for every pending agent
+CREATE INDEX IF NOT EXISTS idx_verification_queue_platform_user ON verification_queue(platform_id, platform_user_id);
+
+-- Audit history of a single entity
+CREATE INDEX IF NOT EXISTS idx_admin_audit_log_target ON admin_audit_log(target_entity_type, target_entity_id, created_at DESC);
+
+-- Unread notifications per admin
+CREATE INDEX IF NOT EXISTS idx_admin_notifications_unread ON admin_notifications(admin_user_id, created_at DESC) WHERE NOT is_read;
+
+-- Foreign keys used in lookups and ON DELETE actions
+CREATE INDEX IF NOT EXISTS idx_verification_queue_user ON verification_queue(user_id);
+CREATE INDEX IF NOT EXISTS idx_unified_transactions_booking ON unified_transactions(booking_id) WHERE booking_id IS NOT NULL;
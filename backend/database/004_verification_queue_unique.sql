@@ -0,0 +1,29 @@
+-- One verification_queue row per platform user, so sync can upsert in bulk
+-- Run after 003_query_indexes.sql.
+
+-- Collapse duplicates left by concurrent syncs, keeping reviewed rows first, then the most recently updated
+DELETE FROM verification_queue
+WHERE id IN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (
+            PARTITION BY platform_id, platform_user_id
+            ORDER BY reviewed_at DESC NULLS LAST, updated_at DESC NULLS LAST, created_at DESC, id
+        ) AS position
+        FROM verification_queue
+    ) ranked
+    WHERE position > 1
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS verification_queue_platform_user_key ON verification_queue(platform_id, platform_user_id);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'verification_queue_platform_user_key') THEN
+        ALTER TABLE verification_queue
+            ADD CONSTRAINT verification_queue_platform_user_key UNIQUE USING INDEX verification_queue_platform_user_key;
+    END IF;
+END
+$$;
+
+-- The unique index now serves the sync lookup
+DROP INDEX IF EXISTS idx_verification_queue_platform_user;
@@ -0,0 +1,7 @@
+-- Content hash of each synced row, so sync only writes rows whose source changed
+-- Run after 004_verification_queue_unique.sql. Rows start with a NULL hash and are
+-- written once on the next sync; after that unchanged rows are skipped.
+
+ALTER TABLE unified_users ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE unified_properties ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE unified_bookings ADD COLUMN IF NOT EXISTS content_hash TEXT;
@@ -0,0 +1,64 @@
+-- Move platform_specific_data out of the unified tables into side tables read only by detail views
+-- Run after 005_content_hash.sql. Existing payloads are copied over as they are; the next
+-- sync rewrites every row once with the trimmed per-platform field list (their hashes change).
+-- Run VACUUM FULL on the three unified tables afterwards to give the freed space back.
+
+CREATE TABLE IF NOT EXISTS unified_user_payloads (
+    id UUID PRIMARY KEY REFERENCES unified_users(id) ON DELETE CASCADE,
+    platform_specific_data JSONB,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS unified_property_payloads (
+    id UUID PRIMARY KEY REFERENCES unified_properties(id) ON DELETE CASCADE,
+    platform_specific_data JSONB,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS unified_booking_payloads (
+    id UUID PRIMARY KEY REFERENCES unified_bookings(id) ON DELETE CASCADE,
+    platform_specific_data JSONB,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- lz4 (Postgres 14+) compresses and decompresses TOASTed payloads faster than the default pglz;
+-- servers built without it keep pglz
+DO $$
+BEGIN
+    ALTER TABLE unified_user_payloads ALTER COLUMN platform_specific_data SET COMPRESSION lz4;
+    ALTER TABLE unified_property_payloads ALTER COLUMN platform_specific_data SET COMPRESSION lz4;
+    ALTER TABLE unified_booking_payloads ALTER COLUMN platform_specific_data SET COMPRESSION lz4;
+EXCEPTION WHEN feature_not_supported THEN
+    RAISE NOTICE 'lz4 not available, payloads use pglz';
+END
+$$;
+
+ALTER TABLE unified_user_payloads ENABLE ROW LEVEL SECURITY;
+ALTER TABLE unified_property_payloads ENABLE ROW LEVEL SECURITY;
+ALTER TABLE unified_booking_payloads ENABLE ROW LEVEL SECURITY;
+
+DO $$
+DECLARE
+    source TEXT;
+    target TEXT;
+BEGIN
+    FOR source, target IN VALUES
+        ('unified_users', 'unified_user_payloads'),
+        ('unified_properties', 'unified_property_payloads'),
+        ('unified_bookings', 'unified_booking_payloads')
+    LOOP
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = source AND column_name = 'platform_specific_data'
+        ) THEN
+            EXECUTE format(
+                'INSERT INTO %I (id, platform_specific_data)
+                 SELECT id, platform_specific_data FROM %I WHERE platform_specific_data IS NOT NULL
+                 ON CONFLICT (id) DO NOTHING',
+                target, source
+            );
+            EXECUTE format('ALTER TABLE %I DROP COLUMN platform_specific_data', source);
+        END IF;
+    END LOOP;
+END
+$$;
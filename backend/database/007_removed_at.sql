@@ -0,0 +1,7 @@
+-- Soft delete for records that disappeared upstream; set by the sync reconciliation pass
+-- Run after 006_payload_side_tables.sql. List endpoints hide removed rows unless
+-- include_removed=true; a row that reappears upstream is cleared on the next sync.
+
+ALTER TABLE unified_users ADD COLUMN IF NOT EXISTS removed_at TIMESTAMPTZ;
+ALTER TABLE unified_properties ADD COLUMN IF NOT EXISTS removed_at TIMESTAMPTZ;
+ALTER TABLE unified_bookings ADD COLUMN IF NOT EXISTS removed_at TIMESTAMPTZ;
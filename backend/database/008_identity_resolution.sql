@@ -0,0 +1,22 @@
+-- Cross-platform identity: unified users of the same person share a person_id
+-- Run after 007_removed_at.sql. identity_keys is the blocking index sync resolves people
+-- through: sha256 of the normalised email, phone and platform account, each mapped to a person.
+
+ALTER TABLE unified_users ADD COLUMN IF NOT EXISTS person_id UUID;
+
+CREATE TABLE IF NOT EXISTS identity_keys (
+    key_hash TEXT PRIMARY KEY,
+    key_type TEXT NOT NULL CHECK (key_type IN ('account', 'email', 'phone')),
+    person_id UUID NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE identity_keys ENABLE ROW LEVEL SECURITY;
+
+-- get_user: all accounts of a person; merges: re-pointing a person's accounts and keys
+CREATE INDEX IF NOT EXISTS idx_unified_users_person ON unified_users(person_id);
+CREATE INDEX IF NOT EXISTS idx_identity_keys_person ON identity_keys(person_id);
+
+-- Users are only resolved when sync writes them; clearing the hash makes the next sync write
+-- (and resolve) every user that has no person yet
+UPDATE unified_users SET content_hash = NULL WHERE person_id IS NULL;
@@ -0,0 +1,108 @@
+-- Transaction ledger fed by sync, daily/monthly finance rollups and ingestion watermarks
+-- Run after 008_identity_resolution.sql.
+
+-- One ledger row per source record and type, so ingestion can upsert and re-run safely
+ALTER TABLE unified_transactions ADD COLUMN IF NOT EXISTS source_id TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS unified_transactions_source_key
+    ON unified_transactions(platform_id, transaction_type, source_id);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'unified_transactions_source_key') THEN
+        ALTER TABLE unified_transactions
+            ADD CONSTRAINT unified_transactions_source_key UNIQUE USING INDEX unified_transactions_source_key;
+    END IF;
+END
+$$;
+
+-- Rollup refresh range scan and the finance transaction list
+CREATE INDEX IF NOT EXISTS idx_unified_transactions_processed
+    ON unified_transactions(processed_at) WHERE status = 'completed';
+CREATE INDEX IF NOT EXISTS idx_unified_transactions_created
+    ON unified_transactions(created_at DESC, id DESC);
+
+-- Completed money movement per platform, currency and day
+CREATE TABLE IF NOT EXISTS finance_daily_rollups (
+    platform_id UUID REFERENCES platforms(id) ON DELETE CASCADE,
+    currency TEXT NOT NULL,
+    day DATE NOT NULL,
+    gross_volume NUMERIC NOT NULL DEFAULT 0,
+    platform_fees NUMERIC NOT NULL DEFAULT 0,
+    host_earnings NUMERIC NOT NULL DEFAULT 0,
+    refunds NUMERIC NOT NULL DEFAULT 0,
+    payouts NUMERIC NOT NULL DEFAULT 0,
+    payment_count INTEGER NOT NULL DEFAULT 0,
+    refund_count INTEGER NOT NULL DEFAULT 0,
+    payout_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (platform_id, currency, day)
+);
+
+CREATE INDEX IF NOT EXISTS idx_finance_daily_rollups_day ON finance_daily_rollups(day);
+
+ALTER TABLE finance_daily_rollups ENABLE ROW LEVEL SECURITY;
+
+-- Months are summed from at most 31 daily rows per platform and currency
+CREATE OR REPLACE VIEW finance_monthly_rollups AS
+SELECT
+    platform_id,
+    currency,
+    date_trunc('month', day)::date AS month,
+    SUM(gross_volume) AS gross_volume,
+    SUM(platform_fees) AS platform_fees,
+    SUM(host_earnings) AS host_earnings,
+    SUM(refunds) AS refunds,
+    SUM(payouts) AS payouts,
+    SUM(payment_count)::integer AS payment_count,
+    SUM(refund_count)::integer AS refund_count,
+    SUM(payout_count)::integer AS payout_count
+FROM finance_daily_rollups
+GROUP BY platform_id, currency, date_trunc('month', day);
+
+-- Recompute every day from `since` on; called after ingestion with the earliest day it touched
+CREATE OR REPLACE FUNCTION refresh_finance_rollups(since DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    refreshed INTEGER;
+BEGIN
+    DELETE FROM finance_daily_rollups WHERE day >= since;
+
+    INSERT INTO finance_daily_rollups (
+        platform_id, currency, day, gross_volume, platform_fees, host_earnings, refunds, payouts,
+        payment_count, refund_count, payout_count
+    )
+    SELECT
+        platform_id,
+        COALESCE(currency, 'AED'),
+        processed_at::date,
+        COALESCE(SUM(amount_total) FILTER (WHERE transaction_type = 'booking_payment'), 0),
+        COALESCE(SUM(amount_platform_fee) FILTER (WHERE transaction_type = 'booking_payment'), 0),
+        COALESCE(SUM(amount_host_payout) FILTER (WHERE transaction_type = 'booking_payment'), 0),
+        COALESCE(SUM(amount_total) FILTER (WHERE transaction_type = 'refund'), 0),
+        COALESCE(SUM(amount_total) FILTER (WHERE transaction_type = 'payout'), 0),
+        COUNT(*) FILTER (WHERE transaction_type = 'booking_payment'),
+        COUNT(*) FILTER (WHERE transaction_type = 'refund'),
+        COUNT(*) FILTER (WHERE transaction_type = 'payout')
+    FROM unified_transactions
+    WHERE status = 'completed' AND processed_at >= since
+    GROUP BY platform_id, COALESCE(currency, 'AED'), processed_at::date;
+
+    GET DIAGNOSTICS refreshed = ROW_COUNT;
+    RETURN refreshed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Where each incremental ingestion left off
+CREATE TABLE IF NOT EXISTS sync_watermarks (
+    source TEXT PRIMARY KEY,
+    watermark TIMESTAMPTZ,
+    last_id TEXT,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE sync_watermarks ENABLE ROW LEVEL SECURITY;
+
+-- Bookings only reach the ledger when sync writes them; clearing the hash backfills existing ones
+UPDATE unified_bookings SET content_hash = NULL
+WHERE NOT EXISTS (SELECT 1 FROM unified_transactions t WHERE t.booking_id = unified_bookings.id);
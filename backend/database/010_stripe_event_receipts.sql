@@ -0,0 +1,14 @@
+-- Stripe webhook events already applied to the ledger, so redelivered events are skipped
+-- Run after 009_ledger.sql. The consumer's position in stripe_events lives in sync_watermarks.
+
+CREATE TABLE IF NOT EXISTS stripe_event_receipts (
+    stripe_event_id TEXT PRIMARY KEY,
+    event_type TEXT NOT NULL,
+    processed_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE stripe_event_receipts ENABLE ROW LEVEL SECURITY;
+
+-- Events reference payment intents, payouts and transfers by their Stripe id
+CREATE INDEX IF NOT EXISTS idx_unified_transactions_provider
+    ON unified_transactions(transaction_type, payment_provider_id) WHERE payment_provider_id IS NOT NULL;
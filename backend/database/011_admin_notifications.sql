@@ -0,0 +1,22 @@
+-- Generated admin notifications: deduplication key and the notification feed index
+-- Run after 010_stripe_event_receipts.sql.
+
+-- One notification per admin and rule occurrence, so re-evaluating a rule cannot repeat it;
+-- hand-written notifications leave dedupe_key NULL and never collide
+ALTER TABLE admin_notifications ADD COLUMN IF NOT EXISTS dedupe_key TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS admin_notifications_dedupe_key
+    ON admin_notifications(admin_user_id, dedupe_key);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'admin_notifications_dedupe_key') THEN
+        ALTER TABLE admin_notifications
+            ADD CONSTRAINT admin_notifications_dedupe_key UNIQUE USING INDEX admin_notifications_dedupe_key;
+    END IF;
+END
+$$;
+
+-- Notification feed, newest first per admin
+CREATE INDEX IF NOT EXISTS idx_admin_notifications_feed
+    ON admin_notifications(admin_user_id, created_at DESC, id DESC);
@@ -0,0 +1,193 @@
+-- Cross-platform booking, GMV, occupancy and signup time series
+-- Run after 011_admin_notifications.sql. The new platform_created_at columns change every row's
+-- content hash, so the next sync rewrites each unified user and property once.
+
+-- When the platform created the user or listing; created_at here is when it was first synced.
+-- Filled from the stored payloads for existing rows, by the sync from then on
+ALTER TABLE unified_users ADD COLUMN IF NOT EXISTS platform_created_at TIMESTAMPTZ;
+ALTER TABLE unified_properties ADD COLUMN IF NOT EXISTS platform_created_at TIMESTAMPTZ;
+
+UPDATE unified_users u
+SET platform_created_at = (p.platform_specific_data->>'created_at')::timestamptz
+FROM unified_user_payloads p
+WHERE p.id = u.id AND u.platform_created_at IS NULL
+  AND p.platform_specific_data->>'created_at' ~ '^\d{4}-\d{2}-\d{2}';
+
+UPDATE unified_properties u
+SET platform_created_at = (p.platform_specific_data->>'created_at')::timestamptz
+FROM unified_property_payloads p
+WHERE p.id = u.id AND u.platform_created_at IS NULL
+  AND p.platform_specific_data->>'created_at' ~ '^\d{4}-\d{2}-\d{2}';
+
+-- New users per day of the refresh window
+CREATE INDEX IF NOT EXISTS idx_unified_users_platform_created
+    ON unified_users((COALESCE(platform_created_at, created_at)));
+
+-- Occupied nights of the refresh window: bookings whose stay ends inside it
+CREATE INDEX IF NOT EXISTS idx_unified_bookings_check_out
+    ON unified_bookings(check_out) WHERE removed_at IS NULL;
+
+-- Per platform, city, currency and day. Bookings and GMV count on the check-in day, occupancy on
+-- every night stayed; new users have no city or currency and are stored under ''
+CREATE TABLE IF NOT EXISTS analytics_daily_rollups (
+    platform_id UUID REFERENCES platforms(id) ON DELETE CASCADE,
+    city TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    day DATE NOT NULL,
+    bookings INTEGER NOT NULL DEFAULT 0,
+    cancellations INTEGER NOT NULL DEFAULT 0,
+    gmv NUMERIC NOT NULL DEFAULT 0,
+    booked_nights INTEGER NOT NULL DEFAULT 0,
+    listing_nights INTEGER NOT NULL DEFAULT 0,
+    new_users INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (platform_id, city, currency, day)
+);
+
+CREATE INDEX IF NOT EXISTS idx_analytics_daily_rollups_day ON analytics_daily_rollups(day);
+
+ALTER TABLE analytics_daily_rollups ENABLE ROW LEVEL SECURITY;
+
+-- Recompute every day from `since` through `until`; called after sync with the earliest day it touched,
+-- or with a NULL `since` to rebuild from the earliest booking, signup or listing.
+-- Past days keep the listing count they had when last refreshed, future days (up to `until`) hold
+-- bookings already on the books against today's listings.
+CREATE OR REPLACE FUNCTION refresh_analytics_rollups(since DATE, until DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    refreshed INTEGER;
+BEGIN
+    IF since IS NULL THEN
+        SELECT LEAST(
+            (SELECT MIN(check_in) FROM unified_bookings WHERE removed_at IS NULL),
+            (SELECT MIN(COALESCE(platform_created_at, created_at))::date FROM unified_users),
+            (SELECT MIN(COALESCE(platform_created_at, created_at))::date FROM unified_properties)
+        ) INTO since;
+        since := COALESCE(since, until);
+    END IF;
+
+    DELETE FROM analytics_daily_rollups WHERE day >= since;
+
+    INSERT INTO analytics_daily_rollups (
+        platform_id, city, currency, day, bookings, cancellations, gmv, booked_nights, listing_nights, new_users
+    )
+    WITH listing_deltas AS (
+        -- +1 the day a listing appears and -1 the day it is removed; earlier changes land on `since`
+        SELECT platform_id, COALESCE(city, '') AS city, COALESCE(price_currency, 'AED') AS currency,
+               GREATEST(COALESCE(platform_created_at, created_at)::date, since) AS day, 1 AS delta
+        FROM unified_properties
+        WHERE COALESCE(platform_created_at, created_at)::date <= until
+        UNION ALL
+        SELECT platform_id, COALESCE(city, ''), COALESCE(price_currency, 'AED'),
+               GREATEST(removed_at::date, since), -1
+        FROM unified_properties
+        WHERE removed_at IS NOT NULL AND removed_at::date <= until
+    ),
+    listings AS (
+        -- Listings live on each day: a running sum of the deltas over a dense calendar
+        SELECT s.platform_id, s.city, s.currency, d.day,
+               SUM(SUM(COALESCE(l.delta, 0))) OVER (
+                   PARTITION BY s.platform_id, s.city, s.currency ORDER BY d.day
+               ) AS listing_nights
+        FROM (SELECT DISTINCT platform_id, city, currency FROM listing_deltas) s
+        CROSS JOIN (SELECT generate_series(since, until, INTERVAL '1 day')::date AS day) d
+        LEFT JOIN listing_deltas l
+            ON l.platform_id = s.platform_id AND l.city = s.city AND l.currency = s.currency AND l.day = d.day
+        GROUP BY s.platform_id, s.city, s.currency, d.day
+    ),
+    facts AS (
+        SELECT platform_id, city, currency, day, 0 AS bookings, 0 AS cancellations, 0 AS gmv,
+               0 AS booked_nights, listing_nights::integer AS listing_nights, 0 AS new_users
+        FROM listings
+        WHERE listing_nights <> 0
+        UNION ALL
+        SELECT b.platform_id, COALESCE(p.city, ''), COALESCE(p.price_currency, 'AED'), b.check_in,
+               1,
+               (b.status = 'cancelled')::integer,
+               CASE WHEN b.status IN ('confirmed', 'checked_in', 'completed') THEN COALESCE(b.total_price, 0) ELSE 0 END,
+               0, 0, 0
+        FROM unified_bookings b
+        LEFT JOIN unified_properties p ON p.id = b.property_id
+        WHERE b.removed_at IS NULL AND b.check_in BETWEEN since AND until
+        UNION ALL
+        -- One row per night stayed inside the window
+        SELECT b.platform_id, COALESCE(p.city, ''), COALESCE(p.price_currency, 'AED'), night::date,
+               0, 0, 0, 1, 0, 0
+        FROM unified_bookings b
+        LEFT JOIN unified_properties p ON p.id = b.property_id
+        CROSS JOIN generate_series(GREATEST(b.check_in, since), LEAST(b.check_out - 1, until), INTERVAL '1 day') night
+        WHERE b.removed_at IS NULL AND b.check_out > since AND b.check_in <= until
+          AND b.status IN ('confirmed', 'checked_in', 'completed')
+        UNION ALL
+        SELECT platform_id, '', '', COALESCE(platform_created_at, created_at)::date, 0, 0, 0, 0, 0, 1
+        FROM unified_users
+        WHERE COALESCE(platform_created_at, created_at) >= since
+          AND COALESCE(platform_created_at, created_at)::date <= until
+    )
+    SELECT platform_id, city, currency, day,
+           SUM(bookings), SUM(cancellations), SUM(gmv), SUM(booked_nights), SUM(listing_nights), SUM(new_users)
+    FROM facts
+    WHERE platform_id IS NOT NULL
+    GROUP BY platform_id, city, currency, day;
+
+    GET DIAGNOSTICS refreshed = ROW_COUNT;
+    RETURN refreshed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Day, week or month buckets, optionally split by platform and/or city. GMV stays per currency
+-- ({"AED": ...}); occupancy is booked nights over listing nights of the bucket.
+CREATE OR REPLACE FUNCTION analytics_timeseries(
+    period TEXT,
+    date_from DATE,
+    date_to DATE,
+    by_platform BOOLEAN DEFAULT false,
+    by_city BOOLEAN DEFAULT false,
+    platform UUID DEFAULT NULL,
+    city_filter TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    bucket DATE,
+    platform_id UUID,
+    city TEXT,
+    bookings BIGINT,
+    cancellations BIGINT,
+    gmv JSONB,
+    booked_nights BIGINT,
+    listing_nights BIGINT,
+    occupancy NUMERIC,
+    new_users BIGINT
+) AS $$
+    WITH per_currency AS (
+        SELECT
+            date_trunc(period, r.day)::date AS bucket,
+            CASE WHEN by_platform THEN r.platform_id END AS platform_id,
+            CASE WHEN by_city THEN r.city END AS city,
+            r.currency,
+            SUM(r.bookings) AS bookings,
+            SUM(r.cancellations) AS cancellations,
+            SUM(r.gmv) AS gmv,
+            SUM(r.booked_nights) AS booked_nights,
+            SUM(r.listing_nights) AS listing_nights,
+            SUM(r.new_users) AS new_users
+        FROM analytics_daily_rollups r
+        WHERE r.day BETWEEN date_from AND date_to
+          AND (platform IS NULL OR r.platform_id = platform)
+          AND (city_filter IS NULL OR r.city = city_filter)
+        GROUP BY 1, 2, 3, 4
+    )
+    SELECT
+        bucket,
+        platform_id,
+        city,
+        SUM(bookings)::bigint,
+        SUM(cancellations)::bigint,
+        COALESCE(jsonb_object_agg(currency, gmv) FILTER (WHERE gmv <> 0), '{}'::jsonb),
+        SUM(booked_nights)::bigint,
+        SUM(listing_nights)::bigint,
+        ROUND(SUM(booked_nights) / NULLIF(SUM(listing_nights), 0), 4),
+        SUM(new_users)::bigint
+    FROM per_currency
+    GROUP BY bucket, platform_id, city
+    ORDER BY bucket, platform_id, city;
+$$ LANGUAGE sql STABLE;
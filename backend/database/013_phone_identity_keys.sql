@@ -0,0 +1,8 @@
+-- Phone identity keys now hash the phone together with the normalised full name
+-- Run after 012_analytics_rollups.sql. Phone-only keys merged everyone sharing a number, and no
+-- lookup produces their hashes any more. People they already merged stay merged.
+
+DELETE FROM identity_keys WHERE key_type = 'phone';
+
+-- Clearing the hash makes the next sync write every user with a phone, adding its new key
+UPDATE unified_users SET content_hash = NULL WHERE phone IS NOT NULL;
@@ -0,0 +1,4 @@
+from benchmarks.run import configure_environment
+
+# The app reads its settings at import time
+configure_environment()
@@ -0,0 +1,44 @@
+import io
+
+import pytest
+
+from app.utils.export import encode_parquet
+from app.api.v1.exports import EXPORT_COLUMN_TYPES
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+def _read(chunks, columns, column_types):
+    return pq.read_table(io.BytesIO(b"".join(encode_parquet(iter(chunks), columns, column_types))))
+
+def test_numeric_column_keeps_fractions_after_an_all_int_chunk():
+    chunks = [
+        [{"id": "a", "total_price": 100}, {"id": "b", "total_price": 200}],
+        [{"id": "c", "total_price": 12.5}]
+    ]
+    table = _read(chunks, ["id", "total_price"], EXPORT_COLUMN_TYPES["bookings"])
+    
+    assert table.column("total_price").to_pylist() == [100.0, 200.0, 12.5]
+
+def test_column_null_in_first_chunk_takes_declared_type():
+    chunks = [
+        [{"id": "a", "amount_host_payout": None, "processed_at": None}],
+        [{"id": "b", "amount_host_payout": 42, "processed_at": "2025-03-01T10:00:00+00:00"}]
+    ]
+    table = _read(chunks, ["id", "amount_host_payout", "processed_at"], EXPORT_COLUMN_TYPES["transactions"])
+    
+    assert str(table.schema.field("amount_host_payout").type) == "double"
+    assert str(table.schema.field("processed_at").type) == "timestamp[us, tz=UTC]"
+    assert table.column("amount_host_payout").to_pylist() == [None, 42.0]
+
+def test_text_columns_stay_text_and_dates_are_dates():
+    chunks = [[{"id": "a", "status": None, "check_in": "2025-03-01"}], [{"id": "b", "status": 3, "check_in": None}]]
+    table = _read(chunks, ["id", "status", "check_in"], EXPORT_COLUMN_TYPES["bookings"])
+    
+    assert table.column("status").to_pylist() == [None, "3"]
+    assert str(table.schema.field("check_in").type) == "date32[day]"
+
+def test_empty_export_has_the_declared_schema():
+    table = _read([], ["id", "price"], EXPORT_COLUMN_TYPES["properties"])
+    
+    assert table.num_rows == 0
+    assert str(table.schema.field("price").type) == "double"
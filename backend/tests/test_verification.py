@@ -0,0 +1,29 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.fakes import FakeRedis, FakeSupabase
+from app.core import supabase as supabase_module
+from app.core.redis import redis_client
+from app.dependencies import get_current_admin
+from app.main import app
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeSupabase()
+    monkeypatch.setattr(supabase_module.supabase_admin, "client", supabase_module.InstrumentedClient(fake))
+    monkeypatch.setattr(redis_client, "redis", FakeRedis())
+    app.dependency_overrides[get_current_admin] = lambda: {"id": "admin-1"}
+    yield fake
+    app.dependency_overrides.pop(get_current_admin, None)
+
+def test_statistics_is_not_captured_by_the_verification_id_route(db):
+    db.table("verification_queue").insert([
+        {"platform_id": "p", "platform_user_id": "u1", "status": "pending"},
+        {"platform_id": "p", "platform_user_id": "u2", "status": "pending"},
+        {"platform_id": "p", "platform_user_id": "u3", "status": "approved"}
+    ]).execute()
+    
+    response = TestClient(app).get("/api/v1/verification/statistics")
+    
+    assert response.status_code == 200
+    assert response.json()["data"] == {"total": 3, "pending": 2, "in_review": 0, "approved": 1, "rejected": 0}